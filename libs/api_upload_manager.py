@@ -8,15 +8,266 @@ Handles uploading space content to Outline API using the CORRECT API structure:
 - Attachments = Separate attachment objects
 """
 
+import functools
+import hashlib
 import json
 import logging
+import math
+import random
+import re
+import socket
 import time
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Tuple
+from typing import BinaryIO, Callable, Dict, List, Optional, Any, Pattern, Set, Tuple
 import requests
-from datetime import datetime
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 import mimetypes
 import os
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from .mime_types import guess_mime_type
+from .multipart_stream import MultipartFileStream
+from .rate_limiter import TokenBucket
+from .space_files import read_space_file, write_space_file
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is used otherwise
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # Optional; status queries load the whole space JSON otherwise
+    ijson = None
+
+
+def _encode_json(payload: Any) -> bytes:
+    """Serialize an API request body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(payload)
+    return json.dumps(payload).encode('utf-8')
+
+
+def _decode_json(response: requests.Response) -> Any:
+    """Parse an API response body, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.loads(response.content)
+    return response.json()
+
+
+class _KeepAliveAdapter(HTTPAdapter):
+    """
+    HTTPAdapter whose pooled sockets use TCP keep-alive probes
+    
+    Upload workers can sit idle on a connection for a long time (rate-limit
+    backoff, large storage uploads on other workers); the probes keep NAT and
+    load balancer entries alive so the pooled connection is still usable
+    instead of failing on the next request and being re-established.
+    """
+    
+    socket_options = HTTPConnection.default_socket_options + [
+        (socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1),
+    ] + ([
+        (socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, 30),
+        (socket.IPPROTO_TCP, socket.TCP_KEEPINTVL, 10),
+    ] if hasattr(socket, 'TCP_KEEPIDLE') else [])
+    
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs.setdefault('socket_options', self.socket_options)
+        super().init_poolmanager(*args, **kwargs)
+
+
+def _backoff(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """
+    Full-jitter exponential backoff delay
+    
+    Spreads retries uniformly over [0, min(cap, base * 2**attempt)] so clients
+    that hit the same rate-limit window don't retry in lockstep.
+    
+    Args:
+        attempt: Zero-based retry attempt number
+        base: Base delay in seconds
+        cap: Maximum delay in seconds
+        
+    Returns:
+        Delay in seconds
+    """
+    return random.uniform(0, min(cap, base * (2 ** attempt)))
+
+
+def _parse_retry_after(value: Optional[str], cap: float = 30.0) -> Optional[float]:
+    """
+    Parse a Retry-After header value
+    
+    Args:
+        value: Header value, either delay seconds or an HTTP-date
+        cap: Maximum delay in seconds; longer requested waits are clamped to it
+        
+    Returns:
+        Delay in seconds, or None if the header is missing, unparseable or not finite
+    """
+    if not value:
+        return None
+    
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        delay = (retry_at - datetime.now(timezone.utc)).total_seconds()
+    
+    # float() accepts 'inf' and 'nan', which time.sleep() can't take
+    if not math.isfinite(delay):
+        return None
+    return min(cap, max(0.0, delay))
+
+
+def _stream_upload_counts(f: BinaryIO) -> Tuple[int, int, Dict[str, int], Dict[str, Any]]:
+    """
+    Count upload progress from a space JSON file without loading it
+    
+    Walks ijson parse events, tracking only which container each event belongs
+    to (content item, attachment detail, processing stats), so memory use stays
+    constant regardless of the size of the space.
+    
+    Args:
+        f: Space JSON file opened in binary mode
+        
+    Returns:
+        Tuple of (created_items, total_items, attachment_stats, processing_stats),
+        where processing_stats holds only the upload-related fields
+    """
+    created_items = total_items = 0
+    stats = {
+        "total_attachments": 0,
+        "uploaded_attachments": 0,
+        "failed_attachments": 0,
+        "skipped_attachments": 0
+    }
+    processing_stats = {}
+    detail = {}
+    
+    # Kind of each open container: root, items, item, details, detail, stats or None
+    frames = []
+    key = None
+    
+    for event, value in ijson.basic_parse(f):
+        if event == 'map_key':
+            key = value
+        elif event in ('start_map', 'start_array'):
+            parent = frames[-1] if frames else None
+            kind = None
+            if event == 'start_array':
+                if (parent == 'root' and key == 'space_content') or (parent == 'item' and key == 'children'):
+                    kind = 'items'
+            elif not frames:
+                kind = 'root'
+            elif parent == 'items':
+                kind = 'item'
+                total_items += 1
+            elif parent == 'item' and key == 'attachment_details':
+                kind = 'details'
+            elif parent == 'details':
+                kind = 'detail'
+                detail = {}
+            elif parent == 'root' and key == 'processing_stats':
+                kind = 'stats'
+            frames.append(kind)
+        elif event in ('end_map', 'end_array'):
+            if frames.pop() == 'detail':
+                stats["total_attachments"] += 1
+                if detail.get("uploaded"):
+                    stats["uploaded_attachments"] += 1
+                elif detail.get("upload_failed_at"):
+                    stats["failed_attachments"] += 1
+                else:
+                    stats["skipped_attachments"] += 1
+        else:
+            top = frames[-1] if frames else None
+            if top == 'item' and key == 'created' and value:
+                created_items += 1
+            elif top == 'detail' and key in ('uploaded', 'upload_failed_at'):
+                detail[key] = value
+            elif top == 'stats' and key in ('upload_successful', 'uploaded_at', 'collection_id'):
+                processing_stats[key] = value
+    
+    return created_items, total_items, stats, processing_stats
+
+
+# Markdown link targets ](target) and template references {target}
+_LINK_TARGET_PATTERN = re.compile(r'\]\(([^)\s]+)')
+_TEMPLATE_REFERENCE_PATTERN = re.compile(r'\{([^}]+)\}')
+
+# File extensions treated as images when the content type doesn't say so
+_IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.gif', '.bmp', '.svg', '.webp')
+
+# Attachment reference forms; {paths} is filled with an alternation of escaped paths
+# ![alt]({path}) - templated image
+_TEMPLATED_IMAGE_REF = r'!\[(?P<tpl_alt>[^\]]*)\]\(\{{(?P<tpl_image>{paths})\}}\)'
+# ![alt](path) and ![alt](path "=WxH") - direct image, optionally sized
+_IMAGE_REF = r'!\[(?P<alt>[^\]]*)\]\((?P<image>{paths})(?:\s*\"[^\"]*\")?\)'
+# [text](path) - direct document link
+_DOCUMENT_LINK_REF = r'\]\((?P<link_doc>{paths})\)'
+# {path} - templated document
+_TEMPLATED_DOCUMENT_REF = r'\{{(?P<tpl_doc>{paths})\}}'
+# (path) - bare parenthesized reference
+_PARENTHESIZED_REF = r'\((?P<paren>{paths})\)'
+# path - bare document path, only when it isn't part of a longer path or URL
+# (a trailing sentence period is allowed, a further extension is not)
+_BARE_DOCUMENT_REF = r'(?<![\w/.%-])(?P<bare_doc>{paths})(?![\w/?#=&%-]|\.\w)'
+# path "=WxH" - Confluence image sizing
+_IMAGE_SIZE_REF = r'(?P<path>{paths})\s*\"\s*=(\d+)x(\d+)'
+
+
+@functools.lru_cache(maxsize=256)
+def _attachment_reference_patterns(
+    image_paths: Tuple[str, ...],
+    document_paths: Tuple[str, ...]
+) -> Tuple[Optional[Pattern[str]], Pattern[str]]:
+    """
+    Build the combined attachment reference patterns for one set of attachments
+    
+    Every supported reference form for every attachment is folded into one
+    alternation, so a document's content is rewritten in a single pass. Each
+    alternative names the group holding the attachment path, which tells the
+    caller which form matched. Paths are tried longest first so a path that is
+    a prefix of another never wins over the longer one.
+    
+    Args:
+        image_paths: Original paths of image attachments
+        document_paths: Original paths of non-image attachments
+        
+    Returns:
+        Tuple of (image sizing pattern or None, reference pattern)
+    """
+    def alternation(paths):
+        return "|".join(re.escape(path) for path in sorted(paths, key=len, reverse=True))
+    
+    images = alternation(image_paths)
+    documents = alternation(document_paths)
+    
+    alternatives = []
+    if images:
+        alternatives.append(_TEMPLATED_IMAGE_REF.format(paths=images))
+        alternatives.append(_IMAGE_REF.format(paths=images))
+    if documents:
+        alternatives.append(_DOCUMENT_LINK_REF.format(paths=documents))
+        alternatives.append(_TEMPLATED_DOCUMENT_REF.format(paths=documents))
+    alternatives.append(_PARENTHESIZED_REF.format(paths="|".join(filter(None, (images, documents)))))
+    if documents:
+        alternatives.append(_BARE_DOCUMENT_REF.format(paths=documents))
+    
+    size_pattern = re.compile(_IMAGE_SIZE_REF.format(paths=images)) if images else None
+    return size_pattern, re.compile("|".join(alternatives))
 
 
 class ApiUploadManager:
@@ -44,6 +295,86 @@ class ApiUploadManager:
         self.logger = logging.getLogger(__name__)
         # Don't set up logging configuration here - it should be done by the calling application
         
+        # Guards the space tree while sibling workers update it and progress is saved
+        self._save_lock = threading.RLock()
+        
+        # Shared client-side rate limit for all Outline API calls (requests/second)
+        self._rate_limiter = TokenBucket(rate=5.0, burst=10)
+        
+        # Document workers serving the upload work queue; one per burst token so a
+        # full burst of creates can be in flight at once
+        self.document_workers = self._rate_limiter.burst
+        
+        # Serialize interactive prompts when several spaces upload concurrently
+        self._prompt_lock = threading.Lock()
+        
+        # Document UUIDs confirmed missing in the API during this session
+        self._missing_docs: Set[str] = set()
+        
+        # Pre-encoded documents.create payload prefixes keyed by (collection, parent)
+        self._create_payload_prefixes: Dict[Tuple[str, Optional[str]], bytes] = {}
+        
+        # Attachment uploads run concurrently, capped across all spaces
+        self.max_attachment_workers = 8
+        self._attachment_slots = threading.BoundedSemaphore(self.max_attachment_workers)
+        
+        # Uploaded attachments grouped by (collection ID, size, content type), shared by
+        # the documents of each collection in this session. Files are only hashed once
+        # a second file lands in the same group. Two workers racing on the same new
+        # file may both upload it; the cache only has to avoid repeats, not guarantee one.
+        self._attachment_upload_cache: Dict[Tuple[str, int, str], List[Dict[str, Any]]] = {}
+        
+        # Load the MIME type map once up front rather than on the first guess
+        mimetypes.init()
+        
+        # Keep-alive session for storage uploads (no API auth headers on this one)
+        self._storage_session = requests.Session()
+        storage_adapter = _KeepAliveAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+        self._storage_session.mount('https://', storage_adapter)
+        self._storage_session.mount('http://', storage_adapter)
+        
+        # Size the API connection pool for every document and attachment worker of
+        # several concurrent spaces; the default of 10 would discard connections
+        api_adapter = _KeepAliveAdapter(pool_connections=4, pool_maxsize=64, max_retries=0)
+        self.session.mount('https://', api_adapter)
+        self.session.mount('http://', api_adapter)
+        
+    def upload_many(self, space_keys: List[str], concurrency: int = 4, force_mode: bool = False) -> Dict[str, bool]:
+        """
+        Upload several spaces concurrently with a fixed pool of space uploaders
+        
+        Spaces are independent (separate collections, no cross references), so
+        their per-space serialization points (JSON load, collection lookup) can
+        overlap. All workers share this manager's API session.
+        
+        Args:
+            space_keys: Space keys to upload (e.g., ['is', 'gi'])
+            concurrency: Maximum number of spaces uploading at the same time
+            force_mode: Passed through to upload_space for every space
+            
+        Returns:
+            Dictionary mapping each space key to its upload result, in input order
+        """
+        # A key listed twice would upload the same space file into the same
+        # collection from two threads at once
+        space_keys = list(dict.fromkeys(space_keys))
+        results = {}
+        
+        with ThreadPoolExecutor(max_workers=max(1, concurrency)) as executor:
+            futures = {
+                executor.submit(self.upload_space, space_key, force_mode): space_key
+                for space_key in space_keys
+            }
+            for future in as_completed(futures):
+                space_key = futures[future]
+                try:
+                    results[space_key] = future.result()
+                except Exception as e:
+                    self.logger.error("Error uploading space %s: %s", space_key, e)
+                    results[space_key] = False
+        
+        return {space_key: results[space_key] for space_key in space_keys}
+        
     def upload_space(self, space_key: str, force_mode: bool = False) -> bool:
         """
         Upload a complete space to the API
@@ -60,15 +391,14 @@ class ApiUploadManager:
         """
         space_file = self.output_dir / f"{space_key}.json"
         if not space_file.exists():
-            self.logger.error(f"Space file not found: {space_file}")
+            self.logger.error("Space file not found: %s", space_file)
             return False
             
         # Load the space JSON
-        with open(space_file, 'r', encoding='utf-8') as f:
-            space_data = json.load(f)
+        space_data = read_space_file(space_file)
             
         # Start upload process
-        self.logger.info(f"Starting upload for space: {space_data['space_name']} ({space_key})")
+        self.logger.info("Starting upload for space: %s (%s)", space_data['space_name'], space_key)
         
         try:
             # Step 1: Create the collection for this space
@@ -79,12 +409,11 @@ class ApiUploadManager:
                 self.logger.error(error_msg)
                 # Save the failure state
                 space_file = self.output_dir / f"{space_key}.json"
-                with open(space_file, 'w', encoding='utf-8') as f:
-                    json.dump(space_data, f, indent=2, ensure_ascii=False)
+                write_space_file(space_file, space_data)
                 return False
                 
             # Step 2: Upload all content items as documents
-            success = self._upload_documents_recursive(
+            success = self._upload_documents(
                 space_data["space_content"], 
                 collection_id,
                 None,  # No parent document for root items
@@ -98,34 +427,31 @@ class ApiUploadManager:
             space_data["processing_stats"]["collection_id"] = collection_id
             
             # Check completion status
-            def count_created(items):
-                created = total = 0
-                for item in items:
-                    total += 1
-                    if item.get("created", False):
-                        created += 1
-                    if item.get("children"):
-                        child_created, child_total = count_created(item["children"])
-                        created += child_created
-                        total += child_total
-                return created, total
-            
-            created_count, total_count = count_created(space_data["space_content"])
+            created_count = total_count = 0
+            stack = list(space_data["space_content"])
+            while stack:
+                item = stack.pop()
+                total_count += 1
+                if item.get("created", False):
+                    created_count += 1
+                children = item.get("children")
+                if children:
+                    stack.extend(children)
+            
             success = (created_count == total_count)  # Redefine success based on actual completion
             space_data["processing_stats"]["upload_successful"] = success
             
             # Save updated JSON
-            with open(space_file, 'w', encoding='utf-8') as f:
-                json.dump(space_data, f, indent=2, ensure_ascii=False)
+            write_space_file(space_file, space_data)
                 
             if success:
-                self.logger.info(f"Successfully uploaded space: {space_key} ({created_count}/{total_count} documents)")
+                self.logger.info("Successfully uploaded space: %s (%s/%s documents)", space_key, created_count, total_count)
             else:
-                self.logger.warning(f"Partially uploaded space: {space_key} ({created_count}/{total_count} documents)")
+                self.logger.warning("Partially uploaded space: %s (%s/%s documents)", space_key, created_count, total_count)
             return success
                 
         except Exception as e:
-            self.logger.error(f"Error uploading space {space_key}: {e}")
+            self.logger.error("Error uploading space %s: %s", space_key, e)
             return False
     
     def _create_collection_for_space(self, space_data: Dict[str, Any]) -> Optional[str]:
@@ -146,19 +472,19 @@ class ApiUploadManager:
         if stored_collection_id:
             # Verify the stored collection still exists and is accessible
             if self._check_collection_exists(stored_collection_id, space_name):
-                self.logger.info(f"Using stored collection ID from previous run '{space_name}' (ID: {stored_collection_id})")
+                self.logger.info("Using stored collection ID from previous run '%s' (ID: %s)", space_name, stored_collection_id)
                 return stored_collection_id
             else:
-                self.logger.warning(f"Stored collection ID {stored_collection_id} no longer valid, will search/create new one")
+                self.logger.warning("Stored collection ID %s no longer valid, will search/create new one", stored_collection_id)
         
         # Check if a collection with this name already exists
         existing_collection_id = self._find_existing_collection(space_name)
         if existing_collection_id:
-            self.logger.info(f"Found existing collection '{space_name}' (ID: {existing_collection_id})")
+            self.logger.info("Found existing collection '%s' (ID: %s)", space_name, existing_collection_id)
             return existing_collection_id
         
         # No existing collection found, create a new one
-        self.logger.info(f"Creating new collection for space: {space_name}")
+        self.logger.info("Creating new collection for space: %s", space_name)
         
         url = f"{self.api_base_url}/api/collections.create"
         
@@ -169,10 +495,14 @@ class ApiUploadManager:
             # The first item should be the root space page
             root_item = space_content[0]
             if root_item.get("title") == space_data["space_name"]:
-                root_page_content = root_item.get("md_content", "")
+                root_page_content = root_item.get("md_content") or ""
         
-        # Use root page content as description, fallback to default
-        description = root_page_content if root_page_content.strip() else f"Imported from Confluence space: {space_data['space_key']}"
+        # Use root page content as description, fallback to default; isspace()
+        # tests for blank content without copying the whole page like strip() would
+        if root_page_content and not root_page_content.isspace():
+            description = root_page_content
+        else:
+            description = f"Imported from Confluence space: {space_data['space_key']}"
         
         # Prepare payload for collection creation
         payload = {
@@ -182,20 +512,20 @@ class ApiUploadManager:
             "icon": "collection"  # Default icon
         }
         
-        response = self._make_api_request_with_retry('POST', url, json=payload)
+        response = self._make_api_request_with_retry('POST', url, data=_encode_json(payload))
         
         if response.status_code == 200:
-            data = response.json()
+            data = _decode_json(response)
             if data.get("ok"):
                 collection_id = data.get("data", {}).get("id")
-                self.logger.info(f"Created collection: {space_data['space_name']} (ID: {collection_id})")
+                self.logger.info("Created collection: %s (ID: %s)", space_data['space_name'], collection_id)
                 return collection_id
             else:
                 error_msg = data.get('error', 'Unknown error')
-                self.logger.error(f"API returned ok=false: {error_msg}")
+                self.logger.error("API returned ok=false: %s", error_msg)
                 return None
         else:
-            self.logger.error(f"Failed to create collection {space_data['space_name']}: {response.status_code} {response.text}")
+            self.logger.error("Failed to create collection %s: %s %s", space_data['space_name'], response.status_code, response.text)
             return None
     
     def _list_collections(self) -> Optional[List[Dict[str, Any]]]:
@@ -208,23 +538,23 @@ class ApiUploadManager:
         url = f"{self.api_base_url}/api/collections.list"
         
         try:
-            response = self._make_api_request_with_retry('POST', url, json={})
+            response = self._make_api_request_with_retry('POST', url, data=b'{}')
             
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 if data.get("ok"):
                     collections = data.get("data", [])
-                    self.logger.debug(f"Retrieved {len(collections)} collections from API")
+                    self.logger.debug("Retrieved %s collections from API", len(collections))
                     return collections
                 else:
-                    self.logger.error(f"API returned ok=false when listing collections: {data.get('error', 'Unknown error')}")
+                    self.logger.error("API returned ok=false when listing collections: %s", data.get('error', 'Unknown error'))
                     return None
             else:
-                self.logger.error(f"Failed to list collections: {response.status_code} {response.text}")
+                self.logger.error("Failed to list collections: %s %s", response.status_code, response.text)
                 return None
                 
         except Exception as e:
-            self.logger.error(f"Exception occurred while listing collections: {str(e)}")
+            self.logger.error("Exception occurred while listing collections: %s", e)
             return None
     
     def _find_existing_collection(self, space_name: str) -> Optional[str]:
@@ -249,20 +579,21 @@ class ApiUploadManager:
                 matches.append(collection)
         
         if not matches:
-            self.logger.debug(f"No existing collection found with exact name '{space_name}'")
+            self.logger.debug("No existing collection found with exact name '%s'", space_name)
             return None
         elif len(matches) == 1:
             # Single match - return the ID
             collection_id = matches[0].get("id")
-            self.logger.info(f"Found existing collection '{space_name}' (ID: {collection_id})")
+            self.logger.info("Found existing collection '%s' (ID: %s)", space_name, collection_id)
             return collection_id
         else:
             # Multiple matches - need to resolve ambiguity
-            self.logger.warning(f"Found {len(matches)} collections with name '{space_name}' - resolving ambiguity")
-            selected_collection = self._handle_collection_ambiguity(matches, space_name)
+            self.logger.warning("Found %s collections with name '%s' - resolving ambiguity", len(matches), space_name)
+            with self._prompt_lock:
+                selected_collection = self._handle_collection_ambiguity(matches, space_name)
             if selected_collection:
                 collection_id = selected_collection.get("id")
-                self.logger.info(f"User selected collection '{space_name}' (ID: {collection_id})")
+                self.logger.info("User selected collection '%s' (ID: %s)", space_name, collection_id)
                 return collection_id
             else:
                 self.logger.info("User chose to quit - no collection selected")
@@ -337,13 +668,13 @@ class ApiUploadManager:
         for collection in collections:
             if collection.get("id") == collection_id:
                 if collection.get("name") == expected_name:
-                    self.logger.debug(f"Collection {collection_id} exists with expected name '{expected_name}'")
+                    self.logger.debug("Collection %s exists with expected name '%s'", collection_id, expected_name)
                     return True
                 else:
-                    self.logger.warning(f"Collection {collection_id} exists but name mismatch: expected '{expected_name}', got '{collection.get('name')}'")
+                    self.logger.warning("Collection %s exists but name mismatch: expected '%s', got '%s'", collection_id, expected_name, collection.get('name'))
                     return False
                     
-        self.logger.debug(f"Collection {collection_id} not found in collection list")
+        self.logger.debug("Collection %s not found in collection list", collection_id)
         return False
     
     def _track_document_failure(self, item: Dict[str, Any], error_message: str) -> None:
@@ -354,19 +685,20 @@ class ApiUploadManager:
             item: The document item that failed
             error_message: The error message to record
         """
-        if "processing_errors" not in item:
-            item["processing_errors"] = []
-        
-        error_record = {
-            "timestamp": datetime.now().isoformat(),
-            "error": error_message,
-            "retry_count": len(item["processing_errors"])  # Count of previous failures
-        }
-        
-        item["processing_errors"].append(error_record)
-        item["created"] = False  # Mark as not created due to error
+        with self._save_lock:
+            if "processing_errors" not in item:
+                item["processing_errors"] = []
+            
+            error_record = {
+                "timestamp": datetime.now().isoformat(),
+                "error": error_message,
+                "retry_count": len(item["processing_errors"])  # Count of previous failures
+            }
+            
+            item["processing_errors"].append(error_record)
+            item["created"] = False  # Mark as not created due to error
         
-        self.logger.error(f"Document processing failure recorded for '{item['title']}': {error_message}")
+        self.logger.error("Document processing failure recorded for '%s': %s", item['title'], error_message)
     
     def _track_collection_failure(self, space_data: Dict[str, Any], error_message: str) -> None:
         """
@@ -387,7 +719,7 @@ class ApiUploadManager:
         }
         
         space_data["processing_stats"]["collection_errors"].append(error_record)
-        self.logger.error(f"Collection processing failure recorded: {error_message}")
+        self.logger.error("Collection processing failure recorded: %s", error_message)
     
     def _make_api_request_with_retry(self, method: str, url: str, **kwargs) -> requests.Response:
         """
@@ -404,49 +736,48 @@ class ApiUploadManager:
         Raises:
             Exception: If all retries are exhausted or non-429 error occurs
         """
-        import time
-        import random
-        
         max_retries = 5
         base_delay = 1  # Base delay in seconds
         max_delay = 60  # Maximum delay in seconds
         
         for attempt in range(max_retries + 1):
             try:
-                # Make the request
+                # Make the request once the rate limiter allows it
+                self._rate_limiter.acquire()
                 response = self.session.request(method, url, **kwargs)
                 
                 if response.status_code == 429:
+                    self._rate_limiter.on_rate_limited()
                     if attempt == max_retries:
-                        self.logger.error(f"Rate limiting: Exhausted all {max_retries} retries for {url}")
+                        self.logger.error("Rate limiting: Exhausted all %s retries for %s", max_retries, url)
                         raise Exception(f"Rate limited after {max_retries} retries")
                     
-                    # Calculate delay with exponential backoff + jitter
-                    delay = min(base_delay * (2 ** attempt) + random.uniform(0, 1), max_delay)
+                    # Calculate delay with full-jitter exponential backoff
+                    delay = _backoff(attempt, base=base_delay, cap=max_delay)
+                    delay_source = "backoff"
                     
-                    # Check if server provided retry-after header
-                    retry_after = response.headers.get('Retry-After')
-                    if retry_after:
-                        try:
-                            delay = max(delay, float(retry_after))
-                        except ValueError:
-                            pass  # Use calculated delay if header is not a number
+                    # Check if server provided retry-after header (seconds or HTTP-date)
+                    retry_after = _parse_retry_after(response.headers.get('Retry-After'), cap=max_delay)
+                    if retry_after is not None and retry_after >= delay:
+                        delay = retry_after
+                        delay_source = "Retry-After"
                     
-                    self.logger.warning(f"Rate limited (429) on {url}, retrying in {delay:.2f}s (attempt {attempt + 1}/{max_retries + 1})")
+                    self.logger.warning("Rate limited (429) on %s, retrying in %.2fs (%s, attempt %s/%s)", url, delay, delay_source, attempt + 1, max_retries + 1)
                     time.sleep(delay)
                     continue
                     
                 # Return response for all other status codes (let caller handle errors)
+                self._rate_limiter.on_success()
                 return response
                 
             except requests.exceptions.RequestException as e:
                 if attempt == max_retries:
-                    self.logger.error(f"Request failed after {max_retries} retries: {e}")
+                    self.logger.error("Request failed after %s retries: %s", max_retries, e)
                     raise
                 
                 # Retry on network errors with shorter delay
                 delay = min(base_delay * (attempt + 1), 10)
-                self.logger.warning(f"Request failed ({e}), retrying in {delay}s (attempt {attempt + 1}/{max_retries + 1})")
+                self.logger.warning("Request failed (%s), retrying in %ss (attempt %s/%s)", e, delay, attempt + 1, max_retries + 1)
                 time.sleep(delay)
         
         raise Exception("Unexpected: Should not reach this point")
@@ -463,16 +794,16 @@ class ApiUploadManager:
             space_key = space_data.get("space_key", "unknown")
             space_file = self.output_dir / f"{space_key}.json"
             
-            with open(space_file, 'w', encoding='utf-8') as f:
-                json.dump(space_data, f, indent=2, ensure_ascii=False)
+            with self._save_lock:
+                write_space_file(space_file, space_data)
             
             if reason:
-                self.logger.debug(f"Space data saved immediately: {reason}")
+                self.logger.debug("Space data saved immediately: %s", reason)
             else:
-                self.logger.debug(f"Space data saved immediately for {space_key}")
+                self.logger.debug("Space data saved immediately for %s", space_key)
                 
         except Exception as e:
-            self.logger.error(f"Failed to save space data immediately: {str(e)}")
+            self.logger.error("Failed to save space data immediately: %s", e)
     
     def _check_document_exists(self, document_id: str) -> bool:
         """
@@ -486,30 +817,38 @@ class ApiUploadManager:
         """
         if not document_id or not document_id.strip():
             return False
+        
+        # Known-missing documents don't need another round trip
+        if document_id in self._missing_docs:
+            self.logger.debug("Document %s already known to be missing", document_id)
+            return False
             
         url = f"{self.api_base_url}/api/documents.info"
         payload = {"id": document_id}
         
         try:
-            response = self._make_api_request_with_retry('POST', url, json=payload)
+            response = self._make_api_request_with_retry('POST', url, data=_encode_json(payload))
             
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 if data.get("ok"):
-                    self.logger.debug(f"Document {document_id} exists and is accessible")
+                    self.logger.debug("Document %s exists and is accessible", document_id)
                     return True
                 else:
-                    self.logger.debug(f"Document {document_id} does not exist or is not accessible")
+                    self.logger.debug("Document %s does not exist or is not accessible", document_id)
+                    self._missing_docs.add(document_id)
                     return False
             else:
-                self.logger.debug(f"Failed to check document {document_id}: {response.status_code}")
+                self.logger.debug("Failed to check document %s: %s", document_id, response.status_code)
+                if response.status_code == 404:
+                    self._missing_docs.add(document_id)
                 return False
                 
         except Exception as e:
-            self.logger.debug(f"Exception occurred while checking document {document_id}: {str(e)}")
+            self.logger.debug("Exception occurred while checking document %s: %s", document_id, e)
             return False
     
-    def _upload_documents_recursive(
+    def _upload_documents(
         self, 
         content_items: List[Dict[str, Any]], 
         collection_id: str,
@@ -519,209 +858,259 @@ class ApiUploadManager:
         force_mode: bool = False
     ) -> bool:
         """
-        Recursively upload content items as documents
+        Upload content items and all of their descendants as documents
+        
+        Work units of (siblings, index, parent document ID) are served from a
+        queue by a fixed pool of document workers. Siblings are created one after
+        another so Outline keeps the original sibling ordering: a sibling is only
+        queued once the previous one's create call has completed (or turned out
+        not to be needed), so no worker ever waits on another. Its update and
+        attachment work then overlaps with the next sibling's create. Children are
+        queued as soon as their parent has an ID, so separate sibling lists,
+        across levels, upload side by side.
         
         Args:
             content_items: List of content items to upload
             collection_id: ID of the collection to put documents in
             parent_document_id: ID of parent document (None for root items)
+            space_data: Complete space data for attachment access
             skip_root_space_page: Whether to skip the first item (root space page)
             force_mode: If True, ignore 'created' status and process all items
             
         Returns:
-            True if all items uploaded successfully, False otherwise
+            True once every queued item has been processed
         """
-        for i, item in enumerate(content_items):
-            # Skip the root space page as its content is now in collection description
-            if skip_root_space_page and i == 0:
-                # Mark as created and process children only
-                item["page_uuid"] = collection_id  # Reference the collection
-                item["parent_uuid"] = None
-                item["created"] = True
+        # Work units: (sibling items, index of the item to process, parent document ID)
+        work_queue: queue.Queue = queue.Queue()
+        
+        def enqueue(items: List[Dict[str, Any]], parent_id: Optional[str]) -> None:
+            if items:
+                work_queue.put((items, 0, parent_id))
+        
+        def worker() -> None:
+            while True:
+                unit = work_queue.get()
+                if unit is None:
+                    work_queue.task_done()
+                    return
+                siblings, index, parent_id = unit
+                released = []
                 
-                self.logger.info(f"Skipped root space page (content in collection description): {item['title']}")
+                def release_next_sibling() -> None:
+                    # Queued before this unit's task_done, so join() can't return early
+                    if not released:
+                        released.append(True)
+                        if index + 1 < len(siblings):
+                            work_queue.put((siblings, index + 1, parent_id))
                 
-                # Process children with no parent (they become top-level documents)
-                if item.get("children"):
-                    success = self._upload_documents_recursive(
-                        item["children"], 
-                        collection_id, 
-                        None,  # No parent for root space page children
-                        space_data,  # Pass space_data for attachment access
-                        skip_root_space_page=False,  # Don't skip children
-                        force_mode=force_mode  # Pass force mode down
+                item = siblings[index]
+                try:
+                    self._process_single_item(
+                        item, collection_id, parent_id, space_data, force_mode,
+                        enqueue, release_next_sibling
                     )
-                    if not success:
-                        self.logger.warning(f"Some children failed for root space page: {item['title']}")
-                continue
-            
-            # Check if document already exists (by UUID or created flag)
-            existing_uuid = item.get("page_uuid")
-            is_marked_created = item.get("created", False)
-            document_exists_in_api = False
-            
-            # If we have a UUID, check if document actually exists in the API
-            if existing_uuid and existing_uuid != collection_id:  # Don't check collection ID as document
-                document_exists_in_api = self._check_document_exists(existing_uuid)
-                if document_exists_in_api:
-                    self.logger.info(f"Document exists in API with UUID {existing_uuid}: {item['title']}")
-                else:
-                    self.logger.info(f"Document UUID {existing_uuid} not found in API, will recreate: {item['title']}")
+                except Exception as e:
+                    self.logger.error("Error processing document %s: %s", item.get('title'), e)
+                finally:
+                    release_next_sibling()
+                    work_queue.task_done()
+        
+        items = content_items
+        
+        # Skip the root space page as its content is now in collection description
+        if skip_root_space_page and content_items:
+            item = content_items[0]
             
-            # Determine processing strategy based on existence and force mode
-            if force_mode and is_marked_created and document_exists_in_api and existing_uuid:
-                # FORCE MODE: Update existing document
-                document_id = existing_uuid
-                self.logger.info(f"FORCE MODE: Updating existing document: {item['title']} (UUID: {existing_uuid})")
-                
-                # Update document content
-                updated_content = item.get("md_content", "")
-                if not updated_content.strip():
-                    updated_content = f"# {item['title']}\n\nContent not available."
-                
-                # Update the document
-                update_success = self._update_document_content(document_id, item["title"], updated_content)
-                if update_success:
-                    self.logger.info(f"Successfully updated document content: {item['title']}")
-                    
-                    # Process attachments if any
-                    if item.get("attachments"):
-                        self.logger.info(f"Processing attachments for updated document: {item['title']}")
-                        self._upload_attachments_for_document(item, document_id, space_data)
-                else:
-                    error_msg = f"Failed to update document content: {item['title']}"
-                    self._track_document_failure(item, error_msg)
-                
-                # Process children regardless of update success
-                if item.get("children"):
-                    success = self._upload_documents_recursive(
-                        item["children"], 
-                        collection_id, 
-                        document_id,  # This document becomes the parent
-                        space_data,
-                        skip_root_space_page=False,
-                        force_mode=force_mode  # Pass force mode down
-                    )
-                    if not success:
-                        self.logger.warning(f"Some children failed for updated document: {item['title']}")
-                
-                continue
-                
-            elif not force_mode and ((is_marked_created and document_exists_in_api) or (is_marked_created and not existing_uuid)):
-                # NORMAL MODE: Skip existing documents but process attachments if needed
-                document_id = existing_uuid
-                
-                # Check if there are pending attachments
-                has_pending_attachments = self._has_pending_attachments(item)
-                
-                if has_pending_attachments and document_id:
-                    self.logger.info(f"Document already created but has pending attachments: {item['title']}")
-                    # Try to upload pending attachments
-                    self._upload_attachments_for_document(item, document_id, space_data)
-                    
-                    # Save progress after attachment processing
-                    space_file = self.output_dir / f"{space_data['space_key']}.json"
-                    with open(space_file, 'w', encoding='utf-8') as f:
-                        json.dump(space_data, f, indent=2, ensure_ascii=False)
-                elif not document_id:
-                    self.logger.warning(f"Document {item['title']} marked as created but has no valid page_uuid")
-                else:
-                    self.logger.info(f"Skipping already created document (no pending attachments): {item['title']}")
-                
-                # Process children regardless
-                if item.get("children"):
-                    success = self._upload_documents_recursive(
-                        item["children"], 
-                        collection_id, 
-                        document_id,  # This document becomes the parent
-                        space_data,
-                        skip_root_space_page=False,
-                        force_mode=force_mode  # Pass force mode down
-                    )
-                    if not success:
-                        self.logger.warning(f"Some children failed for document: {item['title']}")
-                        
-                continue
-                
-            # Create this document
-            success, document_id = self._create_document(item, collection_id, parent_document_id)
-            if not success:
-                error_msg = f"Failed to create document: {item['title']}"
-                self._track_document_failure(item, error_msg)
-                # Continue processing other items instead of failing completely
-                continue
-                
-            # Update item with document ID and status
-            item["page_uuid"] = document_id  # Keep same field name for compatibility
-            item["parent_uuid"] = parent_document_id
+            # Mark as created and process children only
+            item["page_uuid"] = collection_id  # Reference the collection
+            item["parent_uuid"] = None
             item["created"] = True
             
-            self.logger.info(f"Created document: {item['title']} (ID: {document_id})")
+            self.logger.info("Skipped root space page (content in collection description): %s", item['title'])
             
-            # In force mode, immediately save progress to prevent data loss
-            if force_mode:
-                self._save_space_data_immediately(space_data, f"Document created: {item['title']}")
+            # Its children become top-level documents, ahead of the remaining items
+            items = (item.get("children") or []) + content_items[1:]
+        
+        enqueue(items, parent_document_id)
+        
+        workers = [threading.Thread(target=worker, daemon=True) for _ in range(max(1, self.document_workers))]
+        for thread in workers:
+            thread.start()
+        
+        work_queue.join()
+        for _ in workers:
+            work_queue.put(None)
+        for thread in workers:
+            thread.join()
             
-            # Upload attachments for this document
-            if item.get("attachments") and document_id:
-                self.logger.info(f"Uploading {len(item['attachments'])} attachments for document: {item['title']}")
-                attachment_success = self._upload_attachments_for_document(
-                    item, 
-                    document_id, 
-                    space_data
-                )
-                if attachment_success:
-                    self.logger.info(f"Successfully uploaded all attachments for document: {item['title']}")
-                else:
-                    self.logger.warning(f"Some attachments failed to upload for document: {item['title']}")
-                
-                # Update document content with proper attachment links
-                updated_content = self._prepare_content_with_attachments(item)
-                original_content = item.get("md_content", "")
+        return True
+    
+    def _process_single_item(
+        self,
+        item: Dict[str, Any],
+        collection_id: str,
+        parent_document_id: Optional[str],
+        space_data: Dict[str, Any],
+        force_mode: bool,
+        enqueue_children: Callable[[List[Dict[str, Any]], Optional[str]], None],
+        release_next_sibling: Optional[Callable[[], None]] = None
+    ) -> None:
+        """
+        Create or update one content item, upload its attachments and queue its children
+        
+        Args:
+            item: Content item to upload
+            collection_id: ID of the collection to put documents in
+            parent_document_id: ID of parent document (None for root items)
+            space_data: Complete space data for attachment access
+            force_mode: If True, ignore 'created' status and process all items
+            enqueue_children: Queues child items under the given parent document ID
+            release_next_sibling: Queues the next sibling; called once this item's
+                create call has completed (or is not needed)
+        """
+        # Check if document already exists (by UUID or created flag)
+        existing_uuid = item.get("page_uuid")
+        is_marked_created = item.get("created", False)
+        document_exists_in_api = False
+        
+        # If we have a UUID, check if document actually exists in the API
+        if existing_uuid and existing_uuid != collection_id:  # Don't check collection ID as document
+            document_exists_in_api = self._check_document_exists(existing_uuid)
+            if document_exists_in_api:
+                self.logger.info("Document exists in API with UUID %s: %s", existing_uuid, item['title'])
+            else:
+                self.logger.info("Document UUID %s not found in API, will recreate: %s", existing_uuid, item['title'])
+        
+        # Determine processing strategy based on existence and force mode
+        if force_mode and is_marked_created and document_exists_in_api and existing_uuid:
+            # FORCE MODE: Update existing document (no create call, so the next sibling can go)
+            if release_next_sibling:
+                release_next_sibling()
+            document_id = existing_uuid
+            self.logger.info("FORCE MODE: Updating existing document: %s (UUID: %s)", item['title'], existing_uuid)
+            
+            # Update document content
+            updated_content = item.get("md_content", "")
+            if not updated_content.strip():
+                updated_content = f"# {item['title']}\n\nContent not available."
+            
+            # Update the document
+            update_success = self._update_document_content(document_id, item["title"], updated_content)
+            if update_success:
+                self.logger.info("Successfully updated document content: %s", item['title'])
                 
-                self.logger.info(f"Content comparison for {item['title']}: Updated length={len(updated_content)}, Original length={len(original_content)}")
+                # Process attachments if any
+                if item.get("attachments"):
+                    self.logger.info("Processing attachments for updated document: %s", item['title'])
+                    self._upload_attachments_for_document(item, document_id, collection_id, space_data)
+            else:
+                error_msg = f"Failed to update document content: {item['title']}"
+                self._track_document_failure(item, error_msg)
+            
+            # Process children regardless of update success
+            if item.get("children"):
+                enqueue_children(item["children"], document_id)  # This document becomes the parent
+            
+            return
+            
+        elif not force_mode and ((is_marked_created and document_exists_in_api) or (is_marked_created and not existing_uuid)):
+            # NORMAL MODE: Skip existing documents but process attachments if needed
+            if release_next_sibling:
+                release_next_sibling()
+            document_id = existing_uuid
+            
+            # Check if there are pending attachments
+            has_pending_attachments = self._has_pending_attachments(item)
+            
+            if has_pending_attachments and document_id:
+                self.logger.info("Document already created but has pending attachments: %s", item['title'])
+                # Try to upload pending attachments
+                self._upload_attachments_for_document(item, document_id, collection_id, space_data)
                 
-                if updated_content != original_content:
-                    self.logger.info(f"Updating document content with attachment links: {item['title']}")
-                    content_update_success = self._update_document_content(
-                        document_id,
-                        item["title"],
-                        updated_content
-                    )
-                    if not content_update_success:
-                        self.logger.warning(f"Failed to update document content for: {item['title']}")
-                else:
-                    self.logger.info(f"No content changes needed for: {item['title']}")
-                    # Still update with full content since we created with minimal content initially
-                    if original_content:
-                        self.logger.info(f"Updating document with full original content: {item['title']}")
-                        self._update_document_content(document_id, item["title"], updated_content)
+                # Save progress after attachment processing
+                space_file = self.output_dir / f"{space_data['space_key']}.json"
+                with self._save_lock:
+                    write_space_file(space_file, space_data)
+            elif not document_id:
+                self.logger.warning("Document %s marked as created but has no valid page_uuid", item['title'])
+            else:
+                self.logger.info("Skipping already created document (no pending attachments): %s", item['title'])
             
-            # Process children with this document as parent
+            # Process children regardless
             if item.get("children"):
-                success = self._upload_documents_recursive(
-                    item["children"], 
-                    collection_id, 
-                    document_id,  # This document becomes the parent
-                    space_data,  # Pass space_data for attachment access
-                    skip_root_space_page=False,  # Don't skip children
-                    force_mode=force_mode  # Pass force mode down
-                )
-                # Don't fail completely if children fail - continue with other items
-                if not success:
-                    self.logger.warning(f"Some children failed for document: {item['title']}")
+                enqueue_children(item["children"], document_id)  # This document becomes the parent
                     
-            # Longer delay to avoid rate limiting
-            time.sleep(2.0)  # Increased to 2 seconds to be more conservative
+            return
+            
+        # This item was only queued once the previous sibling's create call had
+        # completed (sibling creates are serialized to keep their order in Outline)
+        success, document_id, created_with_placeholder = self._create_document(item, collection_id, parent_document_id)
+        if release_next_sibling:
+            release_next_sibling()
+        if not success:
+            error_msg = f"Failed to create document: {item['title']}"
+            self._track_document_failure(item, error_msg)
+            # Continue processing other items instead of failing completely
+            return
+            
+        # Update item with document ID and status
+        with self._save_lock:
+            item["page_uuid"] = document_id  # Keep same field name for compatibility
+            item["parent_uuid"] = parent_document_id
+            item["created"] = True
+        
+        self.logger.info("Created document: %s (ID: %s)", item['title'], document_id)
+        
+        # Children only need this document's ID, so queue them before the attachment work
+        if item.get("children"):
+            enqueue_children(item["children"], document_id)
+        
+        # In force mode, immediately save progress to prevent data loss
+        if force_mode:
+            self._save_space_data_immediately(space_data, f"Document created: {item['title']}")
+        
+        # Upload attachments for this document
+        if item.get("attachments") and document_id:
+            self.logger.info("Uploading %s attachments for document: %s", len(item['attachments']), item['title'])
+            attachment_success = self._upload_attachments_for_document(
+                item, 
+                document_id, 
+                collection_id,
+                space_data
+            )
+            if attachment_success:
+                self.logger.info("Successfully uploaded all attachments for document: %s", item['title'])
+            else:
+                self.logger.warning("Some attachments failed to upload for document: %s", item['title'])
             
-        return True
+            # Update document content with proper attachment links
+            updated_content = self._prepare_content_with_attachments(item)
+            original_content = item.get("md_content", "")
+            
+            self.logger.info("Content comparison for %s: Updated length=%s, Original length=%s", item['title'], len(updated_content), len(original_content))
+            
+            if updated_content != original_content:
+                self.logger.info("Updating document content with attachment links: %s", item['title'])
+                content_update_success = self._update_document_content(
+                    document_id,
+                    item["title"],
+                    updated_content
+                )
+                if not content_update_success:
+                    self.logger.warning("Failed to update document content for: %s", item['title'])
+            else:
+                self.logger.info("No content changes needed for: %s", item['title'])
+                # Only replace the placeholder text the document was created with
+                if created_with_placeholder and original_content:
+                    self.logger.info("Updating document with full original content: %s", item['title'])
+                    self._update_document_content(document_id, item["title"], updated_content)
         
     def _create_document(
         self, 
         item: Dict[str, Any], 
         collection_id: str,
         parent_document_id: Optional[str]
-    ) -> Tuple[bool, Optional[str]]:
+    ) -> Tuple[bool, Optional[str], bool]:
         """
         Create a single document via API
         
@@ -731,7 +1120,7 @@ class ApiUploadManager:
             parent_document_id: ID of parent document
             
         Returns:
-            Tuple of (success, document_id)
+            Tuple of (success, document_id, created_with_placeholder)
         """
         url = f"{self.api_base_url}/api/documents.create"
         
@@ -755,38 +1144,69 @@ class ApiUploadManager:
                 else:
                     text = f"# {title}\n\nContent not available."
         
-        # Prepare payload
-        payload = {
-            "title": title,
-            "text": text,
-            "collectionId": collection_id,
-            "publish": True  # Automatically publish the document
-        }
-        
-        # Set parent if specified
-        if parent_document_id:
-            payload["parentDocumentId"] = parent_document_id
+        # Prepare payload - siblings share everything except title and text
+        payload = self._encode_create_payload(collection_id, parent_document_id, title, text)
             
         try:
-            response = self._make_api_request_with_retry('POST', url, json=payload)
+            response = self._make_api_request_with_retry('POST', url, data=payload)
             
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 if data.get("ok"):
                     document_id = data.get("data", {}).get("id")
-                    return True, document_id
+                    return True, document_id, has_attachments
                 else:
                     error_msg = data.get('error', 'Unknown error')
-                    self.logger.error(f"API returned ok=false for document {title}: {error_msg}")
-                    return False, None
+                    self.logger.error("API returned ok=false for document %s: %s", title, error_msg)
+                    return False, None, has_attachments
             else:
                 error_text = response.text
-                self.logger.error(f"Failed to create document {title}: {response.status_code} {error_text}")
-                return False, None
+                self.logger.error("Failed to create document %s: %s %s", title, response.status_code, error_text)
+                return False, None, has_attachments
                 
         except Exception as e:
-            self.logger.error(f"Error creating document {title}: {e}")
-            return False, None
+            self.logger.error("Error creating document %s: %s", title, e)
+            return False, None, has_attachments
+    
+    def _encode_create_payload(
+        self,
+        collection_id: str,
+        parent_document_id: Optional[str],
+        title: str,
+        text: str
+    ) -> bytes:
+        """
+        Encode a documents.create payload from a cached per-parent prefix
+        
+        Args:
+            collection_id: ID of the collection
+            parent_document_id: ID of parent document (None for root items)
+            title: Document title
+            text: Document markdown content
+            
+        Returns:
+            JSON-encoded request body
+        """
+        key = (collection_id, parent_document_id)
+        prefix = self._create_payload_prefixes.get(key)
+        if prefix is None:
+            fixed = {
+                "collectionId": collection_id,
+                "publish": True  # Automatically publish the document
+            }
+            # Set parent if specified
+            if parent_document_id:
+                fixed["parentDocumentId"] = parent_document_id
+            prefix = json.dumps(fixed)[:-1].encode('utf-8') + b', "title": '
+            self._create_payload_prefixes[key] = prefix
+        
+        return b''.join((
+            prefix,
+            _encode_json(title),
+            b', "text": ',
+            _encode_json(text),
+            b'}'
+        ))
     
     def _update_document_content(
         self, 
@@ -814,30 +1234,31 @@ class ApiUploadManager:
         }
         
         try:
-            response = self._make_api_request_with_retry('POST', url, json=payload)
+            response = self._make_api_request_with_retry('POST', url, data=_encode_json(payload))
             
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 if data.get("ok"):
-                    self.logger.info(f"Successfully updated document content: {title}")
+                    self.logger.info("Successfully updated document content: %s", title)
                     return True
                 else:
                     error_msg = data.get('error', 'Unknown error')
-                    self.logger.error(f"API returned ok=false for document update {title}: {error_msg}")
+                    self.logger.error("API returned ok=false for document update %s: %s", title, error_msg)
                     return False
             else:
                 error_text = response.text
-                self.logger.error(f"Failed to update document {title}: {response.status_code} {error_text}")
+                self.logger.error("Failed to update document %s: %s %s", title, response.status_code, error_text)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"Error updating document {title}: {e}")
+            self.logger.error("Error updating document %s: %s", title, e)
             return False
     
     def _upload_attachments_for_document(
         self, 
         item: Dict[str, Any], 
         document_id: str,
+        collection_id: str,
         space_data: Dict[str, Any]
     ) -> bool:
         """
@@ -846,6 +1267,7 @@ class ApiUploadManager:
         Args:
             item: Item data from JSON with attachments
             document_id: ID of the document these attachments belong to
+            collection_id: ID of the collection the document is in
             space_data: Complete space data for finding local files
             
         Returns:
@@ -856,78 +1278,78 @@ class ApiUploadManager:
             return True  # No attachments to upload
         
         # Get local folder path for finding attachment files
-        local_folder = Path(self.base_path / space_data["local_folder"])
+        local_folder = self.base_path / space_data["local_folder"]
         
-        success_count = 0
         total_attachments = len(attachments)
         
         # Initialize attachment tracking in the item
-        if "attachment_details" not in item:
-            item["attachment_details"] = {}
+        with self._save_lock:
+            if "attachment_details" not in item:
+                item["attachment_details"] = {}
         
+        # Collect attachments that still need uploading (skip already uploaded ones)
+        pending_paths = []
         for attachment_path in attachments:
-            self.logger.info(f"Uploading attachment: {attachment_path}")
-            
-            # Skip if already uploaded
-            if attachment_path in item["attachment_details"]:
-                existing = item["attachment_details"][attachment_path]
-                if existing.get("uploaded", False):
-                    self.logger.info(f"Skipping already uploaded attachment: {attachment_path}")
-                    success_count += 1
-                    continue
-            
-            # Retry logic for attachment upload
-            max_retries = 3
-            retry_count = 0
-            success = False
-            attachment_info = None
-            
-            while retry_count < max_retries and not success:
-                if retry_count > 0:
-                    wait_time = (2 ** retry_count) * 2  # Exponential backoff
-                    self.logger.info(f"Retrying attachment upload (attempt {retry_count + 1}/{max_retries}) after {wait_time}s: {attachment_path}")
-                    time.sleep(wait_time)
-                
-                success, attachment_info = self._upload_single_attachment(
-                    attachment_path, 
-                    document_id, 
-                    local_folder
-                )
-                retry_count += 1
-            
-            if success and attachment_info:
-                # Store detailed attachment information
-                item["attachment_details"][attachment_path] = {
-                    "attachment_id": attachment_info["attachment_id"],
-                    "original_path": attachment_path,
-                    "api_url": attachment_info["api_url"],
-                    "name": attachment_info["name"],
-                    "content_type": attachment_info["content_type"],
-                    "size": attachment_info["size"],
-                    "uploaded": True,
-                    "uploaded_at": datetime.now().isoformat(),
-                    "document_id": document_id,
-                    "retry_count": retry_count - 1
-                }
-                success_count += 1
-                self.logger.info(f"Successfully uploaded attachment: {attachment_path} -> {attachment_info['attachment_id']}")
-            else:
-                # Store failure information with detailed error
-                failure_info = {
-                    "original_path": attachment_path,
-                    "uploaded": False,
-                    "upload_failed_at": datetime.now().isoformat(),
-                    "error": f"Upload failed after {max_retries} attempts",
-                    "retry_count": retry_count - 1
+            existing = item["attachment_details"].get(attachment_path)
+            if existing and existing.get("uploaded", False):
+                self.logger.info("Skipping already uploaded attachment: %s", attachment_path)
+            elif attachment_path not in pending_paths:
+                pending_paths.append(attachment_path)
+        
+        # Upload pending attachments concurrently; retries and backoff run in the workers
+        outcomes = {}
+        if pending_paths:
+            with ThreadPoolExecutor(max_workers=min(len(pending_paths), self.max_attachment_workers)) as executor:
+                futures = {
+                    executor.submit(self._upload_attachment_with_retry, attachment_path, document_id, collection_id, local_folder): attachment_path
+                    for attachment_path in pending_paths
                 }
+                for future in as_completed(futures):
+                    outcomes[futures[future]] = future.result()
+        
+        # Record results in attachment order so the JSON output stays stable; the
+        # batch finished together, so one formatted timestamp serves every entry
+        recorded_at = datetime.now().isoformat()
+        with self._save_lock:
+            for attachment_path in pending_paths:
+                success, attachment_info, error, retry_count = outcomes[attachment_path]
                 
-                # Capture detailed error if available
-                if hasattr(self, '_last_attachment_error'):
-                    failure_info["detailed_error"] = self._last_attachment_error
-                    delattr(self, '_last_attachment_error')  # Clean up
-                
-                item["attachment_details"][attachment_path] = failure_info
-                self.logger.error(f"Failed to upload attachment after {max_retries} attempts: {attachment_path}")
+                if success and attachment_info:
+                    # Store detailed attachment information
+                    item["attachment_details"][attachment_path] = {
+                        "attachment_id": attachment_info["attachment_id"],
+                        "original_path": attachment_path,
+                        "api_url": attachment_info["api_url"],
+                        "name": attachment_info["name"],
+                        "content_type": attachment_info["content_type"],
+                        "size": attachment_info["size"],
+                        "uploaded": True,
+                        "uploaded_at": recorded_at,
+                        "document_id": document_id,
+                        "retry_count": retry_count
+                    }
+                    self.logger.info("Successfully uploaded attachment: %s -> %s", attachment_path, attachment_info['attachment_id'])
+                else:
+                    # Store failure information with detailed error
+                    failure_info = {
+                        "original_path": attachment_path,
+                        "uploaded": False,
+                        "upload_failed_at": recorded_at,
+                        "error": f"Upload failed after {retry_count + 1} attempts",
+                        "retry_count": retry_count
+                    }
+                    
+                    # Capture detailed error if available
+                    if error:
+                        failure_info["detailed_error"] = error
+                    
+                    item["attachment_details"][attachment_path] = failure_info
+                    self.logger.error("Failed to upload attachment after %s attempts: %s", retry_count + 1, attachment_path)
+        
+        success_count = sum(
+            1 for attachment_path in attachments
+            if item["attachment_details"].get(attachment_path, {}).get("uploaded", False)
+        )
         
         # Update markdown content with new attachment URLs
         if success_count > 0:
@@ -965,75 +1387,156 @@ class ApiUploadManager:
                 
         return False
     
+    def _upload_attachment_with_retry(
+        self,
+        attachment_path: str,
+        document_id: str,
+        collection_id: str,
+        local_folder: Path
+    ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str], int]:
+        """
+        Upload a single attachment, retrying with exponential backoff (runs in a worker thread)
+        
+        Args:
+            attachment_path: Relative path to attachment (e.g. 'attachments/681672705/file.pdf')
+            document_id: ID of document this attachment belongs to
+            collection_id: ID of the collection the document is in
+            local_folder: Base folder containing the attachment files
+            
+        Returns:
+            Tuple of (success, attachment_info_dict, error_message, retry_count)
+        """
+        max_retries = 3
+        retry_count = 0
+        success = False
+        attachment_info = None
+        error = None
+        
+        self.logger.info("Uploading attachment: %s", attachment_path)
+        
+        while retry_count < max_retries and not success:
+            if retry_count > 0:
+                wait_time = _backoff(retry_count)  # Exponential backoff with full jitter
+                self.logger.info("Retrying attachment upload (attempt %s/%s) after %.2fs: %s", retry_count + 1, max_retries, wait_time, attachment_path)
+                time.sleep(wait_time)
+            
+            # Only the upload itself holds a slot, so backoff sleeps don't block other uploads
+            with self._attachment_slots:
+                success, attachment_info, error = self._upload_single_attachment(
+                    attachment_path, 
+                    document_id, 
+                    collection_id,
+                    local_folder
+                )
+            retry_count += 1
+        
+        return success, attachment_info, error, retry_count - 1
+    
     def _upload_single_attachment(
         self, 
         attachment_path: str, 
         document_id: str, 
+        collection_id: str,
         local_folder: Path
-    ) -> Tuple[bool, Optional[Dict[str, Any]]]:
+    ) -> Tuple[bool, Optional[Dict[str, Any]], Optional[str]]:
         """
         Upload a single attachment file to Outline API using the two-phase process
         
         Args:
             attachment_path: Relative path to attachment (e.g. 'attachments/681672705/file.pdf')
             document_id: ID of document this attachment belongs to
+            collection_id: ID of the collection the document is in
             local_folder: Base folder containing the attachment files
             
         Returns:
-            Tuple of (success, attachment_info_dict)
+            Tuple of (success, attachment_info_dict, error_message)
         """
         try:
             # Build full path to attachment file
             file_path = local_folder / attachment_path
             
-            if not file_path.exists():
-                self.logger.error(f"Attachment file not found: {file_path}")
-                return False, None
+            # Get file information (one stat call doubles as the existence check)
+            try:
+                file_size = os.stat(file_path).st_size
+            except FileNotFoundError:
+                error_msg = f"Attachment file not found: {file_path}"
+                self.logger.error(error_msg)
+                return False, None, error_msg
             
-            # Get file information
-            file_size = file_path.stat().st_size
-            content_type, _ = mimetypes.guess_type(str(file_path))
-            if not content_type:
-                content_type = "application/octet-stream"
+            content_type = guess_mime_type(file_path.name)
             
             file_name = file_path.name
             
+            # Identical files (same bytes and type) in a collection share one uploaded
+            # attachment; only files of the same size can match, so only those are hashed
+            cache_key = (collection_id, file_size, content_type)
+            digest = None
+            for cached in self._attachment_upload_cache.get(cache_key, ()):
+                if digest is None:
+                    digest = self._hash_file(file_path)
+                if cached["digest"] is None:
+                    cached["digest"] = self._hash_file(cached["path"])
+                if cached["digest"] == digest:
+                    cached_info = cached["info"]
+                    self.logger.info("Reusing uploaded attachment %s for identical file: %s", cached_info['attachment_id'], attachment_path)
+                    return True, dict(cached_info, name=file_name), None
+            
             # Phase 1: Create attachment record in Outline
-            attachment_id, upload_info = self._create_attachment_record(
+            attachment_id, upload_info, error = self._create_attachment_record(
                 file_name, content_type, file_size, document_id
             )
             
             if not attachment_id:
-                return False, None
+                return False, None, error
             
             # Phase 2: Upload file to storage
             if upload_info:
-                upload_success = self._upload_file_to_storage(file_path, upload_info)
+                upload_success, error = self._upload_file_to_storage(file_path, upload_info, content_type)
                 
                 if not upload_success:
-                    self.logger.error(f"Failed to upload file to storage for attachment: {file_name}")
-                    return False, None
+                    self.logger.error("Failed to upload file to storage for attachment: %s", file_name)
+                    return False, None, error
             else:
-                self.logger.error(f"No upload info received for attachment: {file_name}")
-                return False, None
+                error_msg = f"No upload info received for attachment: {file_name}"
+                self.logger.error(error_msg)
+                return False, None, error_msg
             
             # Build API redirect URL for this attachment
             api_url = f"{self.api_base_url}/api/attachments.redirect?id={attachment_id}"
             
-            return True, {
+            attachment_info = {
                 "attachment_id": attachment_id,
                 "api_url": api_url,
                 "name": file_name,
                 "content_type": content_type,
                 "size": file_size
             }
+            self._attachment_upload_cache.setdefault(cache_key, []).append(
+                {"path": file_path, "digest": digest, "info": attachment_info}
+            )
+            
+            return True, dict(attachment_info), None
             
         except Exception as e:
             error_msg = f"Error uploading attachment {attachment_path}: {e}"
             self.logger.error(error_msg)
-            # Store the error for the caller to access
-            self._last_attachment_error = error_msg
-            return False, None
+            return False, None, error_msg
+    
+    def _hash_file(self, file_path: Path) -> bytes:
+        """
+        SHA-256 digest of a file's contents, read in 64KB chunks
+        
+        Args:
+            file_path: Path to local file
+            
+        Returns:
+            Raw digest bytes
+        """
+        digest = hashlib.sha256()
+        with open(file_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(64 * 1024), b''):
+                digest.update(chunk)
+        return digest.digest()
     
     def _create_attachment_record(
         self, 
@@ -1041,7 +1544,7 @@ class ApiUploadManager:
         content_type: str, 
         size: int, 
         document_id: str
-    ) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+    ) -> Tuple[Optional[str], Optional[Dict[str, Any]], Optional[str]]:
         """
         Create attachment record in Outline (Phase 1 of upload)
         
@@ -1052,7 +1555,7 @@ class ApiUploadManager:
             document_id: Associated document ID
             
         Returns:
-            Tuple of (attachment_id, upload_info)
+            Tuple of (attachment_id, upload_info, error_message)
         """
         url = f"{self.api_base_url}/api/attachments.create"
         
@@ -1064,20 +1567,35 @@ class ApiUploadManager:
         }
         
         try:
-            response = self.session.post(url, json=payload)
+            self._rate_limiter.acquire()
+            response = self.session.post(url, data=_encode_json(payload))
             
             # Handle rate limiting
             if response.status_code == 429:
-                self.logger.warning(f"Rate limit hit for attachment {name}, retrying...")
+                self.logger.warning("Rate limit hit for attachment %s, retrying...", name)
                 for retry in range(3):
-                    wait_time = (2 ** retry) * 2
+                    self._rate_limiter.on_rate_limited()
+                    wait_time = _backoff(retry)
+                    delay_source = "backoff"
+                    
+                    # Never retry sooner than the server asked us to
+                    retry_after = _parse_retry_after(response.headers.get('Retry-After'))
+                    if retry_after is not None and retry_after >= wait_time:
+                        wait_time = retry_after
+                        delay_source = "Retry-After"
+                    
+                    self.logger.debug("Waiting %.2fs (%s) before retrying attachment %s", wait_time, delay_source, name)
                     time.sleep(wait_time)
-                    response = self.session.post(url, json=payload)
+                    self._rate_limiter.acquire()
+                    response = self.session.post(url, data=_encode_json(payload))
                     if response.status_code != 429:
                         break
+            
+            if response.status_code != 429:
+                self._rate_limiter.on_success()
                         
             if response.status_code == 200:
-                data = response.json()
+                data = _decode_json(response)
                 if data.get("ok"):
                     attachment_data = data.get("data", {})
                     
@@ -1092,73 +1610,74 @@ class ApiUploadManager:
                         "max_upload_size": attachment_data.get("maxUploadSize")
                     }
                     
-                    return attachment_id, upload_info
+                    return attachment_id, upload_info, None
                 else:
                     error_msg = f"API returned ok=false for attachment {name}: {data.get('error', 'No error message')}"
                     self.logger.error(error_msg)
-                    self._last_attachment_error = error_msg
-                    return None, None
+                    return None, None, error_msg
             else:
                 error_msg = f"Failed to create attachment record for {name}: HTTP {response.status_code} - {response.text[:200]}"
                 self.logger.error(error_msg)
-                self._last_attachment_error = error_msg
-                return None, None
+                return None, None, error_msg
                 
         except Exception as e:
-            self.logger.error(f"Error creating attachment record for {name}: {e}")
-            return None, None
+            error_msg = f"Error creating attachment record for {name}: {e}"
+            self.logger.error(error_msg)
+            return None, None, error_msg
     
     def _upload_file_to_storage(
         self, 
         file_path: Path, 
-        upload_info: Dict[str, Any]
-    ) -> bool:
+        upload_info: Dict[str, Any],
+        content_type: str
+    ) -> Tuple[bool, Optional[str]]:
         """
         Upload file to cloud storage (Phase 2 of upload)
         
         Args:
             file_path: Path to local file
             upload_info: Upload information from Phase 1
+            content_type: MIME type already determined for the file
             
         Returns:
-            True if upload successful, False otherwise
+            Tuple of (success, error_message)
         """
         try:
             upload_url = upload_info.get("upload_url")
             form_data = upload_info.get("form_data", {})
             
             if not upload_url:
-                self.logger.error(f"No upload URL provided for file: {file_path}")
-                return False
+                error_msg = f"No upload URL provided for file: {file_path}"
+                self.logger.error(error_msg)
+                return False, error_msg
             
-            # Prepare multipart form data for file upload
+            # Stream the multipart body so the file is read in chunks while sending
             with open(file_path, 'rb') as f:
-                files = {
-                    'file': (file_path.name, f, mimetypes.guess_type(str(file_path))[0] or 'application/octet-stream')
-                }
-                
-                # Create a new session for the upload (don't use API session with auth headers)
-                upload_session = requests.Session()
+                body = MultipartFileStream(
+                    form_data,
+                    file_path.name,
+                    f,
+                    content_type
+                )
                 
-                response = upload_session.post(
+                # Shared storage session, not the API session with auth headers
+                response = self._storage_session.post(
                     upload_url,
-                    data=form_data,
-                    files=files
+                    data=body,
+                    headers={'Content-Type': body.content_type}
                 )
             
             if response.status_code in [200, 201, 204]:
-                return True
+                return True, None
             else:
                 error_msg = f"Failed to upload file {file_path.name} to storage: HTTP {response.status_code} - {response.text[:200]}"
                 self.logger.error(error_msg)
-                self._last_attachment_error = error_msg
-                return False
+                return False, error_msg
                 
         except Exception as e:
             error_msg = f"Error uploading file {file_path} to storage: {e}"
             self.logger.error(error_msg)
-            self._last_attachment_error = error_msg
-            return False
+            return False, error_msg
     
     def _replace_attachment_urls_in_content(
         self, 
@@ -1176,171 +1695,64 @@ class ApiUploadManager:
         Returns:
             Updated markdown content with proper Outline API URLs
         """
-        import re
-        updated_content = content
-        
+        # Collect uploaded attachments: path -> (api_url, file_name, is_image)
+        entries = {}
         for original_path, details in attachment_details.items():
             if details.get("uploaded", False) and details.get("api_url"):
-                api_url = details["api_url"]
                 content_type = details.get("content_type", "")
-                file_name = details.get("name", original_path.split("/")[-1])
                 
                 # Determine if this is an image
-                is_image = content_type.startswith("image/") or any(
-                    original_path.lower().endswith(ext) 
-                    for ext in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.svg', '.webp']
-                )
-                
-                # Replace templated format {attachments/path} first
-                templated_path = f"{{{original_path}}}"
-                if templated_path in updated_content:
-                    if is_image:
-                        updated_content = self._replace_templated_image_references(
-                            updated_content, templated_path, api_url, file_name
-                        )
-                    else:
-                        updated_content = self._replace_templated_document_references(
-                            updated_content, templated_path, api_url, file_name
-                        )
+                is_image = content_type.startswith("image/") or original_path.lower().endswith(_IMAGE_EXTENSIONS)
                 
-                # Also handle direct path references (fallback)
-                if is_image:
-                    updated_content = self._replace_image_references(updated_content, original_path, api_url, file_name)
-                else:
-                    updated_content = self._replace_document_references(updated_content, original_path, api_url, file_name)
-        
-        return updated_content
-    
-    def _replace_templated_image_references(self, content: str, templated_path: str, api_url: str, file_name: str) -> str:
-        """
-        Replace templated image references with proper Outline format
-        
-        Args:
-            content: Content to update
-            templated_path: Templated path like {attachments/path}
-            api_url: Outline API URL for the attachment
-            file_name: Original filename
-            
-        Returns:
-            Updated content with proper image markdown
-        """
-        import re
-        
-        # Pattern to match templated image formats in markdown
-        patterns = [
-            # ![alt](templated_path)
-            rf'!\[([^\]]*)\]\({re.escape(templated_path)}\)',
-            # ![](templated_path) 
-            rf'!\[\]\({re.escape(templated_path)}\)',
-        ]
-        
-        # Replace each pattern with proper Outline format
-        for pattern in patterns:
-            def replacement(match):
-                alt_text = match.group(1) if match.lastindex and match.lastindex >= 1 else ""
-                if not alt_text:
-                    alt_text = file_name.rsplit('.', 1)[0]  # Use filename without extension as alt
-                
-                return f'![{alt_text}]({api_url})'
-            
-            content = re.sub(pattern, replacement, content)
+                entries[original_path] = (
+                    details["api_url"],
+                    details.get("name", original_path.split("/")[-1]),
+                    is_image
+                )
         
-        return content
-    
-    def _replace_templated_document_references(self, content: str, templated_path: str, api_url: str, file_name: str) -> str:
-        """
-        Replace templated document attachment references with proper links
+        if not entries:
+            return content
         
-        Args:
-            content: Content to update
-            templated_path: Templated path like {attachments/path}
-            api_url: Outline API URL for the attachment
-            file_name: Original filename
-            
-        Returns:
-            Updated content with proper document links
-        """
-        # Simple string replacement for templated format
-        content = content.replace(templated_path, api_url)
-        return content
-    
-    def _replace_image_references(self, content: str, original_path: str, api_url: str, file_name: str) -> str:
-        """
-        Replace image references with proper Outline format
+        size_pattern, reference_pattern = _attachment_reference_patterns(
+            tuple(path for path, entry in entries.items() if entry[2]),
+            tuple(path for path, entry in entries.items() if not entry[2])
+        )
         
-        Args:
-            content: Content to update
-            original_path: Original Confluence attachment path
-            api_url: Outline API URL for the attachment
-            file_name: Original filename
+        # Extract sizing information if present (first occurrence per image)
+        size_attrs = {}
+        if size_pattern:
+            for size_match in size_pattern.finditer(content):
+                width, height = size_match.group(2, 3)
+                size_attrs.setdefault(size_match.group("path"), f' \" ={width}x{height}\"')
+        
+        def replacement(match):
+            kind = match.lastgroup
+            original_path = match.group(kind)
+            api_url, file_name, is_image = entries[original_path]
+            
+            if kind == "link_doc":
+                return f']({api_url})'
+            if kind == "tpl_doc":
+                return api_url
+            if kind == "bare_doc":
+                return f'[{file_name}]({api_url})'
+            if kind == "paren" and not is_image:
+                return f'({api_url})'
+            
+            # Image forms; templated images never carry sizing
+            if kind == "tpl_image":
+                alt_text = match.group("tpl_alt")
+                size_attr = ""
+            else:
+                alt_text = match.group("alt") if kind == "image" else ""
+                size_attr = size_attrs.get(original_path, "")
             
-        Returns:
-            Updated content with proper image markdown
-        """
-        import re
-        
-        # Pattern to match various Confluence image formats
-        patterns = [
-            # Standard markdown image with alt text
-            rf'!\[([^\]]*)\]\({re.escape(original_path)}\)',
-            # Image with alt text and sizing (Confluence style)  
-            rf'!\[([^\]]*)\]\({re.escape(original_path)}\s*\"[^\"]*\"\)',
-            # Simple image reference
-            rf'!\[\]\({re.escape(original_path)}\)',
-            # Direct path references that should become images
-            rf'\({re.escape(original_path)}\)',
-        ]
-        
-        # Extract sizing information if present
-        size_match = re.search(rf'{re.escape(original_path)}\s*\"\s*=(\d+)x(\d+)', content)
-        size_attr = ""
-        if size_match:
-            width, height = size_match.groups()
-            size_attr = f' \" ={width}x{height}\"'
-        
-        # Replace each pattern with proper Outline format
-        for pattern in patterns:
-            def replacement(match):
-                alt_text = match.group(1) if match.lastindex and match.lastindex >= 1 else ""
-                if not alt_text:
-                    alt_text = file_name.rsplit('.', 1)[0]  # Use filename without extension as alt
-                
-                return f'![{alt_text}]({api_url}{size_attr})'
+            if not alt_text:
+                alt_text = file_name.rsplit('.', 1)[0]  # Use filename without extension as alt
             
-            content = re.sub(pattern, replacement, content)
+            return f'![{alt_text}]({api_url}{size_attr})'
         
-        return content
-    
-    def _replace_document_references(self, content: str, original_path: str, api_url: str, file_name: str) -> str:
-        """
-        Replace document attachment references with proper links
-        
-        Args:
-            content: Content to update  
-            original_path: Original Confluence attachment path
-            api_url: Outline API URL for the attachment
-            file_name: Original filename
-            
-        Returns:
-            Updated content with proper document links
-        """
-        # Simple string replacements for documents
-        patterns_to_replace = [
-            f"]({original_path})",
-            f"({original_path})",
-            original_path
-        ]
-        
-        replacements = [
-            f"]({api_url})",
-            f"({api_url})", 
-            f"[{file_name}]({api_url})"
-        ]
-        
-        for old_pattern, new_replacement in zip(patterns_to_replace, replacements):
-            content = content.replace(old_pattern, new_replacement)
-        
-        return content
+        return reference_pattern.sub(replacement, content)
     
     def _prepare_content_with_attachments(self, item: Dict[str, Any]) -> str:
         """
@@ -1359,6 +1771,13 @@ class ApiUploadManager:
         if not attachments:
             return content
         
+        # Nothing to link or list if no attachment made it to the API
+        if not any(
+            details.get("uploaded", False) and details.get("api_url")
+            for details in attachment_details.values()
+        ):
+            return content
+        
         # Start with the original content
         updated_content = content
         
@@ -1384,70 +1803,61 @@ class ApiUploadManager:
         Returns:
             Content with attachments section appended if needed
         """
-        unlinked_attachments = []
-        all_attachments = []
+        unlinked_lines = []
+        detail_lines = []
+        
+        # Index every markdown link target and {template} reference once
+        references = set(_LINK_TARGET_PATTERN.findall(content))
+        references.update(_TEMPLATE_REFERENCE_PATTERN.findall(content))
         
         for original_path, details in attachment_details.items():
             if details.get("uploaded", False) and details.get("api_url"):
                 # Check if this attachment is referenced in the content
                 file_name = details.get("name", original_path.split("/")[-1])
                 api_url = details["api_url"]
-                templated_path = f"{{{original_path}}}"
                 
-                # Check if attachment is already referenced in content
+                # Check if attachment is already referenced in content; the index
+                # answers the common case, any other mention needs a substring scan
                 is_linked = (
-                    original_path in content or 
-                    api_url in content or
-                    templated_path in content or
-                    f"]({original_path})" in content or
-                    f"({original_path})" in content
+                    api_url in references or
+                    original_path in references or
+                    original_path in content or
+                    api_url in content
                 )
                 
                 content_type = details.get("content_type", "")
-                is_image = content_type.startswith("image/") or any(
-                    original_path.lower().endswith(ext) 
-                    for ext in ['.png', '.jpg', '.jpeg', '.gif', '.bmp', '.svg', '.webp']
-                )
-                
-                attachment_info = {
-                    "name": file_name,
-                    "url": api_url,
-                    "is_image": is_image,
-                    "content_type": content_type,
-                    "uuid": details.get("attachment_id", ""),
-                    "original_path": original_path
-                }
-                
-                all_attachments.append(attachment_info)
                 
                 if not is_linked:
-                    unlinked_attachments.append(attachment_info)
+                    is_image = content_type.startswith("image/") or original_path.lower().endswith(_IMAGE_EXTENSIONS)
+                    if is_image:
+                        # Show images directly
+                        unlinked_lines.append(f"![{file_name}]({api_url})\n\n")
+                    else:
+                        # Show documents as links
+                        unlinked_lines.append(f"- [{file_name}]({api_url})\n")
+                
+                # Detailed metadata for every uploaded attachment
+                detail_lines.append(
+                    f"- **Content Type:** {content_type} "
+                    f"**Original Name:** {file_name} "
+                    f"**Uploaded UUID:** {details.get('attachment_id', '')}\n"
+                )
         
         # Add comprehensive attachments section 
-        if all_attachments:
-            attachments_section = "\n\n## Original Attachments\n\n"
+        if detail_lines:
+            parts = ["\n\n## Original Attachments\n\n"]
             
             # Add unlinked attachments first if any exist
-            if unlinked_attachments:
-                attachments_section += "### Unlinked Attachments\n\n"
-                for attachment in unlinked_attachments:
-                    if attachment["is_image"]:
-                        # Show images directly
-                        attachments_section += f"![{attachment['name']}]({attachment['url']})\n\n"
-                    else:
-                        # Show documents as links
-                        attachments_section += f"- [{attachment['name']}]({attachment['url']})\n"
-                attachments_section += "\n"
+            if unlinked_lines:
+                parts.append("### Unlinked Attachments\n\n")
+                parts.extend(unlinked_lines)
+                parts.append("\n")
             
-            # Add detailed metadata for all attachments
-            attachments_section += "### Attachment Details\n\n"
-            for attachment in all_attachments:
-                attachments_section += f"- **Content Type:** {attachment['content_type']} "
-                attachments_section += f"**Original Name:** {attachment['name']} "
-                attachments_section += f"**Uploaded UUID:** {attachment['uuid']}\n"
+            parts.append("### Attachment Details\n\n")
+            parts.extend(detail_lines)
             
-            content += attachments_section
-            self.logger.info(f"Added attachments section with {len(unlinked_attachments)} unlinked of {len(all_attachments)} total attachments")
+            content += "".join(parts)
+            self.logger.info("Added attachments section with %s unlinked of %s total attachments", len(unlinked_lines), len(detail_lines))
         
         return content
     
@@ -1464,36 +1874,38 @@ class ApiUploadManager:
         space_file = self.output_dir / f"{space_key}.json"
         if not space_file.exists():
             return None
-            
-        with open(space_file, 'r', encoding='utf-8') as f:
-            space_data = json.load(f)
         
-        def count_items(items, created_count=0, total_count=0):
-            for item in items:
-                total_count += 1
+        if ijson is not None:
+            # Stream the counts so large spaces never have to fit in memory
+            with open(space_file, 'rb') as f:
+                created_items, total_items, attachment_stats, processing_stats = _stream_upload_counts(f)
+        else:
+            space_data = read_space_file(space_file)
+            
+            created_items = total_items = 0
+            stack = list(space_data["space_content"])
+            while stack:
+                item = stack.pop()
+                total_items += 1
                 if item.get("created", False):
-                    created_count += 1
-                    
-                if item.get("children"):
-                    created_count, total_count = count_items(
-                        item["children"], created_count, total_count
-                    )
-                    
-            return created_count, total_count
+                    created_items += 1
+                children = item.get("children")
+                if children:
+                    stack.extend(children)
+            
+            # Get attachment statistics
+            attachment_stats = self._get_attachment_statistics(space_data["space_content"])
+            processing_stats = space_data.get("processing_stats", {})
         
-        created_items, total_items = count_items(space_data["space_content"])
         completion_percentage = (created_items / total_items * 100) if total_items > 0 else 0
         
-        # Get attachment statistics
-        attachment_stats = self._get_attachment_statistics(space_data["space_content"])
-        
         return {
             "created_items": created_items,
             "total_items": total_items,
             "completion_percentage": completion_percentage,
-            "upload_successful": space_data.get("processing_stats", {}).get("upload_successful", False),
-            "uploaded_at": space_data.get("processing_stats", {}).get("uploaded_at"),
-            "collection_id": space_data.get("processing_stats", {}).get("collection_id"),
+            "upload_successful": processing_stats.get("upload_successful", False),
+            "uploaded_at": processing_stats.get("uploaded_at"),
+            "collection_id": processing_stats.get("collection_id"),
             "attachment_stats": attachment_stats
         }
     
@@ -1507,31 +1919,30 @@ class ApiUploadManager:
         Returns:
             Dictionary with attachment statistics
         """
-        stats = {
-            "total_attachments": 0,
-            "uploaded_attachments": 0,
-            "failed_attachments": 0,
-            "skipped_attachments": 0
-        }
-        
-        def count_attachments(items):
-            for item in items:
-                attachment_details = item.get("attachment_details", {})
-                for path, details in attachment_details.items():
-                    stats["total_attachments"] += 1
-                    if details.get("uploaded", False):
-                        stats["uploaded_attachments"] += 1
-                    elif details.get("upload_failed_at"):
-                        stats["failed_attachments"] += 1
-                    else:
-                        stats["skipped_attachments"] += 1
-                
-                # Process children recursively
-                if item.get("children"):
-                    count_attachments(item["children"])
+        total = uploaded = failed = skipped = 0
+        
+        stack = list(content_items)
+        while stack:
+            item = stack.pop()
+            for details in item.get("attachment_details", {}).values():
+                total += 1
+                if details.get("uploaded", False):
+                    uploaded += 1
+                elif details.get("upload_failed_at"):
+                    failed += 1
+                else:
+                    skipped += 1
+            
+            children = item.get("children")
+            if children:
+                stack.extend(children)
         
-        count_attachments(content_items)
-        return stats
+        return {
+            "total_attachments": total,
+            "uploaded_attachments": uploaded,
+            "failed_attachments": failed,
+            "skipped_attachments": skipped
+        }
     
     def reset_upload_status(self, space_key: str) -> bool:
         """
@@ -1548,11 +1959,20 @@ class ApiUploadManager:
             return False
             
         try:
-            with open(space_file, 'r', encoding='utf-8') as f:
-                space_data = json.load(f)
-            
-            def reset_items(items):
-                for item in items:
+            space_data = read_space_file(space_file)
+            
+            # Track whether anything actually changes so an already reset space
+            # is not rewritten
+            dirty = False
+            
+            stack = list(space_data["space_content"])
+            while stack:
+                item = stack.pop()
+                if (item.get("created", True) is not False or
+                        item.get("page_uuid", 0) is not None or
+                        item.get("parent_uuid", 0) is not None or
+                        item.get("attachment_details", {}) != {}):
+                    dirty = True
                     item["created"] = False
                     item["page_uuid"] = None
                     item["parent_uuid"] = None
@@ -1560,24 +1980,27 @@ class ApiUploadManager:
                     # Reset attachment details as well
                     if "attachment_details" in item:
                         item["attachment_details"] = {}
-                    
-                    if item.get("children"):
-                        reset_items(item["children"])
-            
-            reset_items(space_data["space_content"])
+                
+                children = item.get("children")
+                if children:
+                    stack.extend(children)
             
             # Reset processing stats
-            if "processing_stats" in space_data:
-                space_data["processing_stats"].pop("uploaded_at", None)
-                space_data["processing_stats"].pop("upload_successful", None)
-                space_data["processing_stats"].pop("collection_id", None)
+            processing_stats = space_data.get("processing_stats")
+            if processing_stats is not None:
+                for key in ("uploaded_at", "upload_successful", "collection_id"):
+                    if key in processing_stats:
+                        del processing_stats[key]
+                        dirty = True
+            
+            if not dirty:
+                return True
             
             # Save updated JSON
-            with open(space_file, 'w', encoding='utf-8') as f:
-                json.dump(space_data, f, indent=2, ensure_ascii=False)
+            write_space_file(space_file, space_data)
                 
             return True
             
         except Exception as e:
-            self.logger.error(f"Error resetting upload status for {space_key}: {e}")
+            self.logger.error("Error resetting upload status for %s: %s", space_key, e)
             return False
\ No newline at end of file
@@ -74,11 +74,16 @@ class SecurityConfig:
             for ext in extensions:
                 if ext not in self.allowed_extensions:
                     self.allowed_extensions.append(ext)
+        
+        # Constant-time lookup set for is_allowed_file (lowercase, without the dot)
+        self._ext_set = frozenset(ext.lstrip('.').lower() for ext in self.allowed_extensions)
     
     def is_allowed_file(self, filename: str) -> bool:
         """Check if file extension is allowed."""
-        ext = Path(filename).suffix.lower()
-        return ext in self.allowed_extensions
+        # String split instead of Path(...).suffix; same rules: last path component,
+        # and a leading dot (".md") or trailing dot ("file.") is not an extension
+        stem, dot, ext = filename.rpartition('/')[2].rpartition('.')
+        return bool(stem) and ext.lower() in self._ext_set
 
 
 @dataclass
@@ -4,40 +4,47 @@ Simple DOM-based HTML Index Parser for Confluence Export Structure
 Extracts all anchor tags and builds hierarchy from DOM structure
 """
 
-import re
 from pathlib import Path
-from bs4 import BeautifulSoup, Tag
-from typing import Dict, List, Optional, Any
+from lxml import etree
+from typing import Dict, List, Optional, Any, Tuple
 import json
 
 
+# Compiled XPath expressions
+_METADATA_ROWS = etree.XPath("(//table)[1]//tr[count(.//td | .//th) >= 2]")
+_TABLE_CELLS = etree.XPath(".//td | .//th")
+_TEXT_NODES = etree.XPath(".//text()")
+
+# Space metadata table labels and the metadata fields they fill
+_METADATA_FIELDS = {
+    'Key': 'space_key',
+    'Name': 'space_name',
+    'Description': 'description',
+    'Created by': 'created_by'
+}
+
+
+def _element_text(element: etree._Element) -> str:
+    """Concatenate the stripped text nodes of an element (same as bs4 get_text(strip=True))"""
+    return ''.join(text.strip() for text in _TEXT_NODES(element))
+
+
 class DomHierarchyParser:
     """Parse index.html by extracting all links and using DOM structure for hierarchy"""
     
     def __init__(self, base_path: Path):
         self.base_path = Path(base_path)
         
-    def extract_space_metadata(self, soup: BeautifulSoup) -> Dict[str, str]:
+    def extract_space_metadata(self, root: etree._Element) -> Dict[str, str]:
         """Extract space metadata from the index.html table"""
         metadata = {}
         
-        table = soup.find('table')
-        if table:
-            rows = table.find_all('tr')
-            for row in rows:
-                cells = row.find_all(['td', 'th'])
-                if len(cells) >= 2:
-                    key = cells[0].get_text(strip=True).rstrip(':')
-                    value = cells[1].get_text(strip=True)
-                    
-                    if key == 'Key':
-                        metadata['space_key'] = value
-                    elif key == 'Name':
-                        metadata['space_name'] = value
-                    elif key == 'Description':
-                        metadata['description'] = value
-                    elif key == 'Created by':
-                        metadata['created_by'] = value
+        # Rows of the first table with at least a label and a value cell
+        for row in _METADATA_ROWS(root):
+            cells = _TABLE_CELLS(row)
+            field = _METADATA_FIELDS.get(_element_text(cells[0]).rstrip(':'))
+            if field:
+                metadata[field] = _element_text(cells[1])
                         
         return metadata
     
@@ -45,35 +52,66 @@ class DomHierarchyParser:
         """Extract page ID from href attribute"""
         if not href:
             return None
-            
-        match = re.search(r'(\d{8,})(?:\.html)?$', href)
-        return match.group(1) if match else None
+        
+        # Trailing run of 8+ digits, optionally followed by .html; string slicing
+        # instead of a regex search that would try every position in the href
+        name = href[:-5] if href.endswith('.html') else href
+        digits = len(name) - len(name.rstrip('0123456789'))
+        return name[-digits:] if digits >= 8 else None
     
-    def extract_all_page_links(self, soup: BeautifulSoup) -> List[Dict[str, Any]]:
-        """Extract all page links with hierarchy information from DOM structure"""
+    def extract_all_page_links(self, root: etree._Element) -> List[Dict[str, Any]]:
+        """
+        Extract all page links with hierarchy information from DOM structure
+        
+        A link's path is the first HTML anchor of every UL it sits in (skipping
+        anchors inside the next UL down the path), ending with the link itself.
+        Everything needed is collected in one walk over the document: every HTML
+        anchor's title in document order, and for each UL the range of anchor
+        indexes it contains. Paths are resolved from those ranges afterwards,
+        because the first anchor of a UL can come after the nested UL closes.
+        """
         
         all_links = []
         
-        # Find all anchor tags with HTML file links
-        anchors = soup.find_all('a', href=True)
-        html_anchors = [a for a in anchors if a.get('href', '').endswith('.html')]
+        # Titles of all HTML file anchors in document order
+        anchor_titles = []
+        
+        # Open ULs as [first anchor index, end anchor index] frames
+        ul_stack = []
         
-        print(f"Found {len(html_anchors)} HTML file links")
+        # (anchor element, title, UL frames from outermost to innermost)
+        candidates = []
         
-        for anchor in html_anchors:
+        for event, element in etree.iterwalk(root, events=('start', 'end'), tag=('ul', 'a')):
+            if element.tag == 'ul':
+                if event == 'start':
+                    ul_stack.append([len(anchor_titles), None])
+                else:
+                    ul_stack.pop()[1] = len(anchor_titles)
+            elif event == 'start' and element.get('href', '').endswith('.html'):
+                title = _element_text(element)
+                anchor_titles.append(title)
+                if title:  # Skip empty titles
+                    candidates.append((element, title, tuple(ul_stack)))
+        
+        print(f"Found {len(anchor_titles)} HTML file links")
+        
+        for anchor, title, ul_frames in candidates:
             href = anchor.get('href', '')
-            title = anchor.get_text(strip=True)
-            
-            if not title:  # Skip empty titles
-                continue
-                
             page_id = self.extract_page_id_from_href(href)
             
-            # Calculate hierarchy level by counting parent UL elements
-            hierarchy_level = self.get_ul_hierarchy_level(anchor)
+            # Hierarchy level is the number of UL ancestors
+            hierarchy_level = len(ul_frames)
             
-            # Build the path by walking up the DOM tree
-            path = self.build_path_from_dom(anchor, hierarchy_level)
+            # Build the path from the first anchor of each enclosing UL
+            path = []
+            for (first, end), (child_first, child_end) in zip(ul_frames, ul_frames[1:]):
+                if first < child_first:
+                    path.append(anchor_titles[first])
+                elif child_end < end:
+                    path.append(anchor_titles[child_end])
+            if ul_frames:
+                path.append(title)
             
             link_data = {
                 "title": title,
@@ -88,83 +126,22 @@ class DomHierarchyParser:
         
         return all_links
     
-    def get_ul_hierarchy_level(self, anchor: Tag) -> int:
-        """Count the number of UL ancestors to determine hierarchy level"""
-        level = 0
-        parent = anchor.parent
-        
-        while parent and parent.name != 'body':
-            if parent.name == 'ul':
-                level += 1
-            parent = parent.parent
-            
-        return level
-    
-    def build_path_from_dom(self, anchor: Tag, max_level: int) -> List[str]:
-        """Build the path by finding UL ancestors and their first anchor"""
-        path_parts = []
-        
-        # Start from the anchor and work our way up
-        current_ul = anchor.parent
-        
-        # Walk up to find the UL that contains this anchor
-        while current_ul and current_ul.name != 'ul':
-            current_ul = current_ul.parent
-            
-        # Now walk up through UL ancestors to build the path
-        ul_ancestors = []
-        parent = current_ul
-        
-        while parent and parent.name != 'body':
-            if parent.name == 'ul':
-                ul_ancestors.append(parent)
-            parent = parent.parent
-        
-        # Reverse to get top-down order
-        ul_ancestors.reverse()
-        
-        # Build path from UL ancestors
-        for i, ul_ancestor in enumerate(ul_ancestors):
-            if i == len(ul_ancestors) - 1:
-                # This is the UL containing our target anchor
-                path_parts.append(anchor.get_text(strip=True))
-            else:
-                # Find the first anchor in this UL level
-                first_anchor = self.find_first_anchor_in_ul(ul_ancestor, ul_ancestors[i+1:])
-                if first_anchor:
-                    path_parts.append(first_anchor.get_text(strip=True))
-        
-        return path_parts
-    
-    def find_first_anchor_in_ul(self, ul_element: Tag, child_uls_to_exclude: List[Tag]) -> Optional[Tag]:
-        """Find the first anchor in this UL level, excluding child ULs"""
-        
-        # Find all anchors in this UL
-        anchors = ul_element.find_all('a', href=True)
-        
-        for anchor in anchors:
-            # Check if this anchor is in any of the child ULs we should exclude
-            skip_anchor = False
-            for child_ul in child_uls_to_exclude:
-                if child_ul in anchor.parents:
-                    skip_anchor = True
-                    break
-            
-            if not skip_anchor and anchor.get('href', '').endswith('.html'):
-                return anchor
-        
-        return None
-    
     def build_hierarchy_from_links(self, links: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Build hierarchical structure from links with paths"""
         
-        # Create a map of all items by their full path
+        # Create a map of all items by their full path, noting root paths
+        # (length 1) as they are first seen; a repeated path replaces the item
+        # but keeps its original position, so roots are resolved by key
         path_map = {}
+        root_keys = []
         for link in links:
-            path_key = tuple(link['path'])
+            path = link['path']
+            path_key = tuple(path)
+            if len(path_key) == 1 and path_key not in path_map:
+                root_keys.append(path_key)
             path_map[path_key] = {
                 "title": link['title'],
-                "path": link['path'][:],
+                "path": path[:],
                 "page_id": link['page_id'],
                 "href": link['href'],
                 "uuid": None,
@@ -176,14 +153,14 @@ class DomHierarchyParser:
         for path_key, item in path_map.items():
             if len(path_key) > 1:
                 # Find parent
-                parent_path_key = path_key[:-1]
-                if parent_path_key in path_map:
-                    parent = path_map[parent_path_key]
+                parent = path_map.get(path_key[:-1])
+                if parent is not None:
                     parent['children'].append(item)
-                    parent['type'] = 'navigation'
+                    if parent['type'] != 'navigation':
+                        parent['type'] = 'navigation'
         
         # Return root items (those with path length 1)
-        root_items = [item for path_key, item in path_map.items() if len(path_key) == 1]
+        root_items = [path_map[path_key] for path_key in root_keys]
         
         return root_items
     
@@ -198,23 +175,32 @@ class DomHierarchyParser:
         
         print(f"HTML content length: {len(content)} characters")
         
-        # Parse with lxml for better performance
-        soup = BeautifulSoup(content, 'lxml')
-        
-        # Extract metadata
-        metadata = self.extract_space_metadata(soup)
+        # Parse with lxml directly and traverse with XPath; lxml rejects str input
+        # carrying an XML encoding declaration, so hand it the UTF-8 bytes
+        root = etree.HTML(content.encode('utf-8'), parser=etree.HTMLParser(encoding='utf-8'))
+        
+        if root is None:
+            # Blank document
+            metadata = {}
+            links = []
+            print("Found 0 HTML file links")
+        else:
+            # Extract metadata
+            metadata = self.extract_space_metadata(root)
+            
+            # Extract all page links with hierarchy
+            links = self.extract_all_page_links(root)
         
-        # Extract all page links with hierarchy
-        links = self.extract_all_page_links(soup)
         print(f"Extracted {len(links)} page links")
         
         # Build hierarchical structure
         navigation = self.build_hierarchy_from_links(links)
         
-        # Calculate statistics
-        total_pages = sum(1 for link in links if len([l for l in links if l['path'][:-1] == link['path']]) == 0)
-        total_nav_nodes = len(links) - total_pages
-        max_depth = max(len(link['path']) for link in links) if links else 0
+        # Calculate statistics (page and navigation counts come from the built tree);
+        # each path is converted to a tuple once and the depth read from the set
+        unique_paths = {tuple(link['path']) for link in links}
+        max_depth = max(map(len, unique_paths), default=0)
+        total_pages, total_navigation_nodes = self.count_nodes(navigation)
         
         structure = {
             "parsing_approach": "DOM_HIERARCHY_BASED",
@@ -225,10 +211,10 @@ class DomHierarchyParser:
             "navigation": navigation,
             "stats": {
                 "total_links_found": len(links),
-                "total_pages": self.count_pages(navigation),
-                "total_navigation_nodes": self.count_navigation_nodes(navigation),
+                "total_pages": total_pages,
+                "total_navigation_nodes": total_navigation_nodes,
                 "max_depth": max_depth,
-                "unique_paths": len(set(tuple(link['path']) for link in links))
+                "unique_paths": len(unique_paths)
             },
             "debug_info": {
                 "first_10_links": [
@@ -245,25 +231,21 @@ class DomHierarchyParser:
         
         return structure
     
-    def count_pages(self, navigation: List[Dict[str, Any]]) -> int:
-        """Count total number of pages (leaf nodes)"""
-        count = 0
-        for item in navigation:
-            if item.get("type") == "page":
-                count += 1
-            if item.get("children"):
-                count += self.count_pages(item["children"])
-        return count
-    
-    def count_navigation_nodes(self, navigation: List[Dict[str, Any]]) -> int:
-        """Count total number of navigation nodes (non-leaf nodes)"""
-        count = 0
-        for item in navigation:
-            if item.get("type") == "navigation":
-                count += 1
-            if item.get("children"):
-                count += self.count_navigation_nodes(item["children"])
-        return count
+    def count_nodes(self, navigation: List[Dict[str, Any]]) -> Tuple[int, int]:
+        """Count pages (leaf nodes) and navigation nodes (non-leaf nodes) in one walk"""
+        pages = navigation_nodes = 0
+        stack = list(navigation)
+        while stack:
+            item = stack.pop()
+            item_type = item.get("type")
+            if item_type == "page":
+                pages += 1
+            elif item_type == "navigation":
+                navigation_nodes += 1
+            children = item.get("children")
+            if children:
+                stack.extend(children)
+        return pages, navigation_nodes
 
 
 def main():
@@ -1,14 +1,23 @@
 import html2text
-import re
+import os
 import pathlib
-from typing import Dict, List, Optional, Union, Any
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union, Any
 import json
+from bs4 import BeautifulSoup
 from tqdm import tqdm
 from .patterns import ConfluencePatterns, HTMLCleaningPatterns
-from .logger import get_logger
+from .logger import get_logger, get_worker_log_config, setup_worker_logging
 
 
 class ConfluenceHTMLCleaner:
+    # Attributes that survive cleaning; everything else is stripped from every tag
+    KEPT_ATTRIBUTES = frozenset(('href', 'src', 'alt', 'title'))
+    
+    # Characters at the start of a markdown file searched for the breadcrumb list
+    BREADCRUMB_SEARCH_WINDOW = 4096
+    
     def __init__(self, preserve_breadcrumbs: bool = True, preserve_titles: bool = True):
         """
         Initialize the HTML cleaner for Confluence exports.
@@ -74,14 +83,14 @@ class ConfluenceHTMLCleaner:
         if title_span:
             title = title_span.get_text().strip()
             # Clean up title - remove "Information Systems :" prefix if present
-            title = re.sub(r'^Information\s+Systems\s*:\s*', '', title, flags=re.IGNORECASE)
+            title = ConfluencePatterns.INFO_SYS_PREFIX_PATTERN.sub('', title)
             return title
         
         # Fallback to HTML title tag
         title_tag = soup.find('title')
         if title_tag:
             title = title_tag.get_text().strip()
-            title = re.sub(r'^Information\s+Systems\s*:\s*', '', title, flags=re.IGNORECASE)
+            title = ConfluencePatterns.INFO_SYS_PREFIX_PATTERN.sub('', title)
             return title
         
         return ""
@@ -99,9 +108,9 @@ class ConfluenceHTMLCleaner:
         if not self.preserve_breadcrumbs:
             return ""
         
-        # Look for numbered list at the beginning (handles multi-line links)
-        breadcrumb_pattern = r'^((?:\d+\.\s+\[.*?\](?:\([^)]+\)|\n\s+[^)]*\([^)]+\))\s*\n?)+)'
-        match = re.search(breadcrumb_pattern, content, re.MULTILINE | re.DOTALL)
+        # Look for numbered list at the beginning (handles multi-line links); only
+        # the head of the file is searched, without slicing a copy of it
+        match = ConfluencePatterns.BREADCRUMB_SECTION_PATTERN.search(content, 0, self.BREADCRUMB_SEARCH_WINDOW)
         
         if match:
             return match.group(1).strip()
@@ -121,29 +130,25 @@ class ConfluenceHTMLCleaner:
             return ""
         
         # Look for Confluence title pattern
-        title_patterns = [
-            r'#\s*<span[^>]*id="title-text"[^>]*>\s*([^<]+)\s*</span>',
-            r'#\s*<span[^>]*>\s*Information Systems\s*:\s*([^<]+)\s*</span>',
-            r'#\s+(.+?)(?:\s*{[^}]*})?$'  # Fallback for markdown headers
-        ]
-        
-        for pattern in title_patterns:
-            match = re.search(pattern, content, re.MULTILINE | re.IGNORECASE)
+        for pattern in HTMLCleaningPatterns.MARKDOWN_TITLE_PATTERNS:
+            match = pattern.search(content)
             if match:
                 title = match.group(1).strip()
                 # Clean up title - remove "Information Systems :" prefix if present
-                title = re.sub(r'^Information\s+Systems\s*:\s*', '', title, flags=re.IGNORECASE)
+                title = ConfluencePatterns.INFO_SYS_PREFIX_PATTERN.sub('', title)
                 return title
         
         return ""
     
-    def clean_confluence_specific_soup(self, soup) -> None:
+    def clean_confluence_specific_soup(self, soup, raw_content: Optional[str] = None) -> None:
         """
         Pre-process BeautifulSoup object to handle Confluence-specific HTML.
         Modifies the soup object in place for efficiency.
         
         Args:
             soup: BeautifulSoup object to clean (modified in place)
+            raw_content: HTML the soup was parsed from; lets DOM scans for text
+                that does not occur in the source be skipped
         """
         # Remove the breadcrumb section to avoid duplication
         breadcrumb_section = soup.find('div', {'id': 'breadcrumb-section'})
@@ -165,31 +170,38 @@ class ConfluenceHTMLCleaner:
             style.decompose()
         
         # Remove data attributes from spans and other tags
+        kept_attributes = self.KEPT_ATTRIBUTES
         for tag in soup.find_all():
-            if tag.attrs:
-                # Keep only href, src, alt, title attributes
-                attrs_to_keep = ['href', 'src', 'alt', 'title']
-                tag.attrs = {k: v for k, v in tag.attrs.items() if k in attrs_to_keep}
+            attrs = tag.attrs
+            if attrs:
+                # Keep only href, src, alt, title attributes; delete the rest in place
+                # rather than rebuilding the dict for every tag
+                for name in [name for name in attrs if name not in kept_attributes]:
+                    del attrs[name]
         
         # Clean up Confluence-specific classes and spans
-        for span in soup.find_all('span', class_=re.compile(r'legacy-color-text|author|editor|ng-scope')):
+        for span in soup.find_all('span', class_=HTMLCleaningPatterns.CONFLUENCE_CLASS_PATTERN):
             span.unwrap()
         
-        # Remove empty paragraphs and divs
+        # Remove empty paragraphs and divs; stop at the first non-blank string
+        # rather than joining all of the element's text with get_text()
         for p in soup.find_all(['p', 'div']):
-            if not p.get_text().strip():
+            if not p.contents or not any(text.strip() for text in p.strings):
                 p.decompose()
         
         # Remove Confluence footer content
-        # Look for text containing "Document generated by Confluence"
-        for element in soup.find_all(text=re.compile(r'Document generated by Confluence', re.IGNORECASE)):
-            # Remove the parent element containing this text
-            parent = element.parent
-            if parent:
-                parent.decompose()
+        # Look for text containing "Document generated by Confluence"; a single
+        # search of the source decides whether the text-node scan is needed
+        footer_pattern = HTMLCleaningPatterns.CONFLUENCE_FOOTER_TEXT_PATTERN
+        if raw_content is None or footer_pattern.search(raw_content):
+            for element in soup.find_all(text=footer_pattern):
+                # Remove the parent element containing this text
+                parent = element.parent
+                if parent:
+                    parent.decompose()
         
         # Remove Atlassian links
-        for link in soup.find_all('a', href=re.compile(r'atlassian\.com', re.IGNORECASE)):
+        for link in soup.find_all('a', href=HTMLCleaningPatterns.ATLASSIAN_HREF_PATTERN):
             link.decompose()
     
     def detect_content_type(self, content: str) -> str:
@@ -203,7 +215,7 @@ class ConfluenceHTMLCleaner:
             'html' or 'markdown'
         """
         # Simple detection - if it has HTML doctype or common HTML tags, it's HTML
-        if re.search(r'<!DOCTYPE html|<html|<head|<body', content, re.IGNORECASE):
+        if HTMLCleaningPatterns.HTML_DOCTYPE_PATTERN.search(content):
             return 'html'
         return 'markdown'
     
@@ -218,8 +230,8 @@ class ConfluenceHTMLCleaner:
             Dictionary with cleaned content and metadata
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                raw_content = f.read()
+            # Text mode keeps universal newline handling (\r\n -> \n)
+            raw_content = pathlib.Path(file_path).read_text(encoding='utf-8')
         except Exception as e:
             return {
                 'error': f"Failed to read file: {e}",
@@ -230,9 +242,8 @@ class ConfluenceHTMLCleaner:
         content_type = self.detect_content_type(raw_content)
         
         if content_type == 'html':
-            # OPTIMIZED: Parse HTML once and reuse
-            from bs4 import BeautifulSoup
-            soup = BeautifulSoup(raw_content, 'html.parser')
+            # OPTIMIZED: Parse HTML once (with the C-based lxml parser) and reuse
+            soup = BeautifulSoup(raw_content, 'lxml')
             
             # Extract breadcrumb navigation from parsed soup
             breadcrumb = self.extract_breadcrumb_navigation_from_soup(soup)
@@ -240,7 +251,7 @@ class ConfluenceHTMLCleaner:
             title = self.extract_confluence_title_from_soup(soup)
             
             # Clean Confluence-specific elements in place
-            self.clean_confluence_specific_soup(soup)
+            self.clean_confluence_specific_soup(soup, raw_content)
             
             # Convert cleaned soup to markdown
             clean_markdown = self.converter.handle(str(soup))
@@ -276,40 +287,43 @@ class ConfluenceHTMLCleaner:
             Cleaned and formatted markdown
         """
         # Remove excessive blank lines
-        markdown = re.sub(r'\n{3,}', '\n\n', markdown)
+        markdown = ConfluencePatterns.EXCESSIVE_NEWLINES_PATTERN.sub('\n\n', markdown)
         
         # Clean up malformed links
-        markdown = re.sub(r'\[\s*\]\([^)]*\)', '', markdown)  # Remove empty links
+        markdown = ConfluencePatterns.EMPTY_LINKS_PATTERN.sub('', markdown)  # Remove empty links
         
         # Remove Confluence footer references (flexible date matching)
-        markdown = re.sub(r'Document generated by Confluence on [^\n]*\n*', '', markdown, flags=re.IGNORECASE)
-        markdown = re.sub(r'\[Atlassian\]\([^)]*\)\s*', '', markdown, flags=re.IGNORECASE)
+        markdown = ConfluencePatterns.CONFLUENCE_FOOTER_PATTERN.sub('', markdown)
+        markdown = ConfluencePatterns.ATLASSIAN_LINK_PATTERN.sub('', markdown)
         
         # Remove any remaining Confluence metadata patterns
-        markdown = re.sub(r'Created by.*?(?=\n\n|\n#|\Z)', '', markdown, flags=re.DOTALL)
-        markdown = re.sub(r'last modified by.*?on [^\n]*\n*', '', markdown, flags=re.IGNORECASE)
+        markdown = ConfluencePatterns.CREATED_BY_PATTERN.sub('', markdown)
+        markdown = ConfluencePatterns.LAST_MODIFIED_PATTERN.sub('', markdown)
         
         # Fix spacing around headers
-        markdown = re.sub(r'\n(#{1,6}\s)', r'\n\n\1', markdown)
+        markdown = ConfluencePatterns.HEADER_SPACING_PATTERN.sub(r'\n\n\1', markdown)
         
-        # Clean up trailing whitespace
-        lines = [line.rstrip() for line in markdown.split('\n')]
-        markdown = '\n'.join(lines)
-        
-        # Remove trailing empty lines but keep one final newline
-        markdown = markdown.rstrip() + '\n' if markdown.strip() else ''
+        # Clean up trailing whitespace on every line in one pass
+        markdown = ConfluencePatterns.TRAILING_WHITESPACE_PATTERN.sub('', markdown)
         
+        # Remove leading and trailing empty lines
         return markdown.strip()
     
     def process_directory(self, input_dir: str, output_dir: Optional[str] = None, 
-                         file_pattern: str = "*.md") -> Dict[str, Any]:
+                         file_pattern: str = "*.md", max_workers: Optional[int] = None) -> Dict[str, Any]:
         """
         Process all files in a directory.
         
+        Files are cleaned in a pool of worker processes (parsing and conversion
+        are CPU-bound) as the directory walk finds them; output files and the
+        summary are written here, in walk order. Files under the output
+        directory are skipped since it may sit inside the input directory.
+        
         Args:
             input_dir: Directory containing files to process
             output_dir: Directory to save cleaned files (optional)
             file_pattern: File pattern to match (default: *.md)
+            max_workers: Worker processes to use (default: CPU count, 1 = no pool)
             
         Returns:
             Processing results summary
@@ -326,66 +340,136 @@ class ConfluenceHTMLCleaner:
             output_path = input_path / "cleaned"
             output_path.mkdir(exist_ok=True)
         
-        # Find all matching files (search recursively)
-        files_to_process = list(input_path.rglob(file_pattern))
+        # Find all matching files (search recursively); the walk is consumed
+        # lazily so cleaning starts with the first file found
+        files_to_process = (
+            file_path for file_path in input_path.rglob(file_pattern)
+            if not file_path.is_relative_to(output_path)
+        )
         results = {
-            'total_files': len(files_to_process),
+            'total_files': 0,  # Counted as files are found
             'processed': 0,
             'errors': [],
             'files_processed': [],
             'output_directory': str(output_path)
         }
         
-        for file_path in tqdm(files_to_process, desc="Processing HTML files", unit="file"):
-            # Clean the file
-            cleaned_data = self.clean_file(str(file_path))
-            
-            if 'error' in cleaned_data:
-                self.logger.error(f"Failed to clean {file_path.name}: {cleaned_data['error']}")
-                results['errors'].append({
-                    'file': file_path.name,
-                    'error': cleaned_data['error']
-                })
-                continue
-            
-            # Write cleaned file
-            try:
-                # Calculate relative path from input to maintain directory structure
-                relative_path = file_path.relative_to(input_path)
-                
-                # Create output file path with preserved directory structure
-                output_file = output_path / f"clean_{relative_path}"
-                
-                # Ensure parent directories exist
-                output_file.parent.mkdir(parents=True, exist_ok=True)
-                
-                # Create cleaned markdown file
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    if cleaned_data['breadcrumb']:
-                        f.write(str(cleaned_data['breadcrumb']) + '\n\n')
-                    
-                    if cleaned_data['title']:
-                        f.write(f"# {cleaned_data['title']}\n\n")
-                    
-                    f.write(str(cleaned_data['clean_content']))
-                
-                results['processed'] += 1
-                results['files_processed'].append({
-                    'input': file_path.name,
-                    'output': output_file.name,
-                    'title': str(cleaned_data['title']),
-                    'size_reduction': int(cleaned_data['original_size']) - int(cleaned_data['cleaned_size'])
-                })
-                
-            except Exception as e:
-                results['errors'].append({
-                    'file': file_path.name,
-                    'error': f"Failed to write output: {e}"
-                })
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker_cleaner,
+                initargs=(self.preserve_breadcrumbs, self.preserve_titles, get_worker_log_config())
+            )
+            cleaned_files = _clean_files_in_pool(executor, files_to_process, workers * 4)
+        else:
+            executor = None
+            cleaned_files = ((file_path, self.clean_file(str(file_path))) for file_path in files_to_process)
+        
+        try:
+            for file_path, cleaned_data in tqdm(cleaned_files, desc="Processing HTML files", unit="file"):
+                results['total_files'] += 1
+                self._write_cleaned_file(file_path, cleaned_data, input_path, output_path, results)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
         
         # Write processing summary
         summary_file = output_path / "processing_summary.json"
         with open(summary_file, 'w', encoding='utf-8') as f:
             json.dump(results, f, indent=2, ensure_ascii=False)
         
-        return results
\ No newline at end of file
+        return results
+    
+    def _write_cleaned_file(self, file_path: pathlib.Path, cleaned_data: Dict[str, Union[str, int]],
+                            input_path: pathlib.Path, output_path: pathlib.Path, results: Dict[str, Any]) -> None:
+        """
+        Write one cleaned file and record the outcome in the results summary.
+        
+        Args:
+            file_path: Source file that was cleaned
+            cleaned_data: Result of clean_file for that file
+            input_path: Input directory (for the relative output path)
+            output_path: Output directory
+            results: Processing results summary to update
+        """
+        if 'error' in cleaned_data:
+            self.logger.error(f"Failed to clean {file_path.name}: {cleaned_data['error']}")
+            results['errors'].append({
+                'file': file_path.name,
+                'error': cleaned_data['error']
+            })
+            return
+        
+        # Write cleaned file
+        try:
+            # Calculate relative path from input to maintain directory structure
+            relative_path = file_path.relative_to(input_path)
+            
+            # Create output file path with preserved directory structure
+            output_file = output_path / f"clean_{relative_path}"
+            
+            # Ensure parent directories exist
+            output_file.parent.mkdir(parents=True, exist_ok=True)
+            
+            # Create cleaned markdown file, assembled first and written in one call
+            parts = []
+            if cleaned_data['breadcrumb']:
+                parts.append(f"{cleaned_data['breadcrumb']}\n\n")
+            
+            if cleaned_data['title']:
+                parts.append(f"# {cleaned_data['title']}\n\n")
+            
+            parts.append(cleaned_data['clean_content'])
+            output_file.write_text(''.join(parts), encoding='utf-8')
+            
+            results['processed'] += 1
+            results['files_processed'].append({
+                'input': file_path.name,
+                'output': output_file.name,
+                'title': str(cleaned_data['title']),
+                'size_reduction': int(cleaned_data['original_size']) - int(cleaned_data['cleaned_size'])
+            })
+            
+        except Exception as e:
+            results['errors'].append({
+                'file': file_path.name,
+                'error': f"Failed to write output: {e}"
+            })
+
+
+# Cleaner of the current worker process, set by _init_worker_cleaner
+_worker_cleaner: Optional[ConfluenceHTMLCleaner] = None
+
+
+def _init_worker_cleaner(preserve_breadcrumbs: bool, preserve_titles: bool,
+                         log_config: Optional[Tuple[Any, int]]) -> None:
+    """Create the per-process cleaner used by _clean_file_in_worker."""
+    global _worker_cleaner
+    setup_worker_logging(log_config)
+    _worker_cleaner = ConfluenceHTMLCleaner(preserve_breadcrumbs, preserve_titles)
+
+
+def _clean_file_in_worker(file_path: str) -> Dict[str, Union[str, int]]:
+    """Clean one file with this worker process's cleaner."""
+    return _worker_cleaner.clean_file(file_path)
+
+
+def _clean_files_in_pool(executor: Executor, files: Iterable[pathlib.Path],
+                         max_pending: int) -> Iterator[Tuple[pathlib.Path, Dict[str, Union[str, int]]]]:
+    """
+    Clean files in the pool, yielding (path, result) pairs in input order.
+    
+    Unlike Executor.map, which submits the whole input up front, at most
+    max_pending files are queued at a time, so the input can be a lazy
+    directory walk and memory stays bounded.
+    """
+    pending = deque()
+    for file_path in files:
+        pending.append((file_path, executor.submit(_clean_file_in_worker, str(file_path))))
+        if len(pending) >= max_pending:
+            file_path, future = pending.popleft()
+            yield file_path, future.result()
+    while pending:
+        file_path, future = pending.popleft()
+        yield file_path, future.result()
@@ -4,15 +4,28 @@ Logging configuration for the Confluence processing system.
 This module provides centralized logging setup with consistent formatting
 and configurable levels for different components.
 """
+import atexit
 import logging
+import logging.handlers
+import multiprocessing
+# Imported before the atexit registration below: atexit runs handlers in
+# reverse order, so the worker listener drains its queue before
+# multiprocessing closes its queues at exit
+import multiprocessing.util
+import queue
 import sys
-from typing import Optional
+import threading
+from typing import Any, List, Optional, Tuple
 
 
 def setup_logging(level: int = logging.INFO, log_file: Optional[str] = None) -> logging.Logger:
     """
     Set up logging configuration for the application.
     
+    The logger itself only enqueues records; formatting and output happen on
+    a background QueueListener thread so log calls never block on I/O. Worker
+    processes log through get_worker_log_config/setup_worker_logging.
+    
     Args:
         level: Logging level (DEBUG, INFO, WARNING, ERROR, CRITICAL)
         log_file: Optional file path to also log to a file
@@ -20,6 +33,8 @@ def setup_logging(level: int = logging.INFO, log_file: Optional[str] = None) ->
     Returns:
         Configured logger instance
     """
+    global _listener, _handlers, _worker_listener, _worker_log_queue
+    
     # Create formatter
     formatter = logging.Formatter(
         '%(asctime)s - %(name)s - %(levelname)s - %(message)s',
@@ -32,21 +47,94 @@ def setup_logging(level: int = logging.INFO, log_file: Optional[str] = None) ->
     
     # Clear any existing handlers to avoid duplicates
     logger.handlers.clear()
+    _stop_listener()
+    _worker_listener = _worker_log_queue = None
     
     # Console handler
     console_handler = logging.StreamHandler(sys.stdout)
     console_handler.setFormatter(formatter)
-    logger.addHandler(console_handler)
+    handlers = [console_handler]
     
-    # Optional file handler
+    # Optional file handler, buffered so records are written in batches
+    # (flushed when full, on errors, and when logging shuts down)
     if log_file:
         file_handler = logging.FileHandler(log_file, mode='a', encoding='utf-8')
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+        handlers.append(logging.handlers.MemoryHandler(capacity=1024, target=file_handler))
+    
+    # Hand records to the real handlers through a queue serviced by a background thread
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    _handlers = handlers
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
     
     return logger
 
 
+def get_worker_log_config() -> Optional[Tuple[Any, int]]:
+    """
+    Get the logging configuration to pass to a worker process pool's initializer.
+    
+    The first call creates a multiprocessing queue and a second listener that
+    writes the records workers put on it with this process's handlers.
+    
+    Returns:
+        (log queue, level) for setup_worker_logging, or None if setup_logging
+        has not been called
+    """
+    global _worker_listener, _worker_log_queue
+    
+    if _listener is None:
+        return None
+    
+    with _worker_lock:
+        if _worker_log_queue is None:
+            _worker_log_queue = multiprocessing.Queue()
+            _worker_listener = logging.handlers.QueueListener(
+                _worker_log_queue, *_handlers, respect_handler_level=True
+            )
+            _worker_listener.start()
+    
+    return _worker_log_queue, logging.getLogger('confluence_processor').level
+
+
+def setup_worker_logging(log_config: Optional[Tuple[Any, int]]) -> None:
+    """
+    Send a worker process's log records to the parent process's listener.
+    
+    Args:
+        log_config: Result of get_worker_log_config in the parent process
+    """
+    logger = logging.getLogger('confluence_processor')
+    
+    # A forked worker inherits the parent's QueueHandler, whose queue only the
+    # parent reads
+    logger.handlers.clear()
+    if log_config is not None:
+        log_queue, level = log_config
+        logger.setLevel(level)
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+
+def _stop_listener() -> None:
+    """Drain the log queues at interpreter exit (runs before logging.shutdown)."""
+    for listener in (_listener, _worker_listener):
+        if listener is not None:
+            listener.stop()
+
+
+# Background listener writing queued records, started by setup_logging
+_listener: Optional[logging.handlers.QueueListener] = None
+_handlers: List[logging.Handler] = []
+
+# Listener for records from worker processes, started by get_worker_log_config
+_worker_listener: Optional[logging.handlers.QueueListener] = None
+_worker_log_queue: Optional[Any] = None
+_worker_lock = threading.Lock()
+atexit.register(_stop_listener)
+
+
 def get_logger(name: str) -> logging.Logger:
     """
     Get a logger instance for a specific module.
@@ -70,6 +158,8 @@ class ProgressLogger:
         self.operation = operation
         self.total = total
         self.current = 0
+        # Item counts at which progress is logged (25%, 50%, 75%, 100%)
+        self._thresholds = {total // 4, total // 2, (3 * total) // 4, total} - {0}
         self.logger.info(f"Starting {operation} - {total} items to process")
     
     def update(self, increment: int = 1, message: str = ""):
@@ -77,8 +167,8 @@ class ProgressLogger:
         self.current += increment
         
         # Log progress at 25%, 50%, 75%, 100%
-        progress_percent = (self.current / self.total) * 100
-        if self.current == self.total or progress_percent in [25, 50, 75]:
+        if self.current in self._thresholds:
+            progress_percent = (self.current / self.total) * 100
             status_msg = f"{self.operation} progress: {self.current}/{self.total} ({progress_percent:.0f}%)"
             if message:
                 status_msg += f" - {message}"
@@ -0,0 +1,33 @@
+"""
+MIME type guessing for attachment files.
+
+Attachments are typed from their file names both when a space is scanned
+and when it is uploaded; both go through guess_mime_type so the lookups
+share one cache and always agree.
+"""
+import mimetypes
+import os
+from functools import lru_cache
+
+
+@lru_cache(maxsize=256)
+def _guess_mime_type_for_suffixes(suffixes: str) -> str:
+    """Guess the MIME type for a file name ending in suffixes (cached per suffix pair)."""
+    return mimetypes.guess_type('x' + suffixes)[0] or 'application/octet-stream'
+
+
+def guess_mime_type(filename: str) -> str:
+    """
+    Guess the MIME type of a file from its name.
+
+    mimetypes only looks at the last two extensions (e.g. ".tar.gz"), so the
+    lookup is cached on those rather than on the whole name.
+
+    Args:
+        filename: File name (without directory)
+
+    Returns:
+        MIME type, or 'application/octet-stream' if unknown
+    """
+    stem, ext = os.path.splitext(filename)
+    return _guess_mime_type_for_suffixes(os.path.splitext(stem)[1] + ext)
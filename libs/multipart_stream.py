@@ -0,0 +1,88 @@
+"""
+Streaming multipart/form-data bodies for storage uploads.
+
+requests builds multipart bodies fully in memory; this module exposes the
+body as a file-like object instead, so attachments are read from disk in
+small chunks while they are being sent.
+"""
+import io
+import os
+import uuid
+from typing import BinaryIO, Dict, Iterator
+
+from urllib3.fields import RequestField
+
+
+class MultipartFileStream:
+    """
+    File-like multipart/form-data body with a single file field.
+
+    The form fields and part headers are encoded up front; the file itself is
+    only read as the HTTP client pulls data. The total length is known, so the
+    request is sent with a Content-Length header rather than chunked encoding.
+    """
+
+    def __init__(self, fields: Dict[str, str], file_name: str,
+                 file_obj: BinaryIO, content_type: str, chunk_size: int = 64 * 1024):
+        """
+        Initialize the multipart stream.
+
+        Args:
+            fields: Plain form fields sent before the file
+            file_name: File name reported to the server
+            file_obj: Open binary file positioned at its start
+            content_type: MIME type of the file part
+            chunk_size: Bytes yielded per iteration step
+        """
+        self.boundary = uuid.uuid4().hex
+        self.chunk_size = chunk_size
+
+        head = io.BytesIO()
+        for name, value in fields.items():
+            data = value if isinstance(value, bytes) else str(value).encode()
+            field = RequestField(name=name, data=data)
+            field.make_multipart()
+            head.write(f"--{self.boundary}\r\n".encode())
+            head.write(field.render_headers().encode())
+            head.write(data)
+            head.write(b"\r\n")
+
+        file_field = RequestField(name="file", data=b"", filename=file_name)
+        file_field.make_multipart(content_type=content_type)
+        head.write(f"--{self.boundary}\r\n".encode())
+        head.write(file_field.render_headers().encode())
+
+        tail = f"\r\n--{self.boundary}--\r\n".encode()
+        file_size = os.fstat(file_obj.fileno()).st_size
+
+        self._length = head.tell() + file_size + len(tail)
+        head.seek(0)
+        self._parts = [head, file_obj, io.BytesIO(tail)]
+
+    @property
+    def content_type(self) -> str:
+        """Content-Type header value including the boundary"""
+        return f"multipart/form-data; boundary={self.boundary}"
+
+    def __len__(self) -> int:
+        return self._length
+
+    def read(self, size: int = -1) -> bytes:
+        """Read up to size bytes of the encoded body (everything if size < 0)"""
+        chunks = []
+        while self._parts and size != 0:
+            data = self._parts[0].read(size)
+            if not data:
+                self._parts.pop(0)
+                continue
+            chunks.append(data)
+            if size > 0:
+                size -= len(data)
+        return b"".join(chunks)
+
+    def __iter__(self) -> Iterator[bytes]:
+        while True:
+            chunk = self.read(self.chunk_size)
+            if not chunk:
+                return
+            yield chunk
@@ -1,18 +1,92 @@
-import re
-from typing import List, Dict, Optional
+from typing import Any, List, Dict, Iterator, Optional, Tuple
 import pathlib
 import json
 import os
-import mimetypes
-from collections import defaultdict
+import mmap
+import fnmatch
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
 from .patterns import ConfluencePatterns
-from .logger import get_logger
+from .logger import get_logger, get_worker_log_config, setup_worker_logging
+from .mime_types import guess_mime_type
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is used otherwise
+    orjson = None
+
+
+def _scandir_walk(root: str, pattern: str) -> Iterator[str]:
+    """
+    Recursively yield paths of regular files under root whose name matches pattern.
+    
+    Uses an explicit stack of os.scandir calls so no Path objects are built
+    per entry; simple "*<suffix>" patterns are matched with str.endswith.
+    
+    Args:
+        root: Directory to walk
+        pattern: Filename glob pattern (e.g. "*.md")
+        
+    Returns:
+        Iterator of file path strings
+    """
+    suffix = pattern[1:] if pattern.startswith('*') and not any(c in pattern[1:] for c in '*?[') else None
+    stack = [root]
+    while stack:
+        directory = stack.pop()
+        try:
+            with os.scandir(directory) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        stack.append(entry.path)
+                        continue
+                    matched = entry.name.endswith(suffix) if suffix is not None else fnmatch.fnmatchcase(entry.name, pattern)
+                    # Symlinks to directories, FIFOs and sockets can't be read as pages
+                    if matched and entry.is_file():
+                        yield entry.path
+        except OSError:
+            continue
+
+
+def _read_text(file_path: str) -> str:
+    """
+    Read a UTF-8 text file with a single read and a single decode.
+    
+    Skips the incremental TextIOWrapper decoding of text mode; newlines are
+    translated afterwards so the result is the same as reading in text mode.
+    
+    Args:
+        file_path: Path to the file
+        
+    Returns:
+        The decoded file content
+    """
+    with open(file_path, 'rb') as f:
+        content = f.read().decode('utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+class _DeferredContent:
+    """Placeholder for page content that is read and cleaned only when serialized."""
+    
+    __slots__ = ('file_path',)
+    
+    def __init__(self, file_path: str):
+        self.file_path = file_path
 
 
 class Pages:
-    def __init__(self, pages_directory: str = "../pages", attachments_base_path: str = "../IS/attachments"):
+    # Bumped whenever the cached page record format changes
+    CACHE_VERSION = 1
+    
+    def __init__(self, pages_directory: str = "../pages", attachments_base_path: str = "../IS/attachments",
+                 cache_file: Optional[str] = None):
         self.pages_directory = pathlib.Path(pages_directory)
         self.attachments_base_path = pathlib.Path(attachments_base_path)
+        # Optional JSON file remembering processed page metadata between runs
+        self.cache_file = cache_file
         self.logger = get_logger('pages')
     
     def parse_location_data(self, markdown_content: str) -> List[Dict[str, str]]:
@@ -27,15 +101,19 @@ class Pages:
         """
         location_data = []
         
-        # Split content into lines and look for the numbered list at the beginning
-        lines = markdown_content.strip().split('\n')
+        # Bind the patterns to locals once; they are used for every line
+        numbered_list_pattern = ConfluencePatterns.NUMBERED_LIST_PATTERN
+        multiline_start_pattern = ConfluencePatterns.MULTILINE_START_PATTERN
+        multiline_end_pattern = ConfluencePatterns.MULTILINE_END_PATTERN
         
-        i = 0
-        while i < len(lines):
-            line = lines[i].strip()
+        # Iterate over the lines so multi-line links can consume their continuation lines
+        lines = iter(markdown_content.strip().split('\n'))
+        
+        for line in lines:
+            line = line.strip()
             
             # Look for numbered list items (e.g., "1. [Title](link.html)")
-            match = ConfluencePatterns.NUMBERED_LIST_PATTERN.match(line)
+            match = numbered_list_pattern.match(line)
             
             if match:
                 title = match.group(1)
@@ -46,19 +124,18 @@ class Pages:
                 })
             else:
                 # Check for multi-line numbered list items  
-                match = ConfluencePatterns.MULTILINE_START_PATTERN.match(line)
+                match = multiline_start_pattern.match(line)
                 
                 if match:
                     # Start of a multi-line link
                     title_parts = [match.group(1)]
-                    i += 1
                     
                     # Continue reading lines until we find the closing bracket and link
-                    while i < len(lines):
-                        next_line = lines[i].strip()
+                    for next_line in lines:
+                        next_line = next_line.strip()
                         
                         # Check if this line completes the link
-                        end_match = ConfluencePatterns.MULTILINE_END_PATTERN.match(next_line)
+                        end_match = multiline_end_pattern.match(next_line)
                         
                         if end_match:
                             title_parts.append(end_match.group(1))
@@ -72,14 +149,10 @@ class Pages:
                         else:
                             # This line is part of the title
                             title_parts.append(next_line)
-                        
-                        i += 1
                 elif line and not line.startswith('#') and location_data:
                     # If we hit a non-numbered line that's not a header and we already have location data,
                     # we've probably reached the end of the breadcrumb
                     break
-            
-            i += 1
                 
         return location_data
     
@@ -94,8 +167,7 @@ class Pages:
             List of dictionaries with 'title' and 'link' keys
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = _read_text(file_path)
             return self.parse_location_data(content)
         except FileNotFoundError:
             print(f"File not found: {file_path}")
@@ -118,8 +190,8 @@ class Pages:
         if not self.pages_directory.exists():
             return []
         
-        # Use rglob to search recursively through subdirectories
-        return sorted([str(f) for f in self.pages_directory.rglob(pattern)])
+        # Walk subdirectories with os.scandir instead of rglob to avoid per-entry Path objects
+        return sorted(_scandir_walk(str(self.pages_directory), pattern))
     
     def extract_space_name_from_index(self, file_path: str) -> str:
         """
@@ -133,8 +205,37 @@ class Pages:
             The space name or 'Information Systems' as fallback
         """
         try:
-            with open(file_path, 'r', encoding='utf-8') as f:
-                content = f.read()
+            with open(file_path, 'rb') as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return 'Information Systems'
+                
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                    marker = mm.find(b'Name |')
+                    if marker < 0 and mm.find(b'Name') < 0:
+                        # Neither pattern below can match without the word "Name"
+                        return 'Information Systems'
+                    
+                    if marker >= 0:
+                        # Fast path: the first "Name |" is normally the metadata table row,
+                        # so decode only that line rather than the whole file
+                        line_start = mm.rfind(b'\n', 0, marker) + 1
+                        line_end = mm.find(b'\n', marker)
+                        raw_line = mm[line_start:line_end if line_end >= 0 else len(mm)]
+                        if raw_line.endswith(b'\r'):
+                            raw_line = raw_line[:-1]
+                        
+                        # Lines containing other carriage returns need newline translation below
+                        if b'\r' not in raw_line:
+                            line = raw_line.decode('utf-8')
+                            if line.strip().startswith('Name |'):
+                                space_name = line.split('|')[1].strip()
+                                if space_name:
+                                    return space_name
+                    
+                    content = mm[:].decode('utf-8')
+            
+            # Translate newlines the same way as reading in text mode
+            content = content.replace('\r\n', '\n').replace('\r', '\n')
             
             # Look for "Name | <SPACE NAME>" pattern in markdown table
             lines = content.split('\n')
@@ -149,23 +250,16 @@ class Pages:
             
             # Alternative: Look for processed content pattern like "Key | GI ---|--- Name | General Information"
             # This happens when HTML cleaner processes the table
-            content_clean = content.replace('\n', ' ').replace('  ', ' ')
-            if 'Name |' in content_clean:
-                # Find the pattern after "Name |"
-                name_index = content_clean.find('Name |')
-                if name_index >= 0:
-                    after_name = content_clean[name_index + 6:].strip()  # Skip "Name |"
-                    # Extract until next section or end
-                    words = after_name.split()
-                    if words:
-                        # Take words until we hit "Description" or "##" or similar
-                        space_words = []
-                        for word in words:
-                            if word in ['Description', '##', 'Available', 'Pages:']:
-                                break
-                            space_words.append(word)
-                        if space_words:
-                            return ' '.join(space_words)
+            # Joining lines and collapsing double spaces turns "Name" + 1-2 spaces/newlines + "|"
+            # into "Name |", so search the original content for that instead of copying it
+            name_match = ConfluencePatterns.SPACE_NAME_FIELD_PATTERN.search(content)
+            if name_match:
+                # Take the words up to the next section marker ("Description", "##", ...) or the end
+                after_name = content[name_match.end():]
+                end_match = ConfluencePatterns.SPACE_NAME_END_PATTERN.search(after_name)
+                space_name = ' '.join(after_name[:end_match.start() if end_match else len(after_name)].split())
+                if space_name:
+                    return space_name
             
             # Fallback: return default
             return 'Information Systems'
@@ -188,9 +282,13 @@ class Pages:
         """
         lines = markdown_content.strip().split('\n')
         
+        # Bind the patterns to locals once; they are used for every line
+        clean_header_pattern = ConfluencePatterns.CLEAN_HEADER_PATTERN
+        title_span_pattern = ConfluencePatterns.TITLE_SPAN_PATTERN
+        
         for line in lines:
             # First check for clean markdown headers (from cleaned HTML)
-            clean_header_match = ConfluencePatterns.CLEAN_HEADER_PATTERN.match(line.strip())
+            clean_header_match = clean_header_pattern.match(line.strip())
             if clean_header_match:
                 title = clean_header_match.group(1).strip()
                 # Remove space prefix if present (e.g., "General Information : SMS Opt Policy" -> "SMS Opt Policy")
@@ -199,7 +297,7 @@ class Pages:
                 return title
             
             # Then check for the original HTML title pattern
-            match = ConfluencePatterns.TITLE_SPAN_PATTERN.search(line)
+            match = title_span_pattern.search(line)
             
             if match:
                 title = match.group(1).strip()
@@ -220,97 +318,62 @@ class Pages:
         Returns:
             Cleaned markdown content ready for API upload
         """
-        # First, handle inline breadcrumbs (multiple breadcrumbs on one line)
-        # Pattern: 1\. [Link](url) 2\. [Link](url) 3\. [Link](url) # Title # Content
-        inline_breadcrumb_pattern = r'^(\d+\\?\.\s*\[.*?\]\([^)]+\)\s*)+'
-        
-        lines = markdown_content.split('\n')
-        processed_lines = []
+        # Bind the patterns to locals once; they are used for every line
+        inline_breadcrumb_pattern = ConfluencePatterns.INLINE_BREADCRUMB_PATTERN
+        breadcrumb_line_pattern = ConfluencePatterns.BREADCRUMB_LINE_PATTERN
+        space_prefixed_header_pattern = ConfluencePatterns.SPACE_PREFIXED_HEADER_PATTERN
         
-        for line in lines:
-            # Check if line starts with inline breadcrumbs
-            match = re.match(inline_breadcrumb_pattern, line)
-            if match:
-                # Remove the breadcrumb part and keep the rest
-                breadcrumb_end = match.end()
-                remaining = line[breadcrumb_end:].strip()
-                if remaining:
-                    processed_lines.append(remaining)
-                # Skip empty lines that were just breadcrumbs
-            else:
-                processed_lines.append(line)
-        
-        # Now do regular line-by-line cleaning
         cleaned_lines = []
+        seen_headers = set()  # Text of every header kept so far (up to any further '#')
         skip_breadcrumbs = True
-        header_seen = False
         
-        for line in processed_lines:
-            # Skip numbered breadcrumb lines at the start (handle both normal and escaped dots)
-            breadcrumb_pattern = r'^\d+\\?\.\s*\['
-            if skip_breadcrumbs and re.match(breadcrumb_pattern, line.strip()):
-                continue
+        for line in markdown_content.split('\n'):
+            # Handle inline breadcrumbs (multiple breadcrumbs on one line) by keeping only the rest
+            # Pattern: 1\. [Link](url) 2\. [Link](url) 3\. [Link](url) # Title # Content
+            # The pattern is anchored on a digit, so only run it on lines that start with one
+            if line[:1].isdigit():
+                match = inline_breadcrumb_pattern.match(line)
+                if match:
+                    line = line[match.end():].strip()
+                    if not line:
+                        # Skip lines that were just breadcrumbs
+                        continue
             
-            # Skip empty lines at the start until we hit content
-            if skip_breadcrumbs and not line.strip():
-                continue
-                
-            # If we hit a non-breadcrumb line, stop skipping
-            if skip_breadcrumbs and line.strip() and not re.match(breadcrumb_pattern, line.strip()):
+            stripped = line.strip()
+            
+            if skip_breadcrumbs:
+                # Skip numbered breadcrumb lines (normal and escaped dots) and empty lines at the start;
+                # the regex only runs on lines that start with a digit
+                if not stripped or (stripped[0].isdigit() and breadcrumb_line_pattern.match(stripped)):
+                    continue
                 skip_breadcrumbs = False
             
-            # Add the line if we're not skipping breadcrumbs
-            if not skip_breadcrumbs:
-                # Handle lines that start with duplicate headers but have more content
-                if line.strip().startswith('#') and header_seen:
-                    # Check if this line starts with the same header as already seen
-                    existing_headers = [l.strip() for l in cleaned_lines if l.strip().startswith('#')]
-                    line_header_part = line.strip().split('#')[1].strip() if '#' in line.strip() else ''
-                    
-                    # If this header already exists, extract only the new content after it
-                    duplicate_found = False
-                    for existing_header in existing_headers:
-                        existing_header_part = existing_header.split('#')[1].strip() if '#' in existing_header else ''
-                        if line_header_part == existing_header_part:
-                            # Found duplicate header, extract content after the duplicate
-                            parts = line.strip().split('#')
-                            if len(parts) > 2:  # Has content after the duplicate header
-                                remaining_content = '#'.join(parts[2:]).strip()
-                                if remaining_content:
-                                    cleaned_lines.append('# ' + remaining_content)
-                            duplicate_found = True
-                            break
-                    
-                    if not duplicate_found:
-                        cleaned_lines.append(line)
-                        header_seen = True
-                else:
-                    if line.strip().startswith('#'):
-                        header_seen = True
-                    cleaned_lines.append(line)
-        
-        # Join lines and clean up excessive whitespace
-        cleaned_content = '\n'.join(cleaned_lines)
-        
-        # Clean titles in content to remove space prefixes
-        # Pattern: # Space Name : Title -> # Title
-        title_pattern = r'^(#+)\s*[^:]+\s*:\s*(.+)$'
-        lines = cleaned_content.split('\n')
-        final_lines = []
-        
-        for line in lines:
-            if line.strip().startswith('#'):
-                match = re.match(title_pattern, line.strip())
+            if stripped.startswith('#'):
+                parts = stripped.split('#', 2)
+                header_text = parts[1].strip()
+                
+                if header_text in seen_headers:
+                    # Duplicate header: keep only the content after it, if any
+                    remaining = parts[2].strip() if len(parts) > 2 else ''
+                    if not remaining:
+                        continue
+                    stripped = line = '# ' + remaining
+                    header_text = remaining.split('#', 1)[0].strip()
+                
+                seen_headers.add(header_text)
+                
+                # Clean titles to remove space prefixes
+                # Pattern: # Space Name : Title -> # Title
+                match = space_prefixed_header_pattern.match(stripped)
                 if match:
                     header_level = match.group(1)  # # or ## or ###
                     title_part = match.group(2).strip()
                     line = f"{header_level} {title_part}"
-            final_lines.append(line)
-        
-        cleaned_content = '\n'.join(final_lines)
+            
+            cleaned_lines.append(line)
         
-        # Remove multiple consecutive empty lines
-        cleaned_content = re.sub(r'\n{3,}', '\n\n', cleaned_content)
+        # Join lines and remove multiple consecutive empty lines
+        cleaned_content = ConfluencePatterns.EXCESSIVE_NEWLINES_PATTERN.sub('\n\n', '\n'.join(cleaned_lines))
         
         # Strip leading/trailing whitespace
         return cleaned_content.strip()
@@ -328,49 +391,45 @@ class Pages:
         """
         attachments = []
         
-        # Look for attachment references in markdown (images, links to attachments)
-        attachment_patterns = [
-            r'!\s*\[([^\]]*)\]\(([^)]+)\)',  # ![alt](path)
-            r'\[([^\]]+)\]\(([^)]+\.(png|jpg|jpeg|gif|pdf|docx?|xlsx?|pptx?|txt|zip|rar))\)',  # [text](file.ext)
-            r'src=["\']([^"\']+)["\']',  # src="path"
-        ]
-        
+        # Look for attachment references in markdown (images, links to attachments, src attributes)
+        # in a single pass; the named group that matched holds the referenced path
         found_refs = set()
-        for pattern in attachment_patterns:
-            matches = re.finditer(pattern, markdown_content, re.IGNORECASE)
-            for match in matches:
-                # Extract the path (second group for most patterns)
-                if len(match.groups()) >= 2:
-                    path = match.group(2)
-                else:
-                    path = match.group(1)
-                
-                if path and ('attachments/' in path or path.startswith('attachments')):
-                    found_refs.add(path)
+        for match in ConfluencePatterns.ATTACHMENT_REFERENCE_PATTERN.finditer(markdown_content):
+            path = match[match.lastgroup]
+            if 'attachments/' in path or path.startswith('attachments'):
+                found_refs.add(path)
         
         # Check filesystem for attachments directory matching page ID
-        attachment_dir = self.attachments_base_path / page_id
-        if attachment_dir.exists():
-            for file_path in attachment_dir.iterdir():
-                if file_path.is_file():
+        attachment_dir = os.path.join(self.attachments_base_path, page_id)
+        try:
+            entries = os.scandir(attachment_dir)
+        except FileNotFoundError:
+            return attachments
+        
+        # Relative directory from the attachments base's parent, shared by all entries
+        relative_dir = os.path.join(self.attachments_base_path.name, page_id)
+        
+        # All references in one string so "is this file referenced" is a single substring
+        # search; file names cannot contain NUL, so no match can span two references
+        found_refs_text = '\0'.join(found_refs)
+        
+        with entries:
+            for entry in entries:
+                if entry.is_file():
                     try:
-                        # Get file info
-                        file_size = file_path.stat().st_size
-                        mime_type, _ = mimetypes.guess_type(str(file_path))
-                        
-                        # Create relative path from attachments base
-                        relative_path = file_path.relative_to(self.attachments_base_path.parent)
+                        # Get file info (scandir caches the stat result on the entry)
+                        file_size = entry.stat().st_size
                         
                         attachments.append({
-                            'filename': file_path.name,
-                            'local_path': str(file_path),
-                            'relative_path': str(relative_path),
-                            'mime_type': mime_type or 'application/octet-stream',
+                            'filename': entry.name,
+                            'local_path': entry.path,
+                            'relative_path': os.path.join(relative_dir, entry.name),
+                            'mime_type': guess_mime_type(entry.name),
                             'size_bytes': file_size,
-                            'referenced_in_content': any(file_path.name in ref for ref in found_refs)
+                            'referenced_in_content': entry.name in found_refs_text
                         })
                     except Exception as e:
-                        print(f"Warning: Could not process attachment {file_path}: {e}")
+                        print(f"Warning: Could not process attachment {entry.path}: {e}")
         
         return attachments
     
@@ -388,7 +447,7 @@ class Pages:
         clean_name = filename.replace('clean_', '')
         
         # Look for pattern: Title_PAGEID.html
-        match = re.search(r'_(\d+)\.(html?|md)$', clean_name)
+        match = ConfluencePatterns.PAGE_ID_PATTERN.search(clean_name)
         if match:
             return match.group(1)
         
@@ -437,32 +496,28 @@ class Pages:
                 pages_by_path[()].append(page)
         
         # Build tree structure with navigation nodes and folder nodes
-        root_children = defaultdict(set)
-        all_paths = set()
+        # Maps parent path tuple (None for the root) -> child names; names may repeat
+        # and are only deduplicated when the node is built
+        root_children = {}
         
-        # Collect navigation paths (folder structure)
-        for page in pages_data:
-            path = page.get('path', [])
-            if path:
-                # Add each navigation level
-                for i in range(len(path)):
-                    segment_path = tuple(path[:i+1])
-                    all_paths.add(segment_path)
-                    
-                    # Track parent-child relationships for navigation
-                    if i == 0:
-                        root_children[None].add(path[0])
-                    else:
-                        parent = tuple(path[:i])
-                        child = path[i]
-                        root_children[parent].add(child)
+        # Collect navigation paths (folder structure) once per distinct page path
+        for path_key in pages_by_path:
+            parent = None
+            for i, child in enumerate(path_key):
+                # Track parent-child relationships for navigation
+                root_children.setdefault(parent, []).append(child)
+                parent = path_key[:i + 1]
+        
+        navigation_node_count = 0
         
         def build_tree_node(path_tuple: Optional[tuple]) -> List[Dict]:
             """Recursively build tree nodes with embedded page data."""
+            nonlocal navigation_node_count
             children = []
             
             # First add navigation folder children
-            for child_name in sorted(root_children.get(path_tuple, [])):
+            for child_name in sorted(set(root_children.get(path_tuple, ()))):
+                navigation_node_count += 1
                 child_path = path_tuple + (child_name,) if path_tuple else (child_name,)
                 
                 node = {
@@ -526,62 +581,118 @@ class Pages:
             'root': space_name,
             'navigation': root_structure,
             'root_pages': root_pages,
-            'total_navigation_nodes': len(all_paths),
+            'total_navigation_nodes': navigation_node_count,
             'total_pages': len(pages_data),
             'total_attachments': sum(page['attachment_count'] for page in pages_data)
         }
     
-    def process_all_pages(self, pattern: str = "*.md") -> Dict:
+    def process_page_file(self, file_path: str, load_content: bool = True) -> Dict:
+        """
+        Read one markdown file and extract everything needed for API integration.
+        
+        Args:
+            file_path: Path to the markdown file
+            load_content: Include the cleaned content; when False a _DeferredContent
+                placeholder is stored instead and resolved by load_deferred_content
+            
+        Returns:
+            Page dictionary with title, path, page ID, attachments and cleaned content
+        """
+        content = _read_text(file_path)
+        
+        # Get location data (skip items 1 and 2, keep 3+)
+        location_data = self.parse_location_data(content)
+        path = [item['title'] for item in location_data[2:]] if len(location_data) > 2 else []
+        
+        # Extract title
+        page_title = self.extract_title_from_content(content)
+        
+        # Get filename and page ID
+        filename = pathlib.Path(file_path).name
+        page_id = self.extract_page_id_from_filename(filename)
+        
+        # Extract attachments for this page
+        attachments = self.extract_attachments_from_content(content, page_id) if page_id else []
+        
+        # Clean content for API by removing breadcrumbs
+        cleaned_content = self.clean_content_for_api(content) if load_content else _DeferredContent(file_path)
+        
+        return {
+            'filename': filename,
+            'title': page_title,
+            'path': path,
+            'page_id': page_id,
+            'attachments': attachments,
+            'attachment_count': len(attachments),
+            'file_path': str(file_path),
+            'content': cleaned_content
+        }
+    
+    def process_all_pages(self, pattern: str = "*.md", max_workers: Optional[int] = None,
+                          load_content: bool = True) -> Dict:
         """
         Process all files and build enhanced structure for API integration.
         
+        Files are independent, so they are processed in a pool of worker
+        processes; results are collected in file order.
+        
         Args:
             pattern: File pattern to match (default: *.md)
+            max_workers: Worker processes to use (default: CPU count, 1 = no pool)
+            load_content: Keep cleaned page content in memory (see process_page_file)
         
         Returns:
             Dictionary with processed page data, attachments, and navigation hierarchy
         """
         all_files = self.get_all_markdown_files(pattern)
         processed_pages = []
-        all_paths = []
         
+        # With a cache file, files whose key is unchanged reuse their cached metadata
+        cache = self._load_page_cache()
+        updated_cache = {}
+        cache_keys = {}
+        files_to_process = []
         for file_path in all_files:
-            try:
-                with open(file_path, 'r', encoding='utf-8') as f:
-                    content = f.read()
-                
-                # Get location data (skip items 1 and 2, keep 3+)
-                location_data = self.parse_location_data(content)
-                path = [item['title'] for item in location_data[2:]] if len(location_data) > 2 else []
-                all_paths.append(path)
-                
-                # Extract title
-                page_title = self.extract_title_from_content(content)
-                
-                # Get filename and page ID
-                filename = pathlib.Path(file_path).name
-                page_id = self.extract_page_id_from_filename(filename)
-                
-                # Extract attachments for this page
-                attachments = self.extract_attachments_from_content(content, page_id) if page_id else []
-                
-                # Clean content for API by removing breadcrumbs
-                cleaned_content = self.clean_content_for_api(content)
-                
-                processed_pages.append({
-                    'filename': filename,
-                    'title': page_title,
-                    'path': path,
-                    'page_id': page_id,
-                    'attachments': attachments,
-                    'attachment_count': len(attachments),
-                    'file_path': str(file_path),
-                    'content': cleaned_content
-                })
+            if self.cache_file:
+                cache_keys[file_path] = key = self._page_cache_key(file_path)
+                entry = cache.get(file_path)
+                if key is not None and entry is not None and entry['key'] == key:
+                    updated_cache[file_path] = entry
+                    continue
+            files_to_process.append(file_path)
+        
+        workers = max_workers or os.cpu_count() or 1
+        executor = None
+        if workers > 1 and len(files_to_process) > 1:
+            executor = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker_pages,
+                initargs=(str(self.pages_directory), str(self.attachments_base_path), get_worker_log_config())
+            )
+            chunksize = max(1, min(32, len(files_to_process) // (workers * 4)))
+            results = executor.map(_process_page_in_worker, files_to_process, repeat(load_content), chunksize=chunksize)
+        else:
+            results = (_process_page_safely(self, file_path, load_content) for file_path in files_to_process)
+        
+        try:
+            for file_path in all_files:
+                if file_path in updated_cache:
+                    page, error = _load_cached_page(self, updated_cache[file_path]['record'], load_content)
+                else:
+                    page, error = next(results)
+                    if error is None and cache_keys.get(file_path) is not None:
+                        record = {field: value for field, value in page.items() if field != 'content'}
+                        updated_cache[file_path] = {'key': cache_keys[file_path], 'record': record}
                 
-            except Exception as e:
-                print(f"Error processing {file_path}: {e}")
-                continue
+                if error is not None:
+                    print(f"Error processing {file_path}: {error}")
+                    continue
+                processed_pages.append(page)
+        finally:
+            if executor is not None:
+                executor.shutdown(cancel_futures=True)
+        
+        self._save_page_cache(updated_cache)
         
         # Detect space name from index.html if it exists
         space_name = "Information Systems"  # default
@@ -594,10 +705,110 @@ class Pages:
         
         return integrated_structure
     
+    def _page_cache_key(self, file_path: str) -> Optional[List]:
+        """
+        Build the cache key of a page file.
+        
+        The key changes when the file or any of its attachments changes: entries
+        added, removed or renamed, and files overwritten in place, which leave
+        the directory's own mtime untouched but change the recorded size_bytes.
+        
+        Args:
+            file_path: Path to the page file
+            
+        Returns:
+            [mtime_ns, size, sorted [name, size, mtime_ns] of each attachment or None],
+            or None if the file cannot be stat'ed
+        """
+        try:
+            stat_result = os.stat(file_path)
+        except OSError:
+            return None
+        
+        attachments = None
+        page_id = self.extract_page_id_from_filename(os.path.basename(file_path))
+        if page_id:
+            try:
+                with os.scandir(os.path.join(self.attachments_base_path, page_id)) as entries:
+                    attachments = sorted(
+                        [entry.name, entry.stat().st_size, entry.stat().st_mtime_ns]
+                        for entry in entries if entry.is_file()
+                    )
+            except OSError:
+                pass
+        
+        return [stat_result.st_mtime_ns, stat_result.st_size, attachments]
+    
+    def _load_page_cache(self) -> Dict[str, Dict]:
+        """
+        Load cached page records for this pages/attachments location.
+        
+        Returns:
+            Mapping of file path -> {'key': ..., 'record': ...}; empty if there is no usable cache
+        """
+        if not self.cache_file or not os.path.exists(self.cache_file):
+            return {}
+        
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                cache = json.load(f)
+        except (OSError, ValueError) as e:
+            self.logger.warning("Ignoring unreadable page cache %s: %s", self.cache_file, e)
+            return {}
+        
+        if (cache.get('version') != self.CACHE_VERSION
+                or cache.get('attachments_base_path') != str(self.attachments_base_path)):
+            return {}
+        return cache.get('files', {})
+    
+    def _save_page_cache(self, files: Dict[str, Dict]) -> None:
+        """
+        Write the page cache, replacing entries of files that no longer exist.
+        
+        Args:
+            files: Mapping of file path -> {'key': ..., 'record': ...}
+        """
+        if not self.cache_file:
+            return
+        
+        cache = {
+            'version': self.CACHE_VERSION,
+            'attachments_base_path': str(self.attachments_base_path),
+            'files': files
+        }
+        try:
+            with open(self.cache_file, 'w', encoding='utf-8') as f:
+                json.dump(cache, f, ensure_ascii=False)
+        except OSError as e:
+            self.logger.warning("Could not write page cache %s: %s", self.cache_file, e)
+    
+    def load_deferred_content(self, content: "_DeferredContent") -> str:
+        """
+        Read and clean the content of a page processed with load_content=False.
+        
+        Used as the JSON encoder's default hook, so each page's content only
+        exists in memory while it is being written.
+        
+        Args:
+            content: Placeholder stored in the page data
+            
+        Returns:
+            Cleaned markdown content ready for API upload
+        """
+        if not isinstance(content, _DeferredContent):
+            raise TypeError(f"Object of type {type(content).__name__} is not JSON serializable")
+        
+        return self.clean_content_for_api(_read_text(content.file_path))
+    
     def write_processed_data(self, output_file: str = "processed_pages.json", pattern: str = "*.md") -> bool:
         """
         Process all pages and write the results to a JSON file.
         
+        Page content is not kept for the whole run: the structure is built from
+        page metadata and each page's content is re-read and cleaned while the
+        JSON is encoded. With orjson installed the document is encoded in one
+        call and written at once; otherwise it is streamed with the json module.
+        
         Args:
             output_file: Path to the output JSON file
             pattern: File pattern to match (default: *.md)
@@ -606,16 +817,59 @@ class Pages:
             True if successful, False otherwise
         """
         try:
-            import json
+            processed_data = self.process_all_pages(pattern, load_content=False)
             
-            processed_data = self.process_all_pages(pattern)
-            
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(processed_data, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                data = orjson.dumps(processed_data, default=self.load_deferred_content, option=orjson.OPT_INDENT_2)
+                with open(output_file, 'wb') as f:
+                    f.write(data)
+            else:
+                encoder = json.JSONEncoder(indent=2, ensure_ascii=False, default=self.load_deferred_content)
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    for chunk in encoder.iterencode(processed_data):
+                        f.write(chunk)
             
             print(f"Successfully wrote {processed_data['total_pages']} pages to {output_file}")
             return True
             
         except Exception as e:
             print(f"Error writing processed data: {e}")
-            return False
\ No newline at end of file
+            return False
+
+
+# Pages instance of the current worker process, set by _init_worker_pages
+_worker_pages: Optional[Pages] = None
+
+
+def _init_worker_pages(pages_directory: str, attachments_base_path: str,
+                       log_config: Optional[Tuple[Any, int]]) -> None:
+    """Create the per-process Pages instance used by _process_page_in_worker."""
+    global _worker_pages
+    setup_worker_logging(log_config)
+    _worker_pages = Pages(pages_directory, attachments_base_path)
+
+
+def _process_page_safely(pages: Pages, file_path: str,
+                         load_content: bool = True) -> Tuple[Optional[Dict], Optional[str]]:
+    """Process one file, returning (page, None) or (None, error message)."""
+    try:
+        return pages.process_page_file(file_path, load_content), None
+    except Exception as e:
+        return None, str(e)
+
+
+def _load_cached_page(pages: Pages, record: Dict, load_content: bool) -> Tuple[Optional[Dict], Optional[str]]:
+    """Rebuild a page from its cached record, returning (page, None) or (None, error message)."""
+    page = dict(record)
+    page['content'] = _DeferredContent(record['file_path'])
+    if load_content:
+        try:
+            page['content'] = pages.load_deferred_content(page['content'])
+        except Exception as e:
+            return None, str(e)
+    return page, None
+
+
+def _process_page_in_worker(file_path: str, load_content: bool) -> Tuple[Optional[Dict], Optional[str]]:
+    """Process one file with this worker process's Pages instance."""
+    return _process_page_safely(_worker_pages, file_path, load_content)
@@ -5,7 +5,7 @@ This module centralizes all regex patterns with clear documentation
 for better maintainability and understanding.
 """
 import re
-from typing import Pattern
+from typing import Pattern, Tuple
 
 
 class ConfluencePatterns:
@@ -21,6 +21,12 @@ class ConfluencePatterns:
     MULTILINE_END_PATTERN: Pattern[str] = re.compile(r'^([^\]]*)\]\(([^)]+)\)$')
     """Matches end of multi-line numbered list items like: continued title](link.html)"""
     
+    INLINE_BREADCRUMB_PATTERN: Pattern[str] = re.compile(r'^(\d+\\?\.\s*\[.*?\]\([^)]+\)\s*)+')
+    """Matches one or more breadcrumbs at the start of a line like: 1\\. [Link](url) 2\\. [Link](url)"""
+    
+    BREADCRUMB_LINE_PATTERN: Pattern[str] = re.compile(r'^\d+\\?\.\s*\[')
+    """Matches the start of a breadcrumb line with a normal or escaped dot like: 1. [ or 1\\. ["""
+    
     BREADCRUMB_SECTION_PATTERN: Pattern[str] = re.compile(
         r'^((?:\d+\.\s+\[.*?\](?:\([^)]+\)|\n\s+[^)]*\([^)]+\))\s*\n?)+)',
         re.MULTILINE | re.DOTALL
@@ -52,9 +58,30 @@ class ConfluencePatterns:
     CLEAN_HEADER_PATTERN: Pattern[str] = re.compile(r'^#\s+(.+)$')
     """Matches clean markdown headers from processed HTML"""
     
+    SPACE_PREFIXED_HEADER_PATTERN: Pattern[str] = re.compile(r'^(#+)\s*[^:]+\s*:\s*(.+)$')
+    """Matches headers with a space prefix like: # Space Name : Title"""
+    
     EXCESSIVE_NEWLINES_PATTERN: Pattern[str] = re.compile(r'\n{3,}')
     """Matches 3 or more consecutive newlines"""
     
+    BREADCRUMB_LINK_LINE_PATTERN: Pattern[str] = re.compile(r'^\d+\.\s*\[.*?\]\(.*?\)\s*$')
+    """Matches a whole (stripped) line holding one numbered breadcrumb like: 1. [Home](index.html)"""
+    
+    EMPTY_NUMBERED_ITEM_PATTERN: Pattern[str] = re.compile(r'^\d+\.\s*$')
+    """Matches a (stripped) numbered list item without text like: 2."""
+    
+    EMPTY_LIST_ITEM_PATTERN: Pattern[str] = re.compile(r'^\s*[\*\-\+]\s*$', re.MULTILINE)
+    """Matches bullet list items without text like: *"""
+    
+    EMPTY_TABLE_CELL_PATTERN: Pattern[str] = re.compile(r'\|\s*\|')
+    """Matches empty table cells like: | |"""
+    
+    CREATED_MODIFIED_LINE_PATTERN: Pattern[str] = re.compile(r'^Created by.*?modified.*?on.*?$', re.MULTILINE)
+    """Matches standalone "Created by ... modified ... on ..." lines"""
+    
+    CONFLUENCE_FOOTER_LINE_PATTERN: Pattern[str] = re.compile(r'^Document generated by Confluence.*?$', re.MULTILINE)
+    """Matches the Confluence footer line in converted markdown"""
+    
     EMPTY_LINKS_PATTERN: Pattern[str] = re.compile(r'\[\s*\]\([^)]*\)')
     """Matches empty links like: [](url)"""
     
@@ -85,23 +112,31 @@ class ConfluencePatterns:
     HEADER_SPACING_PATTERN: Pattern[str] = re.compile(r'\n(#{1,6}\s)')
     """Matches headers for proper spacing adjustment"""
     
-    # Attachment patterns
-    IMAGE_ATTACHMENT_PATTERN: Pattern[str] = re.compile(r'!\s*\[([^\]]*)\]\(([^)]+)\)')
-    """Matches image attachments like: ![alt](path)"""
+    TRAILING_WHITESPACE_PATTERN: Pattern[str] = re.compile(r'[^\S\n]+$', re.MULTILINE)
+    """Matches whitespace at the end of each line (same characters as str.rstrip)"""
     
-    FILE_ATTACHMENT_PATTERN: Pattern[str] = re.compile(
-        r'\[([^\]]+)\]\(([^)]+\.(png|jpg|jpeg|gif|pdf|docx?|xlsx?|pptx?|txt|zip|rar))\)',
+    SPACE_NAME_FIELD_PATTERN: Pattern[str] = re.compile(r'Name[ \n]{1,2}\|')
+    """Matches the space "Name |" field, also when split across lines or padded by one extra space"""
+    
+    SPACE_NAME_END_PATTERN: Pattern[str] = re.compile(r'(?<!\S)(?:Description|##|Available|Pages:)(?!\S)')
+    """Matches the whitespace-delimited word that ends the space name, like: Description or ##"""
+    
+    # Attachment patterns
+    ATTACHMENT_REFERENCE_PATTERN: Pattern[str] = re.compile(
+        r'!\s*\[[^\]]*\]\((?P<image>[^)]+)\)'
+        r'|\[[^\]]+\]\((?P<link>[^)]+\.(?:png|jpg|jpeg|gif|pdf|docx?|xlsx?|pptx?|txt|zip|rar))\)'
+        r'|src=["\'](?P<src>[^"\']+)["\']',
         re.IGNORECASE
     )
-    """Matches file attachments with common extensions"""
-    
-    SRC_ATTRIBUTE_PATTERN: Pattern[str] = re.compile(r'src=["\']([^"\']+)["\']')
-    """Matches src attributes in HTML tags"""
+    """Matches attachment references like: ![alt](path), [text](file.ext) or src="path" (path in the named group)"""
     
     # Page ID extraction patterns
     PAGE_ID_PATTERN: Pattern[str] = re.compile(r'_(\d+)\.(html?|md)$')
     """Matches page IDs in filenames like: Title_2481520646.html"""
     
+    LONG_PAGE_ID_PATTERN: Pattern[str] = re.compile(r'(\d{8,})')
+    """Matches the first run of 8+ digits in a filename like: Title_2481520646.html"""
+    
     # File naming patterns
     FILENAME_CLEANUP_PATTERN: Pattern[str] = re.compile(r'[^a-zA-Z0-9\-_]')
     """Matches characters to remove for safe filenames"""
@@ -126,6 +161,35 @@ class HTMLCleaningPatterns:
         re.IGNORECASE
     )
     """Matches Atlassian domain links to remove"""
+    
+    CONFLUENCE_FOOTER_TEXT_PATTERN: Pattern[str] = re.compile(
+        r'Document generated by Confluence',
+        re.IGNORECASE
+    )
+    """Matches the Confluence footer text node in parsed HTML"""
+    
+    # Page chrome removed before converting Confluence pages to markdown
+    BREADCRUMB_ELEMENT_PATTERN: Pattern[str] = re.compile(r'breadcrumb|navigation')
+    """Matches breadcrumb/navigation ids and classes like: breadcrumb-section"""
+    
+    TITLE_ID_PATTERN: Pattern[str] = re.compile(r'title|pagetitle')
+    """Matches page title element ids like: title-heading"""
+    
+    TITLE_CLASS_PATTERN: Pattern[str] = re.compile(r'pagetitle|title-heading')
+    """Matches page title element classes like: pagetitle"""
+    
+    METADATA_CLASS_PATTERN: Pattern[str] = re.compile(r'page-metadata|metadata')
+    """Matches page metadata classes (created by, modified by) like: page-metadata"""
+    
+    NAV_CLASS_PATTERN: Pattern[str] = re.compile(r'nav|menu|sidebar')
+    """Matches navigation, menu and sidebar classes inside the page content"""
+    
+    MARKDOWN_TITLE_PATTERNS: Tuple[Pattern[str], ...] = (
+        re.compile(r'#\s*<span[^>]*id="title-text"[^>]*>\s*([^<]+)\s*</span>', re.MULTILINE | re.IGNORECASE),
+        re.compile(r'#\s*<span[^>]*>\s*Information Systems\s*:\s*([^<]+)\s*</span>', re.MULTILINE | re.IGNORECASE),
+        re.compile(r'#\s+(.+?)(?:\s*{[^}]*})?$', re.MULTILINE | re.IGNORECASE),  # Fallback for markdown headers
+    )
+    """Title patterns for markdown input, tried in order"""
 
 
 def compile_patterns():
@@ -0,0 +1,73 @@
+"""
+Client-side rate limiting for API uploads.
+
+This module provides a thread-safe token bucket that all upload workers
+share, so bursts proceed at full speed and callers only block when the
+request budget is actually exhausted.
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket with AIMD feedback from rate-limit responses.
+
+    The refill rate is halved whenever the server answers 429 and creeps back
+    up towards the configured rate with every successful request.
+    """
+
+    def __init__(self, rate: float = 5.0, burst: int = 10, min_rate: float = 0.5,
+                 rate_increase: float = 0.1):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Sustained requests per second
+            burst: Maximum number of tokens that can accumulate
+            min_rate: Lower bound for the rate after repeated 429 responses
+            rate_increase: Requests per second added back after each success
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+        self.min_rate = min_rate
+        self.rate_increase = rate_increase
+        self.tokens = float(burst)
+        self.last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """
+        Take one token, sleeping until one is available.
+
+        Returns:
+            Seconds spent waiting for the token
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last_refill) * self.rate)
+                self.last_refill = now
+
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return waited
+
+                delay = (1 - self.tokens) / self.rate
+
+            time.sleep(delay)
+            waited += delay
+
+    def on_rate_limited(self) -> None:
+        """Multiplicatively decrease the rate after a 429 response."""
+        with self._lock:
+            self.rate = max(self.min_rate, self.rate / 2)
+
+    def on_success(self) -> None:
+        """Additively increase the rate back towards its configured maximum."""
+        if self.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.rate = min(self.max_rate, self.rate + self.rate_increase)
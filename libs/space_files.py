@@ -0,0 +1,45 @@
+"""
+Reading and writing space JSON files.
+
+Space files (output/<space_key>.json) are produced by SpaceProcessor and
+updated by the upload manager. Both go through these helpers so the files
+are always written the same way; orjson is used when it is installed.
+"""
+import json
+import mmap
+import os
+from pathlib import Path
+from typing import Any, Dict
+
+try:
+    import orjson
+except ImportError:  # Optional speedup; the stdlib json module is used otherwise
+    orjson = None
+
+
+# Space files at least this large are memory-mapped rather than read into memory
+_MMAP_THRESHOLD = 10 * 1024 * 1024
+
+
+def read_space_file(space_file: Path) -> Dict[str, Any]:
+    """Load a space JSON file, using orjson when it is installed"""
+    if orjson is not None:
+        with open(space_file, 'rb') as f:
+            if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+                return orjson.loads(f.read())
+            # orjson parses straight from the page cache, so large files are
+            # never copied into a bytes object next to the decoded tree
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, memoryview(mm) as view:
+                return orjson.loads(view)
+    with open(space_file, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def write_space_file(space_file: Path, space_data: Dict[str, Any]) -> None:
+    """Write a space JSON file with 2-space indentation through a 64 KB buffer"""
+    if orjson is not None:
+        data = orjson.dumps(space_data, option=orjson.OPT_INDENT_2)
+    else:
+        data = json.dumps(space_data, indent=2, ensure_ascii=False).encode('utf-8')
+    with open(space_file, 'wb', buffering=64 * 1024) as f:
+        f.write(data)
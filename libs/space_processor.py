@@ -4,17 +4,71 @@ SpaceProcessor - Clean architecture for processing Confluence exports
 Replaces the existing Pages class with a streamlined approach focused on API upload
 """
 
-import json
+import mmap
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
 from pathlib import Path
-from typing import Dict, List, Optional, Any, Union
+from typing import TYPE_CHECKING, Dict, List, Optional, Any, Tuple, Union
 from bs4 import BeautifulSoup, Tag
 from bs4.element import NavigableString
-import html2text
+from lxml import etree
 import logging
 
 # Import our existing DOM hierarchy parser
 from .dom_hierarchy_parser import DomHierarchyParser
+from .logger import get_worker_log_config, setup_worker_logging
+from .space_files import read_space_file, write_space_file
+from .patterns import ConfluencePatterns, HTMLCleaningPatterns
+
+if TYPE_CHECKING:
+    # html2text is imported on first use; only markdown extraction needs it
+    import html2text
+
+
+# HTML pages at least this large are decoded straight from a memory map
+_MMAP_THRESHOLD = 1024 * 1024
+
+
+def _read_html(html_file: Path) -> str:
+    """
+    Read a UTF-8 HTML page, decoding large files from a memory map.
+    
+    Large pages are decoded from the page cache instead of being read into a
+    bytes copy first; newlines are translated afterwards so the result is the
+    same as reading in text mode.
+    
+    Args:
+        html_file: Path to the HTML file
+        
+    Returns:
+        The decoded page content
+    """
+    with open(html_file, 'rb') as f:
+        if os.fstat(f.fileno()).st_size < _MMAP_THRESHOLD:
+            content = f.read().decode('utf-8')
+        else:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                content = str(mm, 'utf-8')
+    if '\r' in content:
+        content = content.replace('\r\n', '\n').replace('\r', '\n')
+    return content
+
+
+def _first_remaining(tags: List[Tag]) -> Optional[Tag]:
+    """Return the first tag that has not been decomposed, in document order"""
+    return next((tag for tag in tags if not tag.decomposed), None)
+
+
+def _attribute_matches(tag: Tag, attribute: str, pattern: re.Pattern) -> bool:
+    """Search a tag attribute with a pattern; multi-valued attributes (class) are joined"""
+    value = tag.get(attribute)
+    if value is None:
+        return False
+    if isinstance(value, list):
+        value = ' '.join(value)
+    return pattern.search(value) is not None
 
 
 class SpaceProcessor:
@@ -35,12 +89,12 @@ class SpaceProcessor:
         # Ensure output directory exists
         self.output_dir.mkdir(exist_ok=True)
         
-        # Configure html2text for clean markdown conversion
-        self.html2text_converter = html2text.HTML2Text()
-        self.html2text_converter.ignore_links = False
-        self.html2text_converter.ignore_images = False
-        self.html2text_converter.body_width = 0  # No line wrapping
-        self.html2text_converter.unicode_snob = True
+        # Attachment files per page id for each space directory (None when the
+        # space has no attachments directory), see _scan_attachments
+        self._attachment_index: Dict[Path, Optional[Dict[str, List[str]]]] = {}
+        
+        # Timestamp shared by all spaces of a process_input_directories run
+        self._batch_timestamp: Optional[str] = None
         
         # Set up logging
         self.logger = logging.getLogger(__name__)
@@ -55,14 +109,32 @@ class SpaceProcessor:
         """
         processed_spaces = []
         
-        # Find all export directories
-        export_dirs = [d for d in self.input_dir.iterdir() if d.is_dir() and d.name.startswith('Export-')]
+        # Stamp every space of this run with the same processed_at time
+        self._batch_timestamp = datetime.now().isoformat()
+        try:
+            self._process_export_directories(processed_spaces)
+        finally:
+            self._batch_timestamp = None
+        
+        return processed_spaces
+    
+    def _process_export_directories(self, processed_spaces: List[str]) -> None:
+        """
+        Process the space directories of every export directory
+        
+        Args:
+            processed_spaces: List that the keys of processed spaces are appended to
+        """
+        # Find all export directories (scandir entries cache their file type, so no stat per entry)
+        with os.scandir(self.input_dir) as entries:
+            export_dirs = [Path(e.path) for e in entries if e.name.startswith('Export-') and e.is_dir()]
         
         for export_dir in export_dirs:
             self.logger.info(f"Processing export directory: {export_dir.name}")
             
             # Find space directories within the export
-            space_dirs = [d for d in export_dir.iterdir() if d.is_dir()]
+            with os.scandir(export_dir) as entries:
+                space_dirs = [Path(e.path) for e in entries if e.is_dir()]
             
             for space_dir in space_dirs:
                 try:
@@ -74,8 +146,6 @@ class SpaceProcessor:
                 except Exception as e:
                     self.logger.error(f"Error processing space {space_dir.name}: {e}")
                     continue
-        
-        return processed_spaces
     
     def process_space_directory(self, space_dir: Path, export_name: str) -> Optional[str]:
         """
@@ -104,6 +174,9 @@ class SpaceProcessor:
         space_name = metadata.get("space_name", space_dir.name)
         description = metadata.get("description", "")
         
+        # List the space's attachments once for all pages
+        self._attachment_index[space_dir] = self._scan_attachments(space_dir)
+        
         # Build the space content structure
         space_content = self.convert_navigation_to_space_content(
             structure["navigation"], 
@@ -127,8 +200,7 @@ class SpaceProcessor:
         
         # Save to output directory
         output_file = self.output_dir / f"{space_key}.json"
-        with open(output_file, 'w', encoding='utf-8') as f:
-            json.dump(space_json, f, indent=2, ensure_ascii=False)
+        write_space_file(output_file, space_json)
         
         self.logger.info(f"Created {output_file} with {len(space_content)} root items")
         return space_key
@@ -162,7 +234,10 @@ class SpaceProcessor:
         space_dir: Path
     ) -> Dict[str, Any]:
         """
-        Convert a single navigation item to space content format
+        Convert a single navigation item (and its children) to space content format
+        
+        The tree is walked with an explicit stack in document order, so deeply
+        nested spaces are not limited by the recursion depth.
         
         Args:
             nav_item: Single navigation item
@@ -171,34 +246,45 @@ class SpaceProcessor:
         Returns:
             Space content item
         """
-        # Determine type based on whether it has children
-        item_type = "collection" if nav_item.get("children") else "page"
-        
-        # Check if HTML file exists
-        html_file = space_dir / nav_item["href"]
-        html_exists = html_file.exists()
-        
-        # Extract attachments if any
-        attachments = self.find_attachments_for_page(nav_item["href"], space_dir)
-        
-        content_item = {
-            "title": nav_item["title"],
-            "html_page": nav_item["href"] if html_exists else None,
-            "md_content": "",  # Will be populated later
-            "parent_uuid": None,  # Will be set during API upload
-            "page_uuid": None,   # Will be set during API upload
-            "created": False,
-            "type": item_type,
-            "attachments": attachments,
-            "children": []
-        }
+        root_item = None
+        # (navigation item, children list of the converted parent or None for the root)
+        stack = [(nav_item, None)]
         
-        # Process children recursively
-        for child in nav_item.get("children", []):
-            child_item = self.convert_navigation_item(child, space_dir)
-            content_item["children"].append(child_item)
+        while stack:
+            current, parent_children = stack.pop()
+            
+            # Determine type based on whether it has children
+            item_type = "collection" if current.get("children") else "page"
+            
+            # Check if HTML file exists
+            html_file = space_dir / current["href"]
+            html_exists = html_file.exists()
+            
+            # Extract attachments if any
+            attachments = self.find_attachments_for_page(current["href"], space_dir)
+            
+            content_item = {
+                "title": current["title"],
+                "html_page": current["href"] if html_exists else None,
+                "md_content": "",  # Will be populated later
+                "parent_uuid": None,  # Will be set during API upload
+                "page_uuid": None,   # Will be set during API upload
+                "created": False,
+                "type": item_type,
+                "attachments": attachments,
+                "children": []
+            }
+            
+            if parent_children is None:
+                root_item = content_item
+            else:
+                parent_children.append(content_item)
+            
+            # Queue children in reverse so they are converted in order
+            children = current.get("children", [])
+            stack.extend((child, content_item["children"]) for child in reversed(children))
         
-        return content_item
+        return root_item
     
     def find_attachments_for_page(self, html_filename: str, space_dir: Path) -> List[str]:
         """
@@ -214,55 +300,82 @@ class SpaceProcessor:
         """
         attachments = []
         
-        # Check for attachments directory
-        attachments_dir = space_dir / "attachments"
-        if not attachments_dir.exists():
+        # Check for attachments directory (scanned once per space)
+        if space_dir not in self._attachment_index:
+            self._attachment_index[space_dir] = self._scan_attachments(space_dir)
+        attachment_index = self._attachment_index[space_dir]
+        if attachment_index is None:
             return attachments
         
         # Extract page ID from filename for matching
-        page_id_match = re.search(r'(\d{8,})', html_filename)
+        page_id_match = ConfluencePatterns.LONG_PAGE_ID_PATTERN.search(html_filename)
         if not page_id_match:
             return attachments
         
         page_id = page_id_match.group(1)
         
         # Method 1: Look for page-specific attachment directory
-        page_attachment_dir = attachments_dir / page_id
-        if page_attachment_dir.exists() and page_attachment_dir.is_dir():
-            for attachment_file in page_attachment_dir.glob("*"):
-                if attachment_file.is_file():
-                    relative_path = f"attachments/{page_id}/{attachment_file.name}"
-                    attachments.append(relative_path)
+        attachments.extend(attachment_index.get(page_id, ()))
         
         # Method 2: Parse HTML content for attachment references
         html_file = space_dir / html_filename
         if html_file.exists():
-            with open(html_file, 'r', encoding='utf-8') as f:
-                content = f.read()
+            content = _read_html(html_file)
             
-            soup = BeautifulSoup(content, 'html.parser')
+            # Only link targets are needed, so parse with lxml directly and read them
+            # with XPath; the full BeautifulSoup tree is built once, in html_to_markdown.
+            # lxml rejects str input carrying an XML encoding declaration, so hand it the UTF-8 bytes
+            root = etree.HTML(content.encode('utf-8'), parser=etree.HTMLParser(encoding='utf-8'))
+            hrefs = root.xpath('//a/@href') if root is not None else []
             
             # Find attachment links in the HTML
-            attachment_links = soup.find_all('a', href=re.compile(r'attachments/'))
-            for link in attachment_links:
-                # Type check to ensure we have a Tag element
-                if isinstance(link, Tag):
-                    href = link.get('href')
-                    # Type check to ensure href is a string
-                    if href and isinstance(href, str) and href.startswith('attachments/'):
-                        # Clean up the path
-                        attachment_path = href.replace('../', '').replace('./', '')
-                        if attachment_path not in attachments:
-                            attachments.append(attachment_path)
+            seen = set(attachments)  # Paths already listed, including the directory scan
+            for href in hrefs:
+                if href.startswith('attachments/'):
+                    # Clean up the path (str() drops lxml's result subclass)
+                    attachment_path = str(href).replace('../', '').replace('./', '')
+                    if attachment_path not in seen:
+                        seen.add(attachment_path)
+                        attachments.append(attachment_path)
         
         return attachments
     
-    def extract_markdown_content(self, space_key: str) -> bool:
+    def _scan_attachments(self, space_dir: Path) -> Optional[Dict[str, List[str]]]:
+        """
+        List the files in every attachments/<page_id> directory of a space
+        
+        Args:
+            space_dir: Path to space directory
+            
+        Returns:
+            Mapping of page ID to attachment paths, or None if the space has no attachments directory
+        """
+        attachments_dir = space_dir / "attachments"
+        if not attachments_dir.exists():
+            return None
+        
+        attachment_index = {}
+        try:
+            with os.scandir(attachments_dir) as page_dirs:
+                page_dirs = [entry for entry in page_dirs if entry.is_dir()]
+        except NotADirectoryError:
+            return attachment_index
+        
+        for page_dir in page_dirs:
+            with os.scandir(page_dir.path) as entries:
+                attachment_index[page_dir.name] = [
+                    f"attachments/{page_dir.name}/{entry.name}" for entry in entries if entry.is_file()
+                ]
+        
+        return attachment_index
+    
+    def extract_markdown_content(self, space_key: str, max_workers: Optional[int] = None) -> bool:
         """
         Extract markdown content for all pages in a space JSON file
         
         Args:
             space_key: Space key (e.g., 'is')
+            max_workers: Worker processes to use (default: CPU count, 1 = no pool)
             
         Returns:
             True if successful, False otherwise
@@ -273,43 +386,53 @@ class SpaceProcessor:
             return False
         
         # Load the space JSON
-        with open(space_file, 'r', encoding='utf-8') as f:
-            space_data = json.load(f)
+        space_data = read_space_file(space_file)
         
         # Get the local folder path
         local_folder = Path(self.base_path / space_data["local_folder"])
         
         # Process all content items
-        self._extract_content_recursive(space_data["space_content"], local_folder)
+        self._extract_content_items(space_data["space_content"], local_folder, max_workers)
         
         # Update processing stats
         space_data["processing_stats"]["content_extracted_at"] = self.get_current_timestamp()
         
         # Save the updated JSON
-        with open(space_file, 'w', encoding='utf-8') as f:
-            json.dump(space_data, f, indent=2, ensure_ascii=False)
+        write_space_file(space_file, space_data)
         
         self.logger.info(f"Extracted markdown content for space: {space_key}")
         return True
     
-    def _extract_content_recursive(
+    def _extract_content_items(
         self, 
         content_items: List[Dict[str, Any]], 
-        local_folder: Path
+        local_folder: Path,
+        max_workers: Optional[int] = None
     ) -> None:
         """
-        Recursively extract markdown content for all items
+        Extract markdown content for all items, including nested children
+        
+        Pages are converted after the tree walk, in a process pool when more
+        than one worker is available.
         
         Args:
             content_items: List of content items to process
             local_folder: Path to local folder containing HTML files
+            max_workers: Worker processes to use (default: CPU count, 1 = no pool)
         """
-        for item in content_items:
+        # Items whose HTML file exists, converted once the whole tree is walked
+        pages = []
+        
+        # Explicit stack in document order (children reversed onto the stack)
+        stack = list(reversed(content_items))
+        while stack:
+            item = stack.pop()
+            
             # Extract content for this item
             if item.get("html_page"):
                 html_file = local_folder / item["html_page"]
                 if html_file.exists():
-                    item["md_content"] = self.html_to_markdown(html_file)
+                    pages.append((item, html_file))
                 else:
                     self.logger.warning(f"HTML file not found: {html_file}")
                     item["md_content"] = f"# {item['title']}\n\nContent not found."
@@ -317,9 +440,25 @@ class SpaceProcessor:
                 # Create basic content for collections
                 item["md_content"] = f"# {item['title']}\n\nThis is a collection page."
             
-            # Process children recursively
+            # Process children before the item's later siblings
             if item.get("children"):
-                self._extract_content_recursive(item["children"], local_folder)
+                stack.extend(reversed(item["children"]))
+        
+        workers = max_workers or os.cpu_count() or 1
+        if workers > 1 and len(pages) > 1:
+            chunksize = max(1, min(32, len(pages) // (workers * 4)))
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_worker_processor,
+                initargs=(str(self.base_path), get_worker_log_config())
+            ) as executor:
+                html_files = [str(html_file) for _, html_file in pages]
+                markdowns = executor.map(_html_to_markdown_in_worker, html_files, chunksize=chunksize)
+                for (item, _), markdown in zip(pages, markdowns):
+                    item["md_content"] = markdown
+        else:
+            for item, html_file in pages:
+                item["md_content"] = self.html_to_markdown(html_file)
     
     def html_to_markdown(self, html_file: Path) -> str:
         """
@@ -331,63 +470,114 @@ class SpaceProcessor:
         Returns:
             Clean markdown content
         """
-        with open(html_file, 'r', encoding='utf-8') as f:
-            content = f.read()
+        content = _read_html(html_file)
         
-        soup = BeautifulSoup(content, 'html.parser')
+        soup = BeautifulSoup(content, 'lxml')
         
         # Step 1: Remove all navigation and header elements
+        # Classify every element in one traversal; removals below then run in
+        # the original order (breadcrumbs, main header, titles, metadata, footer)
+        # and attachment links are rewritten once the removals are done
+        breadcrumb_pattern = HTMLCleaningPatterns.BREADCRUMB_ELEMENT_PATTERN
+        title_id_pattern = HTMLCleaningPatterns.TITLE_ID_PATTERN
+        title_class_pattern = HTMLCleaningPatterns.TITLE_CLASS_PATTERN
+        metadata_pattern = HTMLCleaningPatterns.METADATA_CLASS_PATTERN
+        nav_pattern = HTMLCleaningPatterns.NAV_CLASS_PATTERN
+        
+        breadcrumb_elements = []
+        main_headers = []
+        title_elements = []
+        metadata_elements = []
+        footers = []
+        nav_elements = []
+        attachment_links = []
+        # Main content candidates, chosen in order of preference in step 2
+        main_wiki_content_divs = []
+        wiki_content_divs = []
+        content_divs = []
+        main_divs = []
+        bodies = []
+        for tag in soup.find_all(True):
+            name = tag.name
+            if name == 'img' or name == 'a':
+                # Links and images pointing into attachments/
+                attribute = 'src' if name == 'img' else 'href'
+                url = tag.get(attribute)
+                if url and isinstance(url, str) and 'attachments/' in url:
+                    attachment_links.append((tag, attribute))
+                continue
+            if name in ('ol', 'nav', 'div'):
+                # Breadcrumb navigation (both id and class must match)
+                if (_attribute_matches(tag, 'id', breadcrumb_pattern) and
+                        _attribute_matches(tag, 'class', breadcrumb_pattern)):
+                    breadcrumb_elements.append(tag)
+                # Navigation, menus and sidebars (only removed inside the main content)
+                if name != 'ol' and _attribute_matches(tag, 'class', nav_pattern):
+                    nav_elements.append(tag)
+            if name in ('h1', 'h2', 'div'):
+                # Page title elements (multiple patterns)
+                if (_attribute_matches(tag, 'id', title_id_pattern) and
+                        _attribute_matches(tag, 'class', title_class_pattern)):
+                    title_elements.append(tag)
+            if name == 'div':
+                # Page metadata (created by, modified by, etc.)
+                if _attribute_matches(tag, 'class', metadata_pattern):
+                    metadata_elements.append(tag)
+                element_id = tag.get('id')
+                if element_id == 'main-header':
+                    main_headers.append(tag)
+                elif element_id == 'footer':
+                    footers.append(tag)
+                elif element_id == 'content':
+                    content_divs.append(tag)
+                elif element_id == 'main':
+                    main_divs.append(tag)
+                if 'wiki-content' in tag.get_attribute_list('class'):
+                    wiki_content_divs.append(tag)
+                    if element_id == 'main-content':
+                        main_wiki_content_divs.append(tag)
+            elif name == 'body':
+                bodies.append(tag)
+        
         # Remove breadcrumb navigation
-        breadcrumb_elements = soup.find_all(['ol', 'nav', 'div'], 
-                                          attrs={'id': re.compile(r'breadcrumb|navigation'),
-                                                'class': re.compile(r'breadcrumb|navigation')})
         for element in breadcrumb_elements:
-            element.decompose()
+            if not element.decomposed:
+                element.decompose()
         
         # Remove the main header section (contains breadcrumbs and title)
-        main_header = soup.find('div', id='main-header')
+        main_header = _first_remaining(main_headers)
         if main_header:
             main_header.decompose()
         
-        # Remove page title elements (multiple patterns)
-        title_elements = soup.find_all(['h1', 'h2', 'div'], 
-                                     attrs={'id': re.compile(r'title|pagetitle'),
-                                           'class': re.compile(r'pagetitle|title-heading')})
-        for title in title_elements:
-            title.decompose()
-        
-        # Remove page metadata (created by, modified by, etc.)
-        metadata_elements = soup.find_all(['div'], 
-                                        attrs={'class': re.compile(r'page-metadata|metadata')})
-        for metadata in metadata_elements:
-            metadata.decompose()
+        # Remove page title elements and page metadata
+        for element in title_elements + metadata_elements:
+            if not element.decomposed:
+                element.decompose()
         
         # Remove footer
-        footer = soup.find('div', id='footer')
+        footer = _first_remaining(footers)
         if footer:
             footer.decompose()
         
         # Step 2: Focus on the main wiki content
         # Try to find the main content area - prefer the most specific
-        main_content = soup.find('div', attrs={'id': 'main-content', 'class': 'wiki-content'})
+        main_content = _first_remaining(main_wiki_content_divs)
         
         # Fallback options if the exact match isn't found
         if not main_content:
-            main_content = soup.find('div', class_='wiki-content')
+            main_content = _first_remaining(wiki_content_divs)
         if not main_content:
-            main_content = soup.find('div', id='content')
+            main_content = _first_remaining(content_divs)
         if not main_content:
-            main_content = soup.find('div', id='main')
+            main_content = _first_remaining(main_divs)
         if not main_content:
-            main_content = soup.find('body')
+            main_content = _first_remaining(bodies)
         
         if main_content and isinstance(main_content, Tag):
             # Step 3: Clean up remaining navigation elements within content
             # Remove any remaining nav elements
-            nav_elements = main_content.find_all(['nav', 'div'], 
-                                               attrs={'class': re.compile(r'nav|menu|sidebar')})
             for nav in nav_elements:
-                if isinstance(nav, Tag):
+                if not nav.decomposed and any(parent is main_content for parent in nav.parents):
                     nav.decompose()
             
             # Remove any remaining breadcrumb-like lists at the beginning
@@ -399,10 +589,13 @@ class SpaceProcessor:
                     first_ol.decompose()
             
             # Step 3.5: Clean attachment URLs - strip query parameters and convert to template format
-            self._clean_attachment_urls_in_html(main_content)
+            # (links outside main_content are never converted, so they need no filtering)
+            for element, attribute in attachment_links:
+                if not element.decomposed:
+                    self._clean_attachment_url(element, attribute)
             
             # Step 4: Convert to markdown
-            markdown = self.html2text_converter.handle(str(main_content))
+            markdown = self._create_html2text_converter().handle(str(main_content))
             
             # Step 5: Clean up the markdown
             markdown = self.clean_markdown(markdown)
@@ -411,48 +604,45 @@ class SpaceProcessor:
         
         return f"Could not extract content from {html_file.name}"
     
-    def _clean_attachment_urls_in_html(self, soup_element: Tag) -> None:
+    def _create_html2text_converter(self) -> 'html2text.HTML2Text':
         """
-        Clean attachment URLs in HTML by stripping query parameters and converting to template format
+        Create an html2text converter configured for clean markdown conversion
+        
+        HTML2Text keeps parser state (open lists, pre blocks, pending line
+        breaks) between handle() calls, so each page gets its own converter;
+        this keeps a page's markdown independent of the pages converted
+        before it, in this process or in a worker.
+        
+        Returns:
+            Configured HTML2Text instance
+        """
+        import html2text  # Deferred so building the space JSON never loads it
+        
+        converter = html2text.HTML2Text()
+        converter.ignore_links = False
+        converter.ignore_images = False
+        converter.body_width = 0  # No line wrapping
+        converter.unicode_snob = True
+        return converter
+    
+    def _clean_attachment_url(self, element: Tag, attribute: str) -> None:
+        """
+        Clean an attachment URL by stripping query parameters and converting it to template format
         
         Args:
-            soup_element: BeautifulSoup element to process
+            element: img or a element referencing an attachment
+            attribute: Attribute holding the URL ('src' or 'href')
         """
-        import re
-        
-        # Find all img tags with src attributes containing attachments
-        img_elements = soup_element.find_all('img', src=re.compile(r'attachments/'))
-        
-        # Find all a tags with href attributes containing attachments  
-        a_elements = soup_element.find_all('a', href=re.compile(r'attachments/'))
-        
-        # Process img elements
-        for element in img_elements:
-            if isinstance(element, Tag):
-                url = element.get('src')
-                if url and 'attachments/' in url and isinstance(url, str):
-                    # Strip query parameters (everything after ?)
-                    base_url = url.split('?')[0]
-                    
-                    # Convert to template format for later UUID replacement
-                    template_url = f"{{{base_url}}}"
-                    element['src'] = template_url
-                    
-                    self.logger.debug(f"Converted img src: {url} -> {template_url}")
-        
-        # Process a elements
-        for element in a_elements:
-            if isinstance(element, Tag):
-                url = element.get('href')
-                if url and 'attachments/' in url and isinstance(url, str):
-                    # Strip query parameters (everything after ?)
-                    base_url = url.split('?')[0]
-                    
-                    # Convert to template format for later UUID replacement
-                    template_url = f"{{{base_url}}}"
-                    element['href'] = template_url
-                    
-                    self.logger.debug(f"Converted a href: {url} -> {template_url}")
+        url = element[attribute]
+        
+        # Strip query parameters (everything after ?)
+        base_url = url.split('?')[0]
+        
+        # Convert to template format for later UUID replacement
+        template_url = f"{{{base_url}}}"
+        element[attribute] = template_url
+        
+        self.logger.debug(f"Converted {element.name} {attribute}: {url} -> {template_url}")
 
     def clean_markdown(self, markdown: str) -> str:
         """
@@ -466,49 +656,53 @@ class SpaceProcessor:
         """
         # Remove any remaining breadcrumb patterns at the start
         # Pattern: "1. [Page](link)" type lists at beginning
-        lines = markdown.split('\n')
-        cleaned_lines = []
-        skip_breadcrumb = True
-        
-        for line in lines:
-            stripped = line.strip()
-            
-            # Skip initial breadcrumb-like numbered lists
-            if skip_breadcrumb:
-                if (re.match(r'^\d+\.\s*\[.*?\]\(.*?\)\s*$', stripped) or
-                    stripped == '' or
-                    re.match(r'^\d+\.\s*$', stripped)):
-                    continue  # Skip this line
-                else:
-                    skip_breadcrumb = False  # Start keeping content
+        patterns = ConfluencePatterns
+        breadcrumb_line_pattern = patterns.BREADCRUMB_LINK_LINE_PATTERN
+        empty_item_pattern = patterns.EMPTY_NUMBERED_ITEM_PATTERN
+        # Only the leading lines are inspected: find where the content starts and
+        # slice there instead of splitting and re-joining the whole page
+        start = 0
+        while True:
+            end = markdown.find('\n', start)
+            stripped = (markdown[start:] if end < 0 else markdown[start:end]).strip()
             
-            cleaned_lines.append(line)
-        
-        markdown = '\n'.join(cleaned_lines)
+            # Skip initial breadcrumb-like numbered lists (both patterns start with a digit)
+            if stripped and not (stripped[0].isdigit() and
+                                 (breadcrumb_line_pattern.match(stripped) or
+                                  empty_item_pattern.match(stripped))):
+                break  # Start keeping content
+            if end < 0:
+                start = len(markdown)  # Nothing but breadcrumbs
+                break
+            start = end + 1
+        
+        if start:
+            markdown = markdown[start:]
         
         # Remove excessive whitespace
-        markdown = re.sub(r'\n{3,}', '\n\n', markdown)
+        markdown = patterns.EXCESSIVE_NEWLINES_PATTERN.sub('\n\n', markdown)
         
         # Remove empty list items
-        markdown = re.sub(r'^\s*[\*\-\+]\s*$', '', markdown, flags=re.MULTILINE)
+        markdown = patterns.EMPTY_LIST_ITEM_PATTERN.sub('', markdown)
         
         # Clean up table formatting
-        markdown = re.sub(r'\|\s*\|', '|', markdown)
+        markdown = patterns.EMPTY_TABLE_CELL_PATTERN.sub('|', markdown)
         
         # Remove standalone "Created by... modified by..." lines
-        markdown = re.sub(r'^Created by.*?modified.*?on.*?$', '', markdown, flags=re.MULTILINE)
+        markdown = patterns.CREATED_MODIFIED_LINE_PATTERN.sub('', markdown)
         
         # Remove document generation footer
-        markdown = re.sub(r'^Document generated by Confluence.*?$', '', markdown, flags=re.MULTILINE)
+        markdown = patterns.CONFLUENCE_FOOTER_LINE_PATTERN.sub('', markdown)
         
         # Clean up multiple consecutive blank lines again after all removals
-        markdown = re.sub(r'\n{3,}', '\n\n', markdown)
+        markdown = patterns.EXCESSIVE_NEWLINES_PATTERN.sub('\n\n', markdown)
         
         return markdown
     
     def get_current_timestamp(self) -> str:
-        """Get current timestamp as ISO string"""
-        from datetime import datetime
+        """Get current timestamp as ISO string (fixed for the duration of a processing run)"""
+        if self._batch_timestamp is not None:
+            return self._batch_timestamp
         return datetime.now().isoformat()
     
     def list_available_spaces(self) -> List[str]:
@@ -518,8 +712,8 @@ class SpaceProcessor:
         Returns:
             List of space keys that have JSON files
         """
-        space_files = list(self.output_dir.glob("*.json"))
-        return [f.stem for f in space_files]
+        with os.scandir(self.output_dir) as entries:
+            return [os.path.splitext(e.name)[0] for e in entries if e.name.endswith('.json')]
     
     def get_space_summary(self, space_key: str) -> Optional[Dict[str, Any]]:
         """
@@ -535,16 +729,15 @@ class SpaceProcessor:
         if not space_file.exists():
             return None
         
-        with open(space_file, 'r', encoding='utf-8') as f:
-            space_data = json.load(f)
-        
-        def count_items(items):
-            count = len(items)
-            for item in items:
-                count += count_items(item.get('children', []))
-            return count
+        space_data = read_space_file(space_file)
         
-        total_items = count_items(space_data["space_content"])
+        # Count every item in the tree with an explicit stack
+        total_items = 0
+        stack = list(space_data["space_content"])
+        while stack:
+            item = stack.pop()
+            total_items += 1
+            stack.extend(item.get('children', []))
         
         return {
             "space_name": space_data["space_name"],
@@ -557,6 +750,22 @@ class SpaceProcessor:
         }
 
 
+# SpaceProcessor of the current worker process, set by _init_worker_processor
+_worker_processor: Optional[SpaceProcessor] = None
+
+
+def _init_worker_processor(base_path: str, log_config: Optional[Tuple[Any, int]]) -> None:
+    """Create the per-process SpaceProcessor used by _html_to_markdown_in_worker."""
+    global _worker_processor
+    setup_worker_logging(log_config)
+    _worker_processor = SpaceProcessor(Path(base_path))
+
+
+def _html_to_markdown_in_worker(html_file: str) -> str:
+    """Convert one HTML page with this worker process's SpaceProcessor."""
+    return _worker_processor.html_to_markdown(Path(html_file))
+
+
 def main():
     """Test the SpaceProcessor"""
     
@@ -1,15 +1,34 @@
+import contextlib
+import io
+import json
 import zipfile
 import os
+import sys
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Set, Tuple
 import shutil
+from .logger import get_logger, get_worker_log_config, setup_worker_logging
 
-import zipfile
-import os
-from pathlib import Path
-from typing import List, Dict, Any
-import shutil
-from .logger import get_logger
+
+# Read buffer for archive files and copy buffer for extracted members
+_READ_BUFFER_SIZE = 4 * 1024 * 1024
+_COPY_BUFFER_SIZE = 1024 * 1024
+
+# Written into an output directory after a successful extraction; records the
+# archive it came from so an unchanged archive isn't extracted again
+_EXTRACTION_STAMP = '.zip-extraction.json'
+
+# Encrypted, compressed patched data and strong encryption flags, which
+# ZipFile.open refuses for members without a password
+_UNSUPPORTED_FLAG_BITS = 0x01 | 0x20 | 0x40
+
+# Deletes every ASCII character that is not alphanumeric, '-' or '_'
+_UNSAFE_ASCII_CHARACTERS = str.maketrans('', '', ''.join(
+    chr(code) for code in range(128) if not (chr(code).isalnum() or chr(code) in '-_')
+))
 
 
 class ZipExtractor:
@@ -41,9 +60,13 @@ class ZipExtractor:
             self.max_total_size = 1024 * 1024 * 1024  # 1GB total extraction
             self.max_files = 10000  # Maximum files per archive
         
+        # Threads used to extract the members of one archive; lowered in pool
+        # workers so the processes together stay within the CPU count
+        self.member_workers = os.cpu_count() or 1
+        
         # Ensure input directory exists
         self.input_directory.mkdir(exist_ok=True)
-        self.logger.debug(f"Initialized ZipExtractor - zips: {self.zips_directory}, input: {self.input_directory}")
+        self.logger.debug("Initialized ZipExtractor - zips: %s, input: %s", self.zips_directory, self.input_directory)
     
     def get_zip_files(self) -> List[Path]:
         """
@@ -55,7 +78,10 @@ class ZipExtractor:
         if not self.zips_directory.exists():
             return []
         
-        return list(self.zips_directory.glob("*.zip"))
+        # scandir entries carry the file type, so no extra stat() per entry
+        with os.scandir(self.zips_directory) as entries:
+            return [Path(entry.path) for entry in entries
+                    if entry.name.endswith('.zip') and entry.is_file()]
     
     def extract_zip_name(self, zip_path: Path) -> str:
         """
@@ -80,11 +106,16 @@ class ZipExtractor:
         
         # Clean up for filesystem safety
         base_name = base_name.replace(' ', '-')
-        base_name = ''.join(c for c in base_name if c.isalnum() or c in '-_')
+        if base_name.isascii():
+            base_name = base_name.translate(_UNSAFE_ASCII_CHARACTERS)
+        else:
+            # Keep non-ASCII letters and digits, which isalnum() accepts
+            base_name = ''.join(c for c in base_name if c.isalnum() or c in '-_')
         
         return base_name
     
-    def safe_extract_member(self, zip_ref: zipfile.ZipFile, member: zipfile.ZipInfo, output_dir: Path) -> bool:
+    def safe_extract_member(self, zip_ref: zipfile.ZipFile, member: zipfile.ZipInfo, output_dir: Path,
+                            existing_dirs: Optional[Set[str]] = None) -> bool:
         """
         Safely extract a single zip member with security checks.
         
@@ -92,39 +123,204 @@ class ZipExtractor:
             zip_ref: Open ZipFile object
             member: ZipInfo object for the member to extract
             output_dir: Output directory path
+            existing_dirs: Directories known to exist, shared across the members
+                of one archive so each directory is checked only once (optional)
             
         Returns:
             True if extraction successful, False if blocked for security
         """
-        # Security check: Prevent directory traversal
-        if os.path.isabs(member.filename) or ".." in member.filename:
-            print(f"⚠️  Blocked suspicious path: {member.filename}")
+        message = self._check_member(member)
+        if message is None:
+            message = self._extract_member(zip_ref, member, _output_root(output_dir), existing_dirs)
+        
+        if message is not None:
+            if message:
+                print(message)
             return False
+        return True
+    
+    def _check_member(self, member: zipfile.ZipInfo) -> Optional[str]:
+        """
+        Run the security checks for a zip member.
+        
+        Args:
+            member: ZipInfo object for the member to check
+            
+        Returns:
+            Warning to print if the member is blocked ('' if the block was
+            logged instead), None if it may be extracted
+        """
+        filename = member.filename
+        
+        # Security check: Prevent directory traversal
+        if os.path.isabs(filename) or ".." in filename:
+            return f"⚠️  Blocked suspicious path: {filename}"
         
         # Security check: Prevent zip bombs (large files)
         if member.file_size > self.max_file_size:
-            self.logger.warning(f"Blocked large file ({member.file_size} bytes): {member.filename}")
-            print(f"⚠️  Blocked large file ({member.file_size} bytes): {member.filename}")
-            return False
+            self.logger.warning("Blocked large file (%s bytes): %s", member.file_size, filename)
+            return ''
         
         # Security check: Prevent excessively long paths
-        if len(member.filename) > 255:
-            print(f"⚠️  Blocked long filename: {member.filename[:50]}...")
-            return False
+        if len(filename) > 255:
+            return f"⚠️  Blocked long filename: {filename[:50]}..."
         
+        return None
+    
+    def _extract_member(self, zip_ref: zipfile.ZipFile, member: zipfile.ZipInfo, output_root: str,
+                        existing_dirs: Optional[Set[str]] = None) -> Optional[str]:
+        """
+        Extract a zip member that passed the security checks.
+        
+        Args:
+            zip_ref: Open ZipFile object
+            member: ZipInfo object for the member to extract
+            output_root: Output directory as returned by _output_root
+            existing_dirs: Directories known to exist (optional, updated in place)
+            
+        Returns:
+            Warning to print if extraction failed, None on success
+        """
         try:
-            zip_ref.extract(member, output_dir)
-            return True
+            # Same target path and directory handling as ZipFile.extract, but
+            # copied in chunks of up to 1 MB instead of shutil's 64 KB default
+            if existing_dirs is None:
+                existing_dirs = set()
+            target = _member_target(member, output_root)
+            
+            # Nothing is deleted during extraction, so a directory seen once
+            # needs no further stat() for the members that follow
+            upperdirs = os.path.dirname(target)
+            if upperdirs and upperdirs not in existing_dirs:
+                if not os.path.exists(upperdirs):
+                    os.makedirs(upperdirs)
+                existing_dirs.add(upperdirs)
+            
+            if member.is_dir():
+                if not os.path.isdir(target):
+                    os.mkdir(target)
+                existing_dirs.add(target)
+                return None
+            
+            # Empty files are created without setting up a decompressor; members
+            # that ZipFile.open would reject still go through it and fail there
+            if (member.file_size == 0 and member.CRC == 0
+                    and member.compress_type in (zipfile.ZIP_STORED, zipfile.ZIP_DEFLATED)
+                    and not member.flag_bits & _UNSUPPORTED_FLAG_BITS):
+                open(target, 'wb').close()
+                return None
+            
+            with zip_ref.open(member) as source, open(target, 'wb') as destination:
+                # Members needing more than one write get their blocks reserved
+                # up front instead of growing the file write by write
+                preallocated = member.file_size > _COPY_BUFFER_SIZE and _preallocate(destination.fileno(), member.file_size)
+                try:
+                    # read1 returns each decompressed chunk as is, where read()
+                    # concatenates chunks until the whole buffer is filled
+                    while True:
+                        chunk = source.read1(_COPY_BUFFER_SIZE)
+                        if not chunk:
+                            break
+                        destination.write(chunk)
+                except Exception:
+                    # Leave only the data actually written, as an unreserved file would
+                    if preallocated:
+                        destination.truncate()
+                    raise
+            return None
         except Exception as e:
-            print(f"⚠️  Failed to extract {member.filename}: {e}")
-            return False
+            return f"⚠️  Failed to extract {member.filename}: {e}"
     
-    def extract_single_zip(self, zip_path: Path) -> Dict[str, Any]:
+    def _extract_members_concurrently(self, zip_path: Path, members: List[zipfile.ZipInfo],
+                                      messages: List[Optional[str]], output_dir: Path) -> Optional[List[str]]:
+        """
+        Extract the members of an archive with a thread pool.
+        
+        zlib releases the GIL while inflating, so members are decompressed and
+        written in parallel. Each thread reads through its own ZipFile because
+        a shared one serializes every read behind its file lock.
+        
+        Args:
+            zip_path: Path to the zip file being extracted
+            members: ZipInfo objects of the archive, in archive order
+            messages: _check_member results for members (updated in place)
+            output_dir: Output directory path
+            
+        Returns:
+            Warnings for blocked or failed members in member order ('' for
+            blocks that were logged instead), or None if
+            the archive has to be extracted sequentially
+        """
+        allowed = [index for index, message in enumerate(messages) if message is None]
+        
+        workers = min(self.member_workers, len(allowed))
+        if workers < 2:
+            return None
+        
+        # Later members overwrite earlier ones and a file can sit where another
+        # member needs a directory; only the archive order settles those, so
+        # such archives are left to the sequential loop. Names are compared
+        # case-folded as the target filesystem may be case-insensitive.
+        output_root = _output_root(output_dir)
+        targets = {}
+        parents = set()
+        for index in allowed:
+            target = _member_target(members[index], output_root)
+            key = target.casefold()
+            if key in targets:
+                return None
+            targets[key] = (index, target)
+            parent = os.path.dirname(key)
+            while parent not in parents and parent != os.path.dirname(parent):
+                parents.add(parent)
+                parent = os.path.dirname(parent)
+        for key, (index, target) in targets.items():
+            if key in parents and not members[index].is_dir():
+                return None
+        
+        # Create the directories up front; ZipFile.extract creates missing
+        # parents without exist_ok, which would race between threads. A path
+        # the filesystem rejects is reported per member by the sequential loop.
+        existing_dirs = set()
+        try:
+            for key, (index, target) in targets.items():
+                directory = target if members[index].is_dir() else os.path.dirname(target)
+                if directory not in existing_dirs:
+                    os.makedirs(directory, exist_ok=True)
+                    existing_dirs.add(directory)
+        except OSError:
+            return None
+        
+        local = threading.local()
+        opened = []
+        
+        def extract(index: int) -> Optional[str]:
+            archive = getattr(local, 'archive', None)
+            if archive is None:
+                archive_file = open(zip_path, 'rb', buffering=_READ_BUFFER_SIZE)
+                opened.append(archive_file)
+                archive = local.archive = zipfile.ZipFile(archive_file, 'r')
+                opened.append(archive)
+            return self._extract_member(archive, members[index], output_root, existing_dirs)
+        
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                for index, message in zip(allowed, executor.map(extract, allowed)):
+                    messages[index] = message
+        finally:
+            # Close each ZipFile before the file it reads from
+            for handle in reversed(opened):
+                handle.close()
+        
+        return [message for message in messages if message is not None]
+    
+    def extract_single_zip(self, zip_path: Path, force: bool = False) -> Dict[str, Any]:
         """
         Extract a single zip file to the input directory.
         
         Args:
             zip_path: Path to the zip file to extract
+            force: Extract even if the archive is unchanged since it was last extracted
             
         Returns:
             Dictionary with extraction results
@@ -141,49 +337,86 @@ class ZipExtractor:
             'error': None
         }
         
+        removal = None
         try:
+            # Skip archives whose last extraction is still in place
+            zip_stat = os.stat(zip_path)
+            stamp = {'zip_file': zip_path.name, 'size': zip_stat.st_size, 'mtime_ns': zip_stat.st_mtime_ns}
+            if not force:
+                previous = _read_extraction_stamp(output_dir)
+                if previous is not None and all(previous.get(key) == value for key, value in stamp.items()):
+                    result['files_extracted'] = previous.get('files_extracted', 0)
+                    result['files_blocked'] = previous.get('files_blocked', 0)
+                    result['success'] = True
+                    result['skipped'] = True
+                    print(f"⏭️  Skipped {zip_path.name}: unchanged since it was extracted to {folder_name}/")
+                    return result
+            
             # Remove existing output directory if it exists
             if output_dir.exists():
                 print(f"Removing existing directory: {output_dir}")
-                shutil.rmtree(output_dir)
+                removal = self._remove_directory_in_background(output_dir)
             
             # Create output directory
             output_dir.mkdir(parents=True, exist_ok=True)
             
             # Extract zip file with security checks
-            with zipfile.ZipFile(zip_path, 'r') as zip_ref:
-                # Get list of files to extract
-                file_list = zip_ref.namelist()
+            # Member reads go through a large buffer instead of many small read() calls
+            with open(zip_path, 'rb', buffering=_READ_BUFFER_SIZE) as archive_file, \
+                 zipfile.ZipFile(archive_file, 'r') as zip_ref:
+                # Get list of files to extract; the central directory was read
+                # when the archive was opened, so this is one list for every check
+                members = zip_ref.infolist()
                 
                 # Security check: Too many files (zip bomb protection)
-                if len(file_list) > self.max_files:
-                    result['error'] = f"Archive contains too many files ({len(file_list)} > {self.max_files})"
-                    self.logger.error(f"{zip_path.name} contains too many files: {len(file_list)}")
+                # Runs first so the size walk below is bounded by max_files
+                if len(members) > self.max_files:
+                    result['error'] = f"Archive contains too many files ({len(members)} > {self.max_files})"
+                    self.logger.error("%s contains too many files: %d", zip_path.name, len(members))
                     print(f"❌ Error: {zip_path.name} contains too many files")
                     return result
                 
                 # Security check: Total uncompressed size
-                total_size = sum(info.file_size for info in zip_ref.infolist())
+                total_size = sum(member.file_size for member in members)
                 if total_size > self.max_total_size:
                     result['error'] = f"Archive too large when uncompressed ({total_size} bytes)"
-                    self.logger.error(f"{zip_path.name} is too large when uncompressed: {total_size} bytes")
+                    self.logger.error("%s is too large when uncompressed: %d bytes", zip_path.name, total_size)
                     print(f"❌ Error: {zip_path.name} is too large when uncompressed")
                     return result
                 
-                # Extract files with security checks
-                extracted_count = 0
-                blocked_count = 0
+                # Extract files with security checks; warnings for blocked or
+                # failed members are written together once the loop is done.
+                # Members are checked once, as blocks are logged.
+                check_member = self._check_member
+                messages = [check_member(member) for member in members]
+                warnings = self._extract_members_concurrently(zip_path, members, messages, output_dir)
+                
+                if warnings is None:
+                    warnings = []
+                    existing_dirs = set()
+                    output_root = _output_root(output_dir)
+                    
+                    extract_member = self._extract_member
+                    for member, message in zip(members, messages):
+                        if message is None:
+                            message = extract_member(zip_ref, member, output_root, existing_dirs)
+                        if message is not None:
+                            warnings.append(message)
                 
-                for member in zip_ref.infolist():
-                    if self.safe_extract_member(zip_ref, member, output_dir):
-                        extracted_count += 1
-                    else:
-                        blocked_count += 1
+                if any(warnings):
+                    sys.stdout.write(''.join(f"{message}\n" for message in warnings if message))
+                
+                blocked_count = len(warnings)
+                extracted_count = len(members) - blocked_count
                 
                 result['files_extracted'] = extracted_count
                 result['files_blocked'] = blocked_count
                 result['success'] = True
                 
+                stamp['files_extracted'] = extracted_count
+                stamp['files_blocked'] = blocked_count
+                _write_extraction_stamp(output_dir, stamp)
+                
                 if blocked_count > 0:
                     print(f"✅ Extracted {extracted_count} files from {zip_path.name} to {folder_name}/ (blocked {blocked_count} suspicious files)")
                 else:
@@ -201,12 +434,55 @@ class ZipExtractor:
             result['error'] = str(e)
             print(f"❌ Error extracting {zip_path.name}: {str(e)}")
         
+        finally:
+            # The previous extraction is gone before the caller sees the result
+            if removal is not None:
+                try:
+                    removal.result()
+                except OSError as e:
+                    print(f"⚠️  Failed to remove previous extraction: {e}")
+        
         return result
     
-    def extract_all_zips(self) -> Dict[str, Any]:
+    def _remove_directory_in_background(self, directory: Path) -> Optional[Future]:
+        """
+        Move a directory aside and delete it on a background thread.
+        
+        The rename is a single metadata operation, so extraction into a fresh
+        directory starts while the old tree is still being deleted. Symlinks,
+        non-directories and directories that can't be renamed are removed
+        synchronously as before.
+        
+        Args:
+            directory: Directory to remove
+            
+        Returns:
+            Future of the background deletion, or None if it was removed in place
+        """
+        if directory.is_symlink() or not directory.is_dir():
+            shutil.rmtree(directory)
+            return None
+        
+        trash = directory.with_name(f".{directory.name}.removing-{os.getpid()}-{time.time_ns()}")
+        try:
+            os.rename(directory, trash)
+        except OSError:
+            shutil.rmtree(directory)
+            return None
+        
+        executor = ThreadPoolExecutor(max_workers=1)
+        removal = executor.submit(shutil.rmtree, trash)
+        executor.shutdown(wait=False)
+        return removal
+    
+    def extract_all_zips(self, max_workers: Optional[int] = None, force: bool = False) -> Dict[str, Any]:
         """
         Extract all zip files in the zips directory.
         
+        Args:
+            max_workers: Worker processes to use (default: CPU count, 1 = no pool)
+            force: Re-extract archives that are unchanged since their last extraction
+            
         Returns:
             Summary of extraction results
         """
@@ -229,12 +505,35 @@ class ZipExtractor:
         successful = 0
         failed = 0
         
-        for zip_path in zip_files:
-            result = self.extract_single_zip(zip_path)
-            results.append(result)
-            
+        # Archives that clean up to the same folder name replace each other,
+        # so they are only extracted in a pool when every target is distinct
+        workers = max_workers or os.cpu_count() or 1
+        folder_names = {self.extract_zip_name(zip_path) for zip_path in zip_files}
+        if workers > 1 and len(zip_files) > 1 and len(folder_names) == len(zip_files):
+            processes = min(workers, len(zip_files))
+            with ProcessPoolExecutor(
+                max_workers=processes,
+                initializer=_init_worker_extractor,
+                initargs=(str(self.zips_directory), str(self.input_directory),
+                          self.max_file_size, self.max_total_size, self.max_files,
+                          max(1, (os.cpu_count() or 1) // processes), get_worker_log_config())
+            ) as executor:
+                extractions = executor.map(
+                    _extract_zip_in_worker, [str(zip_path) for zip_path in zip_files], [force] * len(zip_files)
+                )
+                for result, output in extractions:
+                    sys.stdout.write(output)
+                    results.append(result)
+        else:
+            for zip_path in zip_files:
+                results.append(self.extract_single_zip(zip_path, force))
+        
+        skipped = 0
+        for result in results:
             if result['success']:
                 successful += 1
+                if result.get('skipped'):
+                    skipped += 1
             else:
                 failed += 1
         
@@ -242,6 +541,8 @@ class ZipExtractor:
         print(f"Extraction complete!")
         print(f"✅ Successful: {successful}")
         print(f"❌ Failed: {failed}")
+        if skipped:
+            print(f"⏭️  Unchanged (skipped): {skipped}")
         print(f"📁 Output directory: {self.input_directory}")
         
         return {
@@ -261,4 +562,97 @@ class ZipExtractor:
         if not self.input_directory.exists():
             return []
         
-        return [d.name for d in self.input_directory.iterdir() if d.is_dir()]
\ No newline at end of file
+        with os.scandir(self.input_directory) as entries:
+            return [entry.name for entry in entries if entry.is_dir()]
+
+
+def _member_target(member: zipfile.ZipInfo, output_root: str) -> str:
+    """
+    Return the path ZipFile.extract writes a member to, using its sanitization.
+    
+    output_root is the output directory as a normalized string (see
+    _output_root); the cleaned member name has no empty, "." or ".." parts
+    left, so joining the two needs no further normpath().
+    """
+    sep = os.path.sep
+    arcname = member.filename
+    if sep != '/':
+        arcname = arcname.replace('/', sep)
+    if os.path.altsep:
+        arcname = arcname.replace(os.path.altsep, sep)
+    # Drop drive letters, empty, "." and ".." components as ZipFile does
+    arcname = os.path.splitdrive(arcname)[1]
+    parts = arcname.split(sep)
+    if '' in parts or os.path.curdir in parts or os.path.pardir in parts:
+        arcname = sep.join(part for part in parts if part not in ('', os.path.curdir, os.path.pardir))
+    if sep == '\\':
+        arcname = zipfile.ZipFile._sanitize_windows_name(arcname, sep)
+    if not arcname:
+        return output_root
+    if output_root.endswith(sep):
+        return output_root + arcname
+    return output_root + sep + arcname
+
+
+def _output_root(output_dir: Path) -> str:
+    """Return an output directory in the form _member_target expects."""
+    return os.path.normpath(output_dir)
+
+
+def _read_extraction_stamp(output_dir: Path) -> Optional[Dict[str, Any]]:
+    """Load the stamp of an earlier extraction, or None if there is no readable one."""
+    try:
+        with open(output_dir / _EXTRACTION_STAMP, 'r', encoding='utf-8') as f:
+            stamp = json.load(f)
+    except (OSError, ValueError):
+        return None
+    return stamp if isinstance(stamp, dict) else None
+
+
+def _write_extraction_stamp(output_dir: Path, stamp: Dict[str, Any]) -> None:
+    """Record a successful extraction; without a stamp the archive is just extracted again."""
+    try:
+        with open(output_dir / _EXTRACTION_STAMP, 'w', encoding='utf-8') as f:
+            json.dump(stamp, f)
+    except OSError:
+        pass
+
+
+def _preallocate(fd: int, size: int) -> bool:
+    """Reserve size bytes for a file about to be written; returns False if it couldn't."""
+    try:
+        if hasattr(os, 'posix_fallocate'):
+            os.posix_fallocate(fd, 0, size)
+        else:
+            os.ftruncate(fd, size)
+        return True
+    except OSError:
+        # Not every filesystem supports it; the copy simply grows the file instead
+        return False
+
+
+# ZipExtractor of the current worker process, set by _init_worker_extractor
+_worker_extractor: Optional[ZipExtractor] = None
+
+
+def _init_worker_extractor(zips_directory: str, input_directory: str,
+                           max_file_size: int, max_total_size: int, max_files: int,
+                           member_workers: int, log_config: Optional[Tuple[Any, int]]) -> None:
+    """Create the per-process ZipExtractor used by _extract_zip_in_worker."""
+    global _worker_extractor
+    setup_worker_logging(log_config)
+    _worker_extractor = ZipExtractor(zips_directory, input_directory)
+    _worker_extractor.max_file_size = max_file_size
+    _worker_extractor.max_total_size = max_total_size
+    _worker_extractor.max_files = max_files
+    _worker_extractor.member_workers = member_workers
+
+
+def _extract_zip_in_worker(zip_path: str, force: bool) -> Tuple[Dict[str, Any], str]:
+    """Extract one archive with this worker process's ZipExtractor."""
+    # Progress lines are handed back to the parent, which prints them in
+    # archive order instead of letting the workers' output interleave
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        result = _worker_extractor.extract_single_zip(Path(zip_path), force)
+    return result, output.getvalue()
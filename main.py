@@ -5,7 +5,9 @@ Implements the clean architecture approach for Confluence space processing
 """
 
 import argparse
+import shutil
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import os
 import dotenv
@@ -45,7 +47,7 @@ def cmd_extract_zips(args):
         security_config=config.security
     )
     
-    results = extractor.extract_all_zips()
+    results = extractor.extract_all_zips(max_workers=args.jobs, force=args.force)
     
     if results['successful_extractions'] > 0:
         print(f"\n🎉 Ready for next phase:")
@@ -158,16 +160,18 @@ def cmd_api_upload(args):
     if force_mode:
         print("🔥 FORCE MODE ENABLED - Will process all documents regardless of 'created' status")
     
-    for space_key in spaces_to_upload:
-        print(f"🚀 Uploading {space_key}...")
-        success = manager.upload_space(space_key, force_mode=force_mode)
+    concurrency = getattr(args, 'concurrency', 4)
+    print(f"🚀 Uploading {', '.join(spaces_to_upload)} ({concurrency} concurrent)...")
+    results = manager.upload_many(spaces_to_upload, concurrency=concurrency, force_mode=force_mode)
+    
+    for space_key, success in results.items():
         if success:
             success_count += 1
             print(f"  ✅ {space_key} - Upload successful")
         else:
             print(f"  ❌ {space_key} - Upload failed")
     
-    print(f"\n✅ Successfully uploaded {success_count}/{len(spaces_to_upload)} spaces")
+    print(f"\n✅ Successfully uploaded {success_count}/{len(results)} spaces")
     return 0 if success_count > 0 else 1
 
 
@@ -264,10 +268,42 @@ def cmd_reset(args):
     return 0 if success_count > 0 else 1
 
 
+def _clear_directory(directory: Path) -> int:
+    """
+    Remove everything in a directory except .gitkeep.
+    
+    Subdirectories are deleted in parallel on a thread pool, since unlinking
+    releases the GIL; progress lines are still printed in directory order.
+    
+    Args:
+        directory: Directory to empty
+        
+    Returns:
+        Number of removed entries
+    """
+    with os.scandir(directory) as scanned:
+        entries = [entry for entry in scanned if entry.name != '.gitkeep']
+    
+    # Symlinks are removed themselves, never the tree they point to
+    subdirectories = [entry.path for entry in entries if entry.is_dir(follow_symlinks=False)]
+    workers = min(os.cpu_count() or 1, len(subdirectories))
+    
+    with ThreadPoolExecutor(max_workers=max(1, workers)) as executor:
+        removals = {path: executor.submit(shutil.rmtree, path) for path in subdirectories}
+        
+        for entry in entries:
+            if entry.path in removals:
+                removals[entry.path].result()
+                print(f"   🗑️  Removed directory: {entry.name}")
+            else:
+                os.unlink(entry.path)
+                print(f"   🗑️  Removed file: {entry.name}")
+    
+    return len(entries)
+
+
 def cmd_point_zero(args):
     """Reset local directories to clean state while preserving ZIP files"""
-    import shutil
-    
     print("=" * 60)
     print("POINT ZERO: RESETTING LOCAL DIRECTORIES")
     print("=" * 60)
@@ -293,30 +329,12 @@ def cmd_point_zero(args):
     # Remove input directory contents (but keep the directory and .gitkeep)
     if input_dir.exists():
         print(f"🧹 Cleaning input directory: {input_dir}")
-        for item in input_dir.iterdir():
-            if item.name != '.gitkeep':
-                if item.is_dir():
-                    shutil.rmtree(item)
-                    print(f"   🗑️  Removed directory: {item.name}")
-                    removed_count += 1
-                else:
-                    item.unlink()
-                    print(f"   🗑️  Removed file: {item.name}")
-                    removed_count += 1
+        removed_count += _clear_directory(input_dir)
     
     # Remove output directory contents (but keep the directory and .gitkeep)
     if output_dir.exists():
         print(f"🧹 Cleaning output directory: {output_dir}")
-        for item in output_dir.iterdir():
-            if item.name != '.gitkeep':
-                if item.is_dir():
-                    shutil.rmtree(item)
-                    print(f"   🗑️  Removed directory: {item.name}")
-                    removed_count += 1
-                else:
-                    item.unlink()
-                    print(f"   🗑️  Removed file: {item.name}")
-                    removed_count += 1
+        removed_count += _clear_directory(output_dir)
     
     print("-" * 60)
     print(f"✅ Point Zero Complete!")
@@ -394,6 +412,16 @@ Environment Variables:
         default='input',
         help='Target directory for extracted files (default: input)'
     )
+    extract_parser.add_argument(
+        '--jobs',
+        type=int,
+        help='Number of archives to extract in parallel (default: CPU count)'
+    )
+    extract_parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-extract archives that are unchanged since their last extraction'
+    )
     
     # Process input command
     process_parser = subparsers.add_parser(
@@ -436,6 +464,12 @@ Environment Variables:
         action='store_true',
         help='Force upload/update all collections and documents regardless of "created" status'
     )
+    upload_parser.add_argument(
+        '--concurrency',
+        type=int,
+        default=4,
+        help='Number of spaces to upload concurrently (default: 4)'
+    )
     
     # Status command
     status_parser = subparsers.add_parser(